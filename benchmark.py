@@ -0,0 +1,309 @@
+"""
+Headless benchmarks of the genetic algorithm.
+Runs every test instance (and any synthetic ones) over several seeds without any visualisation or printing, and
+reports the throughput and quality of each run. The report is written into the _TEST_RESULTS directory, and is compared
+against a stored baseline report when one exists.
+
+Usage: python benchmark.py [--seeds 3] [--instances 1 2 ...] [--synthetic 20 50 ...] [--save-baseline]
+       python benchmark.py --instances --scaling 10 100 1000 ... [--distribution lognormal] [--fill-density .5] [--weight-tightness 1]
+       python benchmark.py --packing 1000 10000 ... [--seeds 3] [--synthetic-max-weight 13500]
+       python benchmark.py --time-to-target 30 [--initialiser greedy|archive|mixed] [--archive _TEST_RESULTS ...]
+"""
+
+from config import CYLINDER_SIDES, CYLINDER_TYPES, CONTAINER_WIDTH, CONTAINER_HEIGHT, MIGRATION_INTERVAL, MIGRATION_TOPOLOGY, BIN_PACKING, SEEDED_FRACTION
+from initialisers import INITIALISERS
+from islands import TOPOLOGIES
+from population import Bins
+from bin_packing import PACKING_METHODS
+from cylinders import Cylinder
+from synthetic import synthetic_instance, DISTRIBUTIONS
+from TEST import test_instances
+from main import run_ga
+from statistics import fmean, pstdev
+from typing import Dict, List, Tuple
+from time import perf_counter, strftime
+from argparse import ArgumentParser
+from json import dump, load
+from os.path import exists
+
+import platform
+import random
+import numpy
+
+BENCHMARK_DIRECTORY = "_TEST_RESULTS"
+BASELINE_PATH = f"{BENCHMARK_DIRECTORY}/BENCHMARK_BASELINE.json"
+
+
+def benchmark_case(case: Tuple[Tuple[float, ...], Tuple], seeds: List[int], **ga_parameters) -> Dict:
+    """
+    Runs the genetic algorithm on a single case once per seed, and measures each run.
+    :param Tuple[Tuple[float, ...], Tuple] case: The case to run, in the same form test_instances() returns: the
+    (width, height, max_weight) of the container and the cylinders. No cylinders means they're generated randomly, in
+    which case the first tuple also holds the number of cylinders to generate, as (width, height, max_weight, number).
+    :param List[int] seeds: The seeds of each run.
+    :param ga_parameters: Any further keyword arguments of run_ga(), e.g. population_size.
+    :return: Dict, the measurements of each run and their means.
+    """
+    (container_width, container_height, max_weight, *num_cylinders), cylinders = case
+
+    runs = []
+    for seed in seeds:
+        random.seed(seed)
+
+        start_time = perf_counter()
+        key_events = run_ga(
+            list(cylinders), len(cylinders) or num_cylinders[0],
+            max_weight=max_weight, container_width=container_width, container_height=container_height,
+            visualise=False, verbose=False, record=False, **ga_parameters
+        )
+        wall_time = perf_counter() - start_time
+
+        summaries = list(key_events.values())
+        compute_time = sum(summary["Compute Time"] for summary in summaries)
+        generations = sum(summary["Generations"] for summary in summaries)
+        decodes = sum(summary["Decodes"] for summary in summaries)
+        times_to_target = [summary["Time To Target"] for summary in summaries if summary["Time To Target"] is not None]
+
+        runs.append({
+            "Seed": seed,
+            "Bins": len(summaries),
+            "Wall Time": wall_time,
+            "Compute Time": compute_time,
+            "Generations/s": generations / compute_time if compute_time else 0.,
+            "Decodes/s": decodes / compute_time if compute_time else 0.,
+            "Best Fitness": [summary["Best Cylinder Group"]["Fitness"] for summary in summaries],
+            "Best Found At": [summary["Key Generations"][-1] if summary["Key Generations"] else None for summary in summaries],
+            "Stop Reasons": [summary["Stop Reason"] for summary in summaries],
+            "Rejection Rate": fmean(summary["Rejection Rate"] for summary in summaries) if summaries else 0.,
+            "Generations To Target": [time_to_target["Generation"] for time_to_target in times_to_target],
+            "Seconds To Target": [time_to_target["Seconds"] for time_to_target in times_to_target]
+        })
+
+    # Only the bins that reached the target count towards the time it took, alongside the fraction that did.
+    reached = [(generation, seconds) for run in runs for generation, seconds in zip(run["Generations To Target"], run["Seconds To Target"]) if generation is not None]
+    targeted = sum(len(run["Generations To Target"]) for run in runs)
+
+    return {
+        "Runs": runs,
+        "Mean Wall Time": fmean(run["Wall Time"] for run in runs),
+        "Std Wall Time": pstdev(run["Wall Time"] for run in runs),
+        "Mean Generations/s": fmean(run["Generations/s"] for run in runs),
+        "Mean Decodes/s": fmean(run["Decodes/s"] for run in runs),
+        "Mean Best Fitness": fmean(fmean(run["Best Fitness"] or [0.]) for run in runs),
+        "Mean Best Found At": fmean(fmean([generation for generation in run["Best Found At"] if generation is not None] or [0]) for run in runs),
+        "Mean Rejection Rate": fmean(run["Rejection Rate"] for run in runs),
+        "Reached Target": len(reached) / targeted if targeted else None,
+        "Mean Generations To Target": fmean(generation for generation, _ in reached) if reached else None,
+        "Mean Seconds To Target": fmean(seconds for _, seconds in reached) if reached else None
+    }
+
+
+def speedup(rate: float, baseline_rate: float) -> float:
+    """
+    How many times faster a rate is than that of the baseline.
+    :param float rate: The rate of this benchmark, e.g. its generations per second.
+    :param float baseline_rate: The same rate of the baseline.
+    :return: float, inf if the baseline's rate is 0 (or nan if both are).
+    """
+    if baseline_rate == 0:
+        return float("inf") if rate else float("nan")
+
+    return rate / baseline_rate
+
+
+def compare(report: Dict, baseline: Dict) -> List[str]:
+    """
+    Compares the cases of a report against those of a baseline report.
+    :param Dict report: The report of this benchmark.
+    :param Dict baseline: The stored baseline report.
+    :return: List[str], a line of comparison for each case found in both reports.
+    """
+    lines = []
+    for name, case in report["Cases"].items():
+        if name not in baseline["Cases"]:
+            continue
+
+        base = baseline["Cases"][name]
+        lines.append(
+            f"{name:<16}"
+            f"Generations/s: {case['Mean Generations/s']:>10.1f} (x{speedup(case['Mean Generations/s'], base['Mean Generations/s']):.2f})\t"
+            f"Decodes/s: {case['Mean Decodes/s']:>12.1f} (x{speedup(case['Mean Decodes/s'], base['Mean Decodes/s']):.2f})\t"
+            f"Best Fitness: {case['Mean Best Fitness']:.4f} ({case['Mean Best Fitness'] - base['Mean Best Fitness']:+.4f})\t"
+            f"Rejection Rate: {case['Mean Rejection Rate']:.3f} ({case['Mean Rejection Rate'] - base.get('Mean Rejection Rate', float('nan')):+.3f})"
+        )
+
+    return lines
+
+
+def benchmark_packing(sizes: List[int], max_weight: float, seeds: List[int]) -> Dict:
+    """
+    Compares packing cylinders into bins one at a time with Bins.pack_cylinder_ff(), which checks every bin for each
+    cylinder, against each indexed bin packing method of Bins.pack_cylinders(). The cylinders are randomly picked from
+    config.CYLINDER_TYPES and packed heaviest first, as a Population does.
+    :param List[int] sizes: The number of cylinders of each case.
+    :param float max_weight: The maximum weight of each bin.
+    :param List[int] seeds: The seeds of each case's cylinders.
+    :return: Dict, the mean time and number of bins of each method, for each case.
+    """
+    report = {}
+    for size in sizes:
+        times, totals = {"first fit (scan)": []} | {method: [] for method in PACKING_METHODS}, {method: [] for method in PACKING_METHODS}
+
+        for seed in seeds:
+            random.seed(seed)
+            cylinders = sorted((Cylinder(CYLINDER_SIDES, diameter, weight) for weight, diameter in random.choices(CYLINDER_TYPES, k=size)),
+                               reverse=True, key=lambda x: x.weight)
+
+            start_time = perf_counter()
+            scanned = Bins(max_weight)
+            for cylinder in cylinders:
+                scanned.pack_cylinder_ff(cylinder)
+            times["first fit (scan)"].append(perf_counter() - start_time)
+
+            for method in PACKING_METHODS:
+                start_time = perf_counter()
+                indexed = Bins(max_weight)
+                indexed.pack_cylinders(cylinders, method)
+                times[method].append(perf_counter() - start_time)
+                totals[method].append(indexed.total)
+
+                if method == "first fit" and [b.cylinders for b in indexed.bins] != [b.cylinders for b in scanned.bins]:
+                    raise Exception(f"\r\033[1m\033[31mCustom Exception: The indexed first fit packed {size} cylinders differently to the scan\033[0m")
+
+        report[f"Packing[{size}]"] = {
+            "Mean Time": {method: fmean(method_times) for method, method_times in times.items()},
+            "Mean Bins": {method: fmean(method_totals) for method, method_totals in totals.items()}
+        }
+
+        case = report[f"Packing[{size}]"]
+        print(f"{f'Packing[{size}]':<16}" + '\t'.join(
+            f"{method}: {time:.4f}s" + (f" ({case['Mean Bins'][method]:.1f} bins)" if method in case["Mean Bins"] else "")
+            for method, time in case["Mean Time"].items()
+        ))
+
+    return report
+
+
+def run_benchmark(seeds: List[int], instances: List[int], synthetic: List[int], synthetic_max_weight: float, scaling: List[int] = (),
+                  scaling_parameters: Dict | None = None, **ga_parameters) -> Dict:
+    """
+    Benchmarks each of the test instances, synthetic and scaling cases.
+    :param List[int] seeds: The seeds each case is run with.
+    :param List[int] instances: The test instances to run [1-7].
+    :param List[int] synthetic: The number of cylinders in each synthetic case, whose cylinders are randomly picked from
+    config.CYLINDER_TYPES and packed into the default container.
+    :param float synthetic_max_weight: The maximum weight of the container in the synthetic cases.
+    :param List[int] scaling: The number of cylinders in each scaling case, generated by synthetic_instance(), which
+    sizes the container and weight limit to the cylinders. Each case is the same instance for every seed.
+    :param Dict | None scaling_parameters: Any further keyword arguments of synthetic_instance(), e.g. distribution.
+    :param ga_parameters: Any further keyword arguments of run_ga(), e.g. population_size.
+    :return: Dict, the report.
+    """
+    cases = {f"Instance[{instance}]": test_instances(instance) for instance in instances}
+    cases.update({
+        f"Synthetic[{num_cylinders}]": ((CONTAINER_WIDTH, CONTAINER_HEIGHT, synthetic_max_weight, num_cylinders), ())
+        for num_cylinders in synthetic
+    })
+    cases.update({
+        f"Scaling[{num_cylinders}]": synthetic_instance(num_cylinders, **(scaling_parameters or {}))
+        for num_cylinders in scaling
+    })
+
+    report = {
+        "Created": strftime("%Y-%m-%d %H:%M:%S"),
+        "Platform": f"{platform.platform()}, Python {platform.python_version()}, NumPy {numpy.__version__}",
+        "Seeds": seeds,
+        "Parameters": ga_parameters,
+        "Scaling Parameters": scaling_parameters if scaling else None,
+        "Cases": {}
+    }
+
+    for name, case in cases.items():
+        report["Cases"][name] = benchmark_case(case, seeds, **ga_parameters)
+        print(f"{name:<16}"
+              f"Wall time: {report['Cases'][name]['Mean Wall Time']:.3f}s\t"
+              f"Generations/s: {report['Cases'][name]['Mean Generations/s']:.1f}\t"
+              f"Decodes/s: {report['Cases'][name]['Mean Decodes/s']:.1f}\t"
+              f"Best Fitness: {report['Cases'][name]['Mean Best Fitness']:.4f}\t"
+              f"Found at: {report['Cases'][name]['Mean Best Found At']:.1f}\t"
+              f"Rejection rate: {report['Cases'][name]['Mean Rejection Rate']:.3f}", end='')
+
+        if report["Cases"][name]["Reached Target"] is None:
+            print()
+        elif report["Cases"][name]["Mean Generations To Target"] is None:
+            print(f"\tReached target: 0%")
+        else:
+            print(f"\tReached target: {report['Cases'][name]['Reached Target']:.0%}, "
+                  f"after {report['Cases'][name]['Mean Generations To Target']:.1f} generations, {report['Cases'][name]['Mean Seconds To Target']:.3f}s")
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Headless benchmarks of the genetic algorithm.")
+    parser.add_argument("--seeds", type=int, default=3, help="The number of seeds to run each case with.")
+    parser.add_argument("--instances", type=int, nargs='*', default=list(range(1, 8)), help="The test instances to run.")
+    parser.add_argument("--synthetic", type=int, nargs='*', default=[], help="The number of cylinders of each synthetic case.")
+    parser.add_argument("--synthetic-max-weight", type=float, default=13_500, help="The maximum weight of a synthetic case's container.")
+    parser.add_argument("--scaling", type=int, nargs='*', default=[], help="The number of cylinders of each generated scaling case.")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="cylinder types", help="How a scaling case's cylinders are drawn.")
+    parser.add_argument("--fill-density", type=float, default=.5, help="The fraction of the container each bin of a scaling case would cover.")
+    parser.add_argument("--weight-tightness", type=float, default=1., help="Roughly how many bins the weight limit of a scaling case needs.")
+    parser.add_argument("--population-size", type=int, default=50)
+    parser.add_argument("--max-generations", type=int, default=100)
+    parser.add_argument("--mutation-rate", type=float, default=.1)
+    parser.add_argument("--crossover", choices=("single point", "multi point", "uniform", "davis order"), default="single point", help="The crossover method.")
+    parser.add_argument("--mutation", choices=("uniform", "feasible"), default="uniform", help="The mutation mode.")
+    parser.add_argument("--bin-packing", choices=tuple(PACKING_METHODS), default=BIN_PACKING, help="How the cylinders are packed into bins.")
+    parser.add_argument("--packing", type=int, nargs='*', default=[], help="Only compares the bin packing methods, on this many cylinders.")
+    parser.add_argument("--islands", type=int, default=1, help="The number of islands each bin is evolved across.")
+    parser.add_argument("--migration-interval", type=int, default=MIGRATION_INTERVAL)
+    parser.add_argument("--migration-topology", choices=TOPOLOGIES, default=MIGRATION_TOPOLOGY)
+    parser.add_argument("--cylinder-sides", type=int, default=CYLINDER_SIDES)
+    parser.add_argument("--initialiser", choices=INITIALISERS, default="random", help="How the first generation of each bin is created.")
+    parser.add_argument("--seeded-fraction", type=float, default=SEEDED_FRACTION, help="The fraction of the first generation the mixed initialiser seeds.")
+    parser.add_argument("--archive", nargs='*', default=[], help="The results, result cache entries or telemetry files whose placements seed the first generation.")
+    parser.add_argument("--time-to-target", type=float, default=None, help="The fitness whose time to reach is reported for each bin.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="The report to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Stores this report as the baseline.")
+    args = parser.parse_args()
+
+    if args.packing:
+        benchmark_packing(args.packing, args.synthetic_max_weight, list(range(args.seeds)))
+        exit()
+
+    _parameters = {
+        "population_size": args.population_size,
+        "max_generations": args.max_generations,
+        "mutation_rate": args.mutation_rate,
+        "crossover": args.crossover,
+        "mutation": args.mutation,
+        "packing": args.bin_packing,
+        "islands": args.islands,
+        "migration_interval": args.migration_interval,
+        "migration_topology": args.migration_topology,
+        "cylinder_sides": args.cylinder_sides,
+        "initialiser": args.initialiser,
+        "seeded_fraction": args.seeded_fraction,
+        "initial_archive": args.archive,
+        "time_to_target": args.time_to_target
+    }
+    _scaling_parameters = {"distribution": args.distribution, "fill_density": args.fill_density, "weight_tightness": args.weight_tightness}
+    _report = run_benchmark(list(range(args.seeds)), args.instances, args.synthetic, args.synthetic_max_weight, args.scaling, _scaling_parameters, **_parameters)
+
+    _report_path = f"{BENCHMARK_DIRECTORY}/BENCHMARK-PS[{args.population_size}]-MG[{args.max_generations}]-MR[{args.mutation_rate}]-CT[{args.crossover}]-MM[{args.mutation}]-IS[{args.islands}]{f'-IN[{args.initialiser}]' if args.initialiser != 'random' else ''}.json"
+    with open(_report_path, 'w') as json_file:
+        dump(_report, json_file, indent=2)
+    print(f"\nReport written to {_report_path}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as json_file:
+            dump(_report, json_file, indent=2)
+        print(f"Baseline stored at {args.baseline}")
+
+    elif exists(args.baseline):
+        with open(args.baseline) as json_file:
+            _baseline = load(json_file)
+
+        print(f"\nCompared against the baseline from {_baseline['Created']}:")
+        print('\n'.join(compare(_report, _baseline)))
@@ -0,0 +1,146 @@
+from bisect import bisect_right, insort
+from typing import List, Sequence
+
+
+class FirstFitIndex:
+    """
+    Finds the first bin a weight fits into, using a segment tree of the lowest load within each range of bins, so a
+    weight is placed in O(log bins) rather than by checking every bin in turn.
+    """
+
+    def __init__(self, max_weight: float, capacity: int = 64):
+        """
+        :param float max_weight: The maximum weight of each bin.
+        :param int capacity: The number of bins the tree holds before it's doubled.
+        """
+        self.__max_weight = max_weight
+        self.__capacity = capacity
+        self.__tree = [float("inf")] * (2 * capacity)  # the root is at 1, and the load of bin i at capacity + i
+        self.__total = 0
+
+    @property
+    def total(self) -> int:
+        return self.__total
+
+    def __grow(self) -> None:
+        """
+        Doubles the number of bins the tree holds.
+        :return: None
+        """
+        loads = self.__tree[self.__capacity:]
+        self.__capacity *= 2
+        self.__tree = [float("inf")] * self.__capacity + loads + [float("inf")] * (self.__capacity - len(loads))
+
+        for node in range(self.__capacity - 1, 0, -1):
+            self.__tree[node] = min(self.__tree[2 * node], self.__tree[2 * node + 1])
+
+    def __set_load(self, bin_index: int, load: float) -> None:
+        """
+        Sets the load of a bin, and the lowest load of each range above it.
+        :return: None
+        """
+        node = self.__capacity + bin_index
+        self.__tree[node] = load
+
+        node //= 2
+        while node:
+            self.__tree[node] = min(self.__tree[2 * node], self.__tree[2 * node + 1])
+            node //= 2
+
+    def place(self, weight: float) -> int:
+        """
+        Places a weight into the first bin it fits into, opening a new bin when none of them have room for it.
+        :param float weight: The weight to place, which mustn't be heavier than the maximum weight.
+        :return: int, the index of the bin.
+        """
+        tree, max_weight = self.__tree, self.__max_weight
+
+        # The same check as Bin.add(), which holds for a range of bins when it holds for its lowest load.
+        if tree[1] + weight > max_weight:
+            if self.__total == self.__capacity:
+                self.__grow()
+
+            self.__total += 1
+            self.__set_load(self.__total - 1, weight)
+            return self.__total - 1
+
+        node = 1
+        while node < self.__capacity:
+            node *= 2
+            if tree[node] + weight > max_weight:  # the first bin is in the right half, as it isn't in the left
+                node += 1
+
+        self.__set_load(node - self.__capacity, tree[node] + weight)
+        return node - self.__capacity
+
+
+class BestFitIndex:
+    """
+    Finds the fullest bin a weight fits into (the earliest of them on a tie), using the loads of every bin kept in
+    sorted order, so the bin is found with a binary search rather than by checking every bin in turn.
+    """
+
+    def __init__(self, max_weight: float):
+        """
+        :param float max_weight: The maximum weight of each bin.
+        """
+        self.__max_weight = max_weight
+        self.__loads = []  # [(load, -bin index)], in ascending order
+        self.__total = 0
+
+    @property
+    def total(self) -> int:
+        return self.__total
+
+    def place(self, weight: float) -> int:
+        """
+        Places a weight into the fullest bin it fits into, opening a new bin when none of them have room for it.
+        :param float weight: The weight to place, which mustn't be heavier than the maximum weight.
+        :return: int, the index of the bin.
+        """
+        loads, max_weight = self.__loads, self.__max_weight
+
+        # Found by the load left over, then corrected for any rounding, so the same check as Bin.add() is used.
+        i = bisect_right(loads, (max_weight - weight, float("inf")))
+        while i < len(loads) and loads[i][0] + weight <= max_weight:
+            i += 1
+        while i and loads[i - 1][0] + weight > max_weight:
+            i -= 1
+
+        if not i:
+            self.__total += 1
+            insort(loads, (weight, 1 - self.__total))
+            return self.__total - 1
+
+        load, bin_index = loads.pop(i - 1)
+        insort(loads, (load + weight, bin_index))
+        return -bin_index
+
+
+# The bin packing methods, by the index each uses to find the bin of a weight.
+PACKING_METHODS = {"first fit": FirstFitIndex, "best fit": BestFitIndex}
+
+
+def assign_bins(weights: Sequence[float], max_weight: float, method: str = "first fit") -> List[int]:
+    """
+    Assigns each weight to a bin, in the order they're given, so packing them from heaviest to lightest gives
+    first-fit decreasing or best-fit decreasing. Weights heavier than the maximum weight are discarded.
+    :param Sequence[float] weights: The weight of each cylinder.
+    :param float max_weight: The maximum weight of each bin.
+    :param str method: Either "first fit" (the first bin with room) or "best fit" (the fullest bin with room).
+    :return: List[int], the index of each weight's bin, -1 if it was discarded.
+    """
+    if method not in PACKING_METHODS:
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown bin packing method '{method}', use one of {list(PACKING_METHODS)}\033[0m")
+
+    index = PACKING_METHODS[method](max_weight)
+
+    return [index.place(weight) if weight <= max_weight else -1 for weight in weights]
+
+
+if __name__ == "__main__":
+    _weights = [5, 6, 4, 3, 2]
+
+    print(f"Weights:\t\t\t{_weights}\n"
+          f"First fit bins:\t\t{assign_bins(_weights, 10, 'first fit')}\n"
+          f"Best fit bins:\t\t{assign_bins(_weights, 10, 'best fit')}")
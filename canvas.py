@@ -39,6 +39,10 @@ class Container:
     def cylinder_patches(self) -> List[CustomCircle]:
         return self._cylinder_patches
 
+    @property
+    def com_marker(self) -> Union[Line2D, None]:
+        return self._com_marker
+
     def add_cylinders(self) -> None:
         """
         Creates CustomCircle objects that correspond to each cylinder in the best_cylinder_group's cylinders respectively.
@@ -138,6 +142,8 @@ class AnimatedContainer(Container):
     BEST_TITLE = 2
     TRANSITION_TITLE_R = 3  # Reversed Transition Title
 
+    PAUSE_LENGTH = 20  # the number of frames each key generation is paused on.
+
     def __init__(self, fpp: int, fig: plt.Figure, ax: plt.Axes, event_manager: EventManager, width: float, height: float):
         super().__init__(fig, ax, event_manager, width, height)
 
@@ -155,7 +161,7 @@ class AnimatedContainer(Container):
 
         self.__animation_frame = 1  # an internal frame counter which counts the frames an animation is occurring.
         self.__paused_frame = 1  # Always pause the first frame so that the Generation-0 of placements can be viewed.
-        self.__pause_length = 20
+        self.__pause_length = self.PAUSE_LENGTH
 
     @property
     def save_states(self) -> Dict[Cylinder, List[List[Tuple[float, float]]]]:
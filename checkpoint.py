@@ -0,0 +1,157 @@
+from config import CHECKPOINT_GENERATIONS, CHECKPOINT_SECONDS
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Tuple
+from time import perf_counter
+from json import dumps, loads
+import numpy as np
+import random
+import os
+
+
+def _write(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Writes a checkpoint into a temporary file that then replaces the last checkpoint, so a run that's killed whilst
+    writing still leaves the last checkpoint intact.
+    :param str path: The path of the checkpoint.
+    :param Dict[str, np.ndarray] arrays: The arrays of the checkpoint.
+    :return: None
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        np.savez_compressed(file, **arrays)
+
+    os.replace(temporary, path)
+
+
+def random_state() -> np.ndarray:
+    """
+    Gets the state of the random module, to be written into a checkpoint.
+    :return: np.ndarray
+    """
+    return np.array(dumps(random.getstate()))
+
+
+def restore_random_state(state: np.ndarray) -> None:
+    """
+    Restores the state of the random module from a checkpoint.
+    :param np.ndarray state: The state from random_state().
+    :return: None
+    """
+    version, internal_state, gauss_next = loads(state.item())
+    random.setstate((version, tuple(internal_state), gauss_next))
+
+
+def load_checkpoint(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]]]]:
+    """
+    Loads a checkpoint written by a Checkpointer.
+    :param str path: The path of the checkpoint.
+    :return: Tuple[Dict[str, np.ndarray], Dict[str, Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]]]],
+    the state of the bin that was being evolved for Population.restore(), which only holds the random_state when the
+    checkpoint was written as a bin finished, and the summary and key generations of each bin that had finished
+    evolving: {'Bin i': (summary, key generations)}.
+    """
+    with np.load(path) as checkpoint:
+        state = {name: checkpoint[name] for name in checkpoint.files}
+
+    completed = {
+        name: (summary, [(generation, fitness, [tuple(centre) for centre in centres]) for generation, fitness, centres in key_generations])
+        for name, (summary, key_generations) in loads(state.pop("completed").item()).items()
+    }
+
+    return state, completed
+
+
+class Checkpointer:
+    """
+    Writes a checkpoint of the bin being evolved every few generations and/or seconds, so an interrupted run can resume
+    from it. The state is copied between generations, and compressed and written by a background thread, so the
+    evolution carries on whilst it's written. When a write is still going once the next checkpoint is due, that
+    checkpoint is skipped rather than stalling the evolution.
+    """
+
+    def __init__(self, path: str, *, every_generations: int | None = CHECKPOINT_GENERATIONS, every_seconds: float | None = CHECKPOINT_SECONDS):
+        """
+        :param str path: Where the checkpoint is written, it's replaced by every new checkpoint.
+        :param int | None every_generations: Write a checkpoint every this many generations.
+        :param float | None every_seconds: Write a checkpoint once this many seconds have passed since the last.
+        """
+        self.__path = path
+        self.__every_generations = every_generations
+        self.__every_seconds = every_seconds
+
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__pending: Future | None = None
+        self.__last_time = perf_counter()
+
+        # The summary and key generations of each bin that has finished evolving, written into every checkpoint.
+        self.__completed: Dict[str, Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]]] = {}
+
+        self.__written = 0
+        self.__skipped = 0
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def due(self, generations: int) -> bool:
+        """
+        Checks whether a checkpoint should be written once a generation has finished.
+        :param int generations: The number of generations that have been computed.
+        :return: bool
+        """
+        due = (self.__every_generations is not None and generations % self.__every_generations == 0) or \
+              (self.__every_seconds is not None and perf_counter() - self.__last_time >= self.__every_seconds)
+
+        if due and self.__pending is not None and not self.__pending.done():
+            self.__skipped += 1
+            return False
+
+        return due
+
+    def save(self, state: Dict[str, np.ndarray]) -> None:
+        """
+        Writes a checkpoint in the background.
+        :param Dict[str, np.ndarray] state: The state of the bin being evolved, from Population.checkpoint_state(). It
+        mustn't be changed afterwards, so it should only hold copies.
+        :return: None
+        """
+        if self.__pending is not None:
+            self.__pending.result()  # raises anything the last write failed with
+
+        arrays = dict(state, completed=np.array(dumps(self.__completed)))
+        self.__pending = self.__executor.submit(_write, self.__path, arrays)
+        self.__last_time = perf_counter()
+        self.__written += 1
+
+    def complete_bin(self, name: str, summary: Dict, key_generations: List[Tuple[int, float, List[Tuple[float, float]]]]) -> None:
+        """
+        Records a bin that has finished evolving, so a resumed run doesn't evolve it again, and writes a checkpoint of
+        the random module's state so a resumed run carries on from the next bin in the same way.
+        :param str name: The name of the bin, e.g. 'Bin 0'.
+        :param Dict summary: The summary of the bin's evolution.
+        :param List[Tuple[int, float, List[Tuple[float, float]]]] key_generations: The key generations of the bin.
+        :return: None
+        """
+        self.__completed[name] = (summary, key_generations)
+        self.save({"random_state": random_state()})
+
+    def close(self) -> None:
+        """
+        Waits for the last checkpoint to be written.
+        :return: None
+        """
+        if self.__pending is not None:
+            self.__pending.result()
+
+        self.__executor.shutdown()
+
+    def get_summary(self) -> Dict:
+        """
+        Summarises the checkpoints that were written.
+        :return: Dict
+        """
+        return {
+            "Path": self.__path,
+            "Written": self.__written,
+            "Skipped": self.__skipped
+        }
@@ -0,0 +1,150 @@
+"""
+A small client of the packing job service (service.py).
+
+Usage: python client.py [--host 127.0.0.1] [--port 8765] [--socket path] [--instance 7] [--max-generations 100]
+"""
+
+from config import SERVICE_HOST, SERVICE_PORT, EXECUTE_TEST_CASE
+from cylinders import Cylinder
+from http.client import HTTPConnection
+from argparse import ArgumentParser
+from json import dumps, loads
+from time import perf_counter, sleep
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import socket
+
+
+class _UnixConnection(HTTPConnection):
+    """An HTTP connection over a Unix socket."""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.__socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.__socket_path)
+
+
+class PackingClient:
+    """Submits packing jobs to a running service, and follows them until they're done."""
+
+    def __init__(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, socket_path: str | None = None, timeout: float = 30.):
+        """
+        :param str host: The host the service listens on.
+        :param int port: The port the service listens on.
+        :param str | None socket_path: The Unix socket the service listens on, used instead of the host and port.
+        :param float timeout: The most seconds a request waits for its response.
+        """
+        self.__host = host
+        self.__port = port
+        self.__socket_path = socket_path
+        self.__timeout = timeout
+
+    def __request(self, method: str, path: str, body: Dict | None = None) -> Dict:
+        """
+        Sends a request to the service, over a connection of its own.
+        :return: Dict, the JSON response.
+        """
+        connection = _UnixConnection(self.__socket_path, self.__timeout) if self.__socket_path is not None else \
+            HTTPConnection(self.__host, self.__port, timeout=self.__timeout)
+
+        try:
+            connection.request(method, path, body=dumps(body) if body is not None else None, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            payload = loads(response.read() or b"{}")
+        finally:
+            connection.close()
+
+        if response.status >= 400:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: The service refused {method} {path} ({response.status}): {payload.get('error')}\033[0m")
+
+        return payload
+
+    def health(self) -> Dict:
+        return self.__request("GET", "/health")
+
+    def jobs(self) -> List[Dict]:
+        return self.__request("GET", "/jobs")["jobs"]
+
+    def status(self, job_id: str) -> Dict:
+        return self.__request("GET", f"/jobs/{job_id}")
+
+    def submit(self, cylinders: str | Sequence[Cylinder] | Sequence[Tuple[int, float, float]], container_width: float, container_height: float,
+               max_weight: float, *, seed: int | None = None, **parameters) -> str:
+        """
+        Queues a job.
+        :param str | Sequence[Cylinder] | Sequence[Tuple[int, float, float]] cylinders: The path of a manifest the
+        service can read, or the cylinders themselves (as objects or (id, diameter, weight) rows).
+        :param float container_width: The width of the container.
+        :param float container_height: The height of the container.
+        :param float max_weight: The maximum weight of each bin.
+        :param int | None seed: The seed the job is run with, None for a random one.
+        :param parameters: Any keyword arguments of run_ga() in service.JOB_PARAMETERS, e.g. max_generations.
+        :return: str, the job's id.
+        """
+        job = {"container_width": container_width, "container_height": container_height, "max_weight": max_weight, "parameters": parameters, "seed": seed}
+
+        if isinstance(cylinders, str):
+            job["manifest"] = cylinders
+        else:
+            job["cylinders"] = [(cylinder.id, cylinder.diameter, cylinder.weight) if isinstance(cylinder, Cylinder) else tuple(cylinder) for cylinder in cylinders]
+
+        return self.__request("POST", "/jobs", job)["id"]
+
+    def wait(self, job_id: str, poll: float = .1, timeout: float | None = None, on_progress: Callable[[Dict], None] | None = None) -> Dict:
+        """
+        Polls a job until it's finished.
+        :param str job_id: The job's id.
+        :param float poll: The seconds between each poll.
+        :param float | None timeout: The most seconds to wait, None waits for as long as the job takes.
+        :param Callable[[Dict], None] | None on_progress: Called with the job's status at every poll, e.g. to show its
+        progress.
+        :return: Dict, the job's final status, holding its result.
+        """
+        start_time = perf_counter()
+
+        while True:
+            status = self.status(job_id)
+            if on_progress is not None:
+                on_progress(status)
+
+            if status["status"] == "done":
+                return status
+
+            if status["status"] == "failed":
+                raise Exception(f"\r\033[1m\033[31mCustom Exception: Job {job_id} failed: {status['error']}\033[0m")
+
+            if timeout is not None and perf_counter() - start_time > timeout:
+                raise Exception(f"\r\033[1m\033[31mCustom Exception: Job {job_id} didn't finish within {timeout}s\033[0m")
+
+            sleep(poll)
+
+
+if __name__ == "__main__":
+    from TEST import test_instances
+
+    parser = ArgumentParser(description="Packs a test instance through a running packing job service.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--socket", default=None, help="The Unix socket the service listens on.")
+    parser.add_argument("--instance", type=int, default=EXECUTE_TEST_CASE, help="The test instance to pack [1-7].")
+    parser.add_argument("--max-generations", type=int, default=100)
+    args = parser.parse_args()
+
+    (_container_width, _container_height, _max_weight), _cylinders = test_instances(args.instance)
+
+    _client = PackingClient(args.host, args.port, args.socket)
+    _job_id = _client.submit(_cylinders, _container_width, _container_height, _max_weight, max_generations=args.max_generations)
+
+    def _show(status: Dict) -> None:
+        progress = status["progress"]
+        print(f"\rJob {_job_id}: {status['status']:<8} bin {progress['bin']}, generation {progress['generation']}/{progress['max_generations']}, "
+              f"best fitness {progress['best']}", end='', flush=True)
+
+    _status = _client.wait(_job_id, on_progress=_show)
+    print(f"\nPacked {len(_status['result']['bins'])} bin(s) in {_status['run_seconds']:.2f}s, after {_status['queue_seconds']:.2f}s queued")
+    for _name, _summary in _status["result"]["bins"].items():
+        print(f"\t{_name}: fitness {_summary['Best Cylinder Group']['Fitness']:.4f}, stopped because {_summary['Stop Reason']}")
@@ -9,10 +9,151 @@ CYLINDER_TYPES = [
     (300, 1.2)   # Light barrel
 ]
 
+# --- BINNING --- #
+# How the cylinders are packed into bins by weight, heaviest first: "first fit" puts each into the first bin with room,
+# whereas "best fit" puts each into the fullest bin with room.
+BIN_PACKING = "first fit"
+
 # --- SIDE POSITION --- #
 # Define the number of sides a cylinder will have
 CYLINDER_SIDES = 8
 
+# --- DECODING --- #
+# The number of decoded position strings to remember, so repeated ones don't need decoding again. 0 disables the cache.
+DECODE_CACHE_SIZE = 0
+
+# Whether a position string resumes decoding from the longest prefix it shares with one from the last generation, as
+# the placement of a cylinder only depends on the position numbers before it.
+RESUME_DECODES = True
+
+# Bins with at least this many cylinders index the placed cylinders in a uniform grid whilst decoding, so each
+# candidate position is only checked against the cylinders near it for intersections.
+SPATIAL_INDEX_MIN_CYLINDERS = 150
+
+# --- INITIALISATION --- #
+# How the position strings of each bin's first generation are created: "random" draws every position number at random,
+# "greedy" builds each group by placing every cylinder where it keeps the centre of mass closest to the centre of the
+# container, "archive" rebuilds groups from the placements of earlier runs within INITIAL_ARCHIVE (drawing the rest at
+# random), and "mixed" seeds SEEDED_FRACTION of the groups from the archive and then greedily, drawing the rest at random.
+INITIALISER = "random"
+SEEDED_FRACTION = .2
+
+# The results (e.g. "_TEST_RESULTS"), result cache entries or telemetry files, or directories of them, whose placements
+# seed the first generation of any bin holding at least half of the same cylinders.
+INITIAL_ARCHIVE = []
+
+# The number of best positions each greedily placed cylinder is drawn from, so the groups differ. The first greedy group
+# always takes the best.
+GREEDY_CANDIDATES = 5
+
+# The most placed cylinders each greedily placed cylinder tries the positions around, drawn at random once more have
+# been placed, so building the groups of a large bin stays quick.
+GREEDY_TARGETS = 32
+
+# --- SELECTION --- #
+# How the parents of each generation are selected: "tournament", "roulette wheel", "stochastic universal sampling",
+# "rank based" or "elitist".
+SELECTION_METHOD = "tournament"
+
+# --- CROSSOVER --- #
+# How the parents of each generation are crossed over: "single point", "multi point", "uniform" or "davis order".
+CROSSOVER_METHOD = "single point"
+
+# The number of points used by multi point crossover, fewer are used when the position strings are too short.
+MULTI_POINT_CROSSOVERS = 2
+
+# --- MUTATION --- #
+# How a mutated position number is replaced: "uniform" picks any position number that isn't already within the position
+# string, whereas "feasible" only picks from those that would place the cylinder within the container without
+# intersecting any cylinder before it, as decoded by the parent it was made from.
+MUTATION_MODE = "uniform"
+
+# --- STOPPING CRITERIA --- #
+# Each criterion is checked after every generation, and the evolution of a bin stops once any are met. None disables it.
+# The number of generations without an improvement in the best fitness after which a bin stops evolving.
+STAGNATION_GENERATIONS = None
+
+# The fitness which, once reached, stops a bin from evolving.
+TARGET_FITNESS = None
+
+# The fitness whose time to reach (in generations and seconds, from the start of each bin) is shown in each bin's
+# summary, without stopping the evolution. If None is specified, TARGET_FITNESS is used.
+TIME_TO_TARGET = None
+
+# The number of seconds each bin may evolve for, and the number of seconds all the bins may evolve for in total.
+BIN_TIME_BUDGET = None
+TOTAL_TIME_BUDGET = None
+
+# The fraction of distinct position strings [0-1] in the population, below which a bin stops evolving.
+DIVERSITY_FLOOR = None
+
+# --- CHECKPOINTS --- #
+# Where a checkpoint of the bin being evolved is written, so an interrupted run can be resumed from it. None disables it.
+CHECKPOINT_PATH = None
+
+# How often a checkpoint is written: every this many generations, and/or once this many seconds have passed. None
+# disables either.
+CHECKPOINT_GENERATIONS = 50
+CHECKPOINT_SECONDS = None
+
+# --- TELEMETRY --- #
+# Where a record of every generation of each bin (its best, mean and std fitness, diversity, decode counters and time) is
+# streamed to as JSON lines, followed by the final placements of each bin. None disables it.
+TELEMETRY_PATH = None
+
+# --- RESULT CACHE --- #
+# How bins solved by earlier runs (with the same cylinders, container and parameters) are used: "reuse" returns their
+# placements without evolving them, "warm start" evolves them starting from their placements, and None doesn't cache.
+RESULT_CACHE_MODE = None
+
+# The directory the solved bins are kept within, and the most bytes they can take up before the least recently used
+# are removed.
+RESULT_CACHE_DIRECTORY = "_RESULT_CACHE"
+RESULT_CACHE_BYTES = 64 * 1024 ** 2
+
+# --- PROFILING --- #
+# Whether to time each phase of every generation (decoding, selection, crossover, etc.), shown in each bin's summary.
+PROFILE_PHASES = False
+
+# --- PARALLELISM --- #
+# The number of worker processes that evolve separate bins at the same time, 1 evolves each bin one after another.
+BIN_WORKERS = 1
+
+# The number of worker processes that share the decoding of a population within each generation, 1 decodes serially.
+DECODE_WORKERS = 1
+
+# Populations smaller than this are always decoded serially, as the overhead of the workers would outweigh the gain.
+PARALLEL_DECODE_MIN_SIZE = 400
+
+# --- ISLANDS --- #
+# The number of sub-populations (islands) each bin is evolved across, each within its own process, 1 evolves a single
+# population. When there are several islands, the bins are evolved one after another.
+ISLANDS = 1
+
+# The number of generations between each migration, and the number of each island's fittest groups that migrate.
+MIGRATION_INTERVAL = 10
+MIGRANTS = 2
+
+# Where the migrants of each island go: "ring" (to the next island), "fully connected" (every other island, each of which
+# keeps the fittest of those it receives) or "random" (to another island, drawn for every migration).
+MIGRATION_TOPOLOGY = "ring"
+
+# The selection, crossover and mutation of each island, cycled through when there are more islands than entries. Any
+# that aren't given use the population's, e.g. [{}, {"selection": "rank based", "crossover": "uniform"}]
+ISLAND_OPERATORS = []
+
+# --- SERVICE --- #
+# The address the packing job service (service.py) listens on, unless it's given a Unix socket.
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+
+# The number of worker processes the service runs jobs within, which are started before the first job arrives. If
+# None is specified, there's a worker for each CPU.
+SERVICE_WORKERS = None
+
+# The number of finished jobs whose results the service keeps, the oldest are forgotten first.
+SERVICE_RETAINED_JOBS = 1000
+
 # --- VISUALISATIONS --- #
 # Whether to visually see the evolution of the population take place.
 VISUALISE_EVOLUTION = True
@@ -24,11 +165,15 @@ SLIDE_ANIMATION = False
 # Determines whether the animations loop or not.
 REPEAT_ANIMATION = False
 
-# Determines whether you (the user) want to save the produced animation
-# MUST SET VISUALISE_EVOLUTION = TRUE FOR PROPER SAVING
+# Determines whether you (the user) want to save the animation of each bin, which is rendered once every bin has evolved,
+# whether or not the evolution is visualised. Formats other than "gif" (e.g. "mp4") need FFmpeg.
 SAVE_ANIMATION = False
 SAVE_FORMAT = "gif"
 
+# The number of worker processes that render the saved animations, each a bin at a time, 1 renders them one after
+# another and None uses a worker for each CPU.
+RENDER_WORKERS = None
+
 # Determines whether you (the user) would like to use the arrow keys to go through each key generation or not.
 MANUAL_FLICK = False
 
@@ -40,5 +185,9 @@ FRAMES_PER_PATCH = 30
 # The test instance to run [1-7], anything outside the range will use the default values
 EXECUTE_TEST_CASE = 7
 
+# A manifest of cylinders (.csv, .jsonl or .npy of id, diameter and weight) to load in place of the test instance's
+# cylinders, None to use the test instance. The container's dimensions and maximum weight are still the test instance's.
+MANIFEST_PATH = None
+
 # Whether to record significant generational changes within a population.
 RECORD_RESULTS = False
@@ -2,6 +2,8 @@ from .single_point import single_point_crossover
 from .davis_order import davis_order_crossover
 from .multi_point import multi_point_crossover
 from .uniform import uniform_crossover
+from .batched import batch_single_point_crossover, batch_multi_point_crossover, batch_uniform_crossover, batch_davis_order_crossover
 
 __all__ = ["single_point_crossover", "multi_point_crossover", "davis_order_crossover",
-           "uniform_crossover"]
+           "uniform_crossover", "batch_single_point_crossover", "batch_multi_point_crossover",
+           "batch_uniform_crossover", "batch_davis_order_crossover"]
@@ -0,0 +1,218 @@
+"""
+Vectorised versions of each crossover, which create a whole generation of offspring at once from a matrix of position
+strings. Each row of the matrix is a position string, padded to the matrix's width, and its length is held separately.
+They create the same offspring as the functions they're based on would, given the same random points and choices, and
+those functions remain the reference for them. Where the reference would splice position strings of different
+lengths, the lengths of the offspring change in the same way as the lists would.
+"""
+
+from utils import RowSets
+from typing import Tuple
+import numpy as np
+
+# A point past the end of every position string.
+_END = np.iinfo(np.int64).max
+
+
+def _parents(genomes: np.ndarray, lengths: np.ndarray, parents: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Gathers the position strings and lengths of each pair of parents."""
+    return genomes[parents[:, 0]], lengths[parents[:, 0]], genomes[parents[:, 1]], lengths[parents[:, 1]]
+
+
+def _random_points(lengths: np.ndarray, k: int, width: int, rng: np.random.Generator) -> np.ndarray:
+    """Draws k distinct random points below each length, in ascending order, like sorted(sample(range(length), k))."""
+    if (lengths < k).any():
+        raise ValueError("Sample larger than population or is negative")
+
+    keys = np.where(np.arange(width) < lengths[:, None], rng.random((len(lengths), width)), np.inf)
+
+    return np.sort(np.argsort(keys, axis=1)[:, :k], axis=1)
+
+
+def _choose(rng: np.random.Generator, first: Tuple[np.ndarray, np.ndarray], second: Tuple[np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Randomly chooses either offspring of each pair, like choice((first, second))."""
+    chosen = rng.random(len(first[1])) < .5
+
+    return np.where(chosen[:, None], second[0], first[0]), np.where(chosen, second[1], first[1])
+
+
+def _splice(x: np.ndarray, x_lengths: np.ndarray, y: np.ndarray, y_lengths: np.ndarray, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Replaces x[low:high] with y[low:high] within every row, with the same result as the slice assignment of lists.
+    :return: Tuple[np.ndarray, np.ndarray], the spliced rows and their lengths.
+    """
+    x_low, x_high = np.minimum(low, x_lengths), np.minimum(high, x_lengths)
+    y_low, y_high = np.minimum(low, y_lengths), np.minimum(high, y_lengths)
+
+    head, middle, tail = x_low, y_high - y_low, x_lengths - x_high
+    columns = np.arange(x.shape[1])
+
+    from_y = (columns >= head[:, None]) & (columns < (head + middle)[:, None])
+    x_columns = np.where(columns < head[:, None], columns, columns - middle[:, None] + (x_high - x_low)[:, None])
+    y_columns = columns + (y_low - x_low)[:, None]
+
+    spliced = np.where(
+        from_y,
+        np.take_along_axis(y, np.clip(y_columns, 0, x.shape[1] - 1), axis=1),
+        np.take_along_axis(x, np.clip(x_columns, 0, x.shape[1] - 1), axis=1)
+    )
+    spliced_lengths = head + middle + tail
+
+    return np.where(columns < spliced_lengths[:, None], spliced, 0), spliced_lengths
+
+
+def batch_single_point_crossover(genomes: np.ndarray, lengths: np.ndarray, parents: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs single-point crossover between each pair of parents, and randomly chooses one of the offsprings of each.
+    :param np.ndarray genomes: (groups, width) the position strings of the groups.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :param np.ndarray parents: (offspring, 2) the indices of the pair of groups each offspring is made from.
+    :param np.random.Generator rng: The generator the random points and choices are drawn from.
+    :return: Tuple[np.ndarray, np.ndarray], the position strings of the offspring and their lengths.
+    """
+    group1, lengths1, group2, lengths2 = _parents(genomes, lengths, parents)
+    random_points = (rng.random(len(parents)) * lengths1).astype(np.int64)
+
+    return _choose(
+        rng,
+        _splice(group1, lengths1, group2, lengths2, random_points, _END),
+        _splice(group2, lengths2, group1, lengths1, random_points, _END)
+    )
+
+
+def batch_multi_point_crossover(genomes: np.ndarray, lengths: np.ndarray, parents: np.ndarray, rng: np.random.Generator, *, crossovers: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs multi-point crossover between each pair of parents, and randomly chooses one of the offsprings of each.
+    :param np.ndarray genomes: (groups, width) the position strings of the groups.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :param np.ndarray parents: (offspring, 2) the indices of the pair of groups each offspring is made from.
+    :param np.random.Generator rng: The generator the random points and choices are drawn from.
+    :param int crossovers: The number of crossover points to use.
+    :return: Tuple[np.ndarray, np.ndarray], the position strings of the offspring and their lengths.
+    """
+    if crossovers == 1:
+        return batch_single_point_crossover(genomes, lengths, parents, rng)
+
+    group1, lengths1, group2, lengths2 = _parents(genomes, lengths, parents)
+    random_points = _random_points(lengths1, crossovers, genomes.shape[1], rng)
+
+    # Every other segment between the points is swapped, the last running to the end of the position strings.
+    for i in range(0, crossovers, 2):
+        low = random_points[:, i]
+        high = random_points[:, i + 1] if i + 1 < crossovers else _END
+
+        (group1, new_lengths1), (group2, lengths2) = (
+            _splice(group1, lengths1, group2, lengths2, low, high),
+            _splice(group2, lengths2, group1, lengths1, low, high)
+        )
+        lengths1 = new_lengths1
+
+    return _choose(rng, (group1, lengths1), (group2, lengths2))
+
+
+def batch_uniform_crossover(genomes: np.ndarray, lengths: np.ndarray, parents: np.ndarray, rng: np.random.Generator, *, bias: float = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs uniform crossover between each pair of parents, and chooses one of the offsprings of each based on a bias.
+    :param np.ndarray genomes: (groups, width) the position strings of the groups.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :param np.ndarray parents: (offspring, 2) the indices of the pair of groups each offspring is made from.
+    :param np.random.Generator rng: The generator the swaps and choices are drawn from.
+    :param float bias: The amount of bias either of the group have. The range of values is [-0.5, 0.5], wherein the bias
+    is toward the first and second parent respectively.
+    :return: Tuple[np.ndarray, np.ndarray], the position strings of the offspring and their lengths.
+    """
+    group1, lengths1, group2, lengths2 = _parents(genomes, lengths, parents)
+
+    # Only the position numbers both parents have can be swapped.
+    shared = np.arange(genomes.shape[1]) < np.minimum(lengths1, lengths2)[:, None]
+    swapped = shared & (rng.random(group1.shape) > .5 + bias)
+
+    offspring1 = np.where(swapped, group2, group1)
+    offspring2 = np.where(swapped, group1, group2)
+
+    if bias != 0:
+        return offspring2, lengths2
+
+    return _choose(rng, (offspring1, lengths1), (offspring2, lengths2))
+
+
+def _davis_order_offspring(own: np.ndarray, own_lengths: np.ndarray, other: np.ndarray, other_lengths: np.ndarray, group_lengths: np.ndarray, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Creates the offspring of Davis-Order crossover that keeps its own segment between the points, and fills the rest
+    with the other parent's position numbers that aren't within that segment, starting from the segment.
+    """
+    rows = np.arange(len(own))[:, None]
+    columns = np.arange(own.shape[1])
+
+    own_low, own_high = np.minimum(low, own_lengths), np.minimum(high, own_lengths)
+    segment = (columns >= own_low[:, None]) & (columns < own_high[:, None])
+    segment_length = own_high - own_low
+
+    # - The other parent's position numbers, from its segment onwards and wrapping around - #
+    other_low, other_high = np.minimum(low, other_lengths), np.minimum(high, other_lengths)
+    middle, head = other_high - other_low, other_low
+
+    source = np.where(
+        columns < middle[:, None], columns + other_low[:, None],
+        np.where(columns < (middle + head)[:, None], columns - middle[:, None], columns - (middle + head)[:, None] + high[:, None])
+    )
+    ordered = np.take_along_axis(other, np.clip(source, 0, own.shape[1] - 1), axis=1)
+    possible = (columns < other_lengths[:, None]) & ~RowSets(own, segment).contains(rows, ordered)
+
+    # Moves the possible position numbers to the front, keeping their order.
+    ordered = np.take_along_axis(ordered, np.argsort(~possible, axis=1, kind="stable"), axis=1)
+    num_possible = possible.sum(axis=1)
+
+    # - Fill in around the segment - #
+    before = np.minimum(low, num_possible)
+    after = np.clip(num_possible - low, 0, group_lengths - high)
+    offspring_lengths = before + segment_length + after
+
+    offspring = np.where(
+        columns < before[:, None], ordered,
+        np.where(
+            columns < (before + segment_length)[:, None],
+            np.take_along_axis(own, np.clip(columns - before[:, None] + low[:, None], 0, own.shape[1] - 1), axis=1),
+            np.take_along_axis(ordered, np.clip(columns - (before + segment_length)[:, None] + low[:, None], 0, own.shape[1] - 1), axis=1)
+        )
+    )
+
+    return np.where(columns < offspring_lengths[:, None], offspring, 0), offspring_lengths
+
+
+def batch_davis_order_crossover(genomes: np.ndarray, lengths: np.ndarray, parents: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Performs Davis-Order Crossover (OX1) between each pair of parents, and randomly chooses one of the offsprings of each.
+    Wherever the reference would leave a gap in an offspring (when too few position numbers could fill it), the
+    offspring is shortened instead.
+    :param np.ndarray genomes: (groups, width) the position strings of the groups.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :param np.ndarray parents: (offspring, 2) the indices of the pair of groups each offspring is made from.
+    :param np.random.Generator rng: The generator the random points and choices are drawn from.
+    :return: Tuple[np.ndarray, np.ndarray], the position strings of the offspring and their lengths.
+    """
+    group1, lengths1, group2, lengths2 = _parents(genomes, lengths, parents)
+    low_point, high_point = _random_points(lengths1, 2, genomes.shape[1], rng).T
+
+    return _choose(
+        rng,
+        _davis_order_offspring(group1, lengths1, group2, lengths2, lengths1, low_point, high_point),
+        _davis_order_offspring(group2, lengths2, group1, lengths1, lengths1, low_point, high_point)
+    )
+
+
+if __name__ == "__main__":
+    # When running directly, run it as a module from the root of the project: python -m crossovers.batched
+    _rng = np.random.default_rng(0)
+    _genomes = np.array([list(range(10)), list(range(10, 20)), list(_rng.permutation(10))])
+    _lengths = np.array([10, 10, 10])
+    _parent_pairs = np.array([[0, 1], [0, 2]])
+
+    print(
+        f"Groups being crossed:\n"
+        + ''.join(f"\t\033[4mGroup{i}\033[0m: \033[1m{genome.tolist()}\033[0m\n" for i, genome in enumerate(_genomes))
+        + f"\nSingle point:\t{batch_single_point_crossover(_genomes, _lengths, _parent_pairs, _rng)[0].tolist()}\n"
+        f"Multi point:\t{batch_multi_point_crossover(_genomes, _lengths, _parent_pairs, _rng, crossovers=4)[0].tolist()}\n"
+        f"Uniform:\t\t{batch_uniform_crossover(_genomes, _lengths, _parent_pairs, _rng)[0].tolist()}\n"
+        f"Davis order:\t{batch_davis_order_crossover(_genomes, _lengths, _parent_pairs, _rng)[0].tolist()}\n"
+    )
@@ -1,7 +1,8 @@
 from matplotlib.patches import Circle, FancyArrowPatch, ArrowStyle
 from matplotlib.pyplot import Axes
 from matplotlib.text import Text
-from typing import Tuple
+from matplotlib.artist import Artist
+from typing import List, Tuple
 
 import matplotlib as mpl
 
@@ -61,6 +62,10 @@ class CustomCircle(Circle):
     def weight(self) -> float:
         return self.__weight
 
+    @property
+    def annotations(self) -> List[Artist]:
+        return self.__annotations
+
     @property
     def centre(self) -> Tuple[float, float]:
         """
@@ -1,4 +1,5 @@
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+from numpy import ndarray
 from math import dist
 from utils import *
 import random
@@ -120,6 +121,9 @@ class CylinderGroup(BasicGroup):
         # to be placed in the centre of the container.
         self.__group = random.sample(range(num_cylinders * cylinder_sides), k=num_cylinders - 1)
 
+        # An index of the cylinders that have been positioned whilst decoding, by their centre.
+        self.__grid: SpatialGrid | None = None
+
     def __str__(self):
         return (f"CylinderGroup (\033[4m{self.__repr__().split('at ')[1][:-1]}\033[0m) contains:\n"
                 f"\t- {'\n\t- '.join([str(cylinder) for cylinder in self._cylinders])}\n\n"
@@ -164,6 +168,10 @@ class CylinderGroup(BasicGroup):
         """
         cprint(debug, f"Outputting decoding process for: {self.__group}")
 
+        # Cells as wide as the largest cylinder, such that any intersecting cylinders are in neighbouring cells.
+        self.__grid = SpatialGrid(2 * max(cylinder.radius for cylinder in self._cylinders))
+        self.__grid.insert(0, self._cylinders[0].centre)
+
         for i in range(self._num_cylinders - 1):
             # Check if the position number is greater than the maximum position number for the ith circle being seen.
             max_positions = (i + 1) * self._cylinder_sides
@@ -179,6 +187,11 @@ class CylinderGroup(BasicGroup):
                 # reduce the number of cylinders if a position had failed.
                 self._num_cylinders -= 1
 
+            # A discarded cylinder is still checked against from the last position it was tried at.
+            self.__grid.insert(i + 1, self._cylinders[i + 1].centre)
+
+        self.__grid = None
+
         # --- Filter any -1 positions and any cylinders at those positions --- #
         # 1. Zip the group and all the cylinders (apart from the first) together
         # 2. Filter out any pair that has a -1 position number
@@ -197,6 +210,25 @@ class CylinderGroup(BasicGroup):
 
         cprint(debug, f"{'-'*40}\nDecoded group: {self.__group}\nRemaining cylinders: {self.__decoded_cylinders}")
 
+    def apply_decode(self, group: List[int], centres: ndarray, decoded: Sequence[bool], num_cylinders: int, weight: float) -> None:
+        """
+        Applies the outcome of a decode that was computed elsewhere (e.g. by a BatchDecoder), leaving this group in the
+        same state as if decode() had been called.
+        :param List[int] group: The decoded position string.
+        :param ndarray centres: The centre of every cylinder in this group, as a (cylinders, 2) array.
+        :param Sequence[bool] decoded: Whether each cylinder is one of the decoded cylinders.
+        :param int num_cylinders: The number of cylinders left after discarding any that failed.
+        :param float weight: The weight of the decoded cylinders.
+        :return: None
+        """
+        for cylinder, centre in zip(self._cylinders[1:], centres[1:].tolist()):
+            cylinder.centre = tuple(centre)
+
+        self.__group = group
+        self.__decoded_cylinders = [cylinder for cylinder, is_decoded in zip(self._cylinders, decoded) if is_decoded]
+        self._num_cylinders = num_cylinders
+        self._weight = weight
+
     def check_feasibility(self, position: int, cylinder: Cylinder, total_positions: int, positions_left: int, debug: bool = False) -> int:
         """
         Checks whether a cylinder will be placed at a feasible position.
@@ -246,7 +278,10 @@ class CylinderGroup(BasicGroup):
 
         # - Neighbour-based - #
         # Check if the cylinder intersects in more than one place with another already placed cylinder.
-        for i, individual in enumerate(self._cylinders[:(total_positions // self._cylinder_sides) + 1]):
+        # Whilst decoding, only the cylinders in the cells around this one are checked.
+        neighbours = range((total_positions // self._cylinder_sides) + 1) if self.__grid is None else self.__grid.nearby(cylinder.centre)
+        for i in neighbours:
+            individual = self._cylinders[i]
             # checks whether the distance between the two cylinder centres is less than the sum of their radii.
             # allow a small tolerance (0.01) for any rotations.
             if (individual != cylinder) and (dist(individual.centre, cylinder.centre) < individual.radius + cylinder.radius -.01):
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Tuple
+from numpy import ndarray
+
+
+class CachedDecode(NamedTuple):
+    """The decoded state of a single position string."""
+    group: Tuple[int, ...]  # The repaired position string.
+    centres: ndarray  # (cylinders, 2) the centre of every cylinder.
+    decoded: ndarray  # (cylinders,) mask of the decoded cylinders.
+    num_cylinders: int
+    weight: float
+    fitness: float
+
+
+class DecodeCache:
+    """
+    A bounded cache of decoded position strings, which evicts the least recently used entry once it is full.
+    Keys are made by the BatchDecoder, and include everything a decode depends on: the position string, the
+    number of cylinders the group considers, the bin's cylinders, the container's dimensions and the number of sides.
+    """
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: A decode cache must hold at least one entry, not {max_size}\033[0m")
+
+        self.__max_size = max_size
+        self.__entries: OrderedDict[Hashable, CachedDecode] = OrderedDict()
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def get(self, key: Hashable) -> CachedDecode | None:
+        """
+        Looks up a decoded position string, marking it as the most recently used.
+        :param Hashable key: The key of the position string.
+        :return: CachedDecode | None, None if the position string hasn't been decoded, or has been evicted.
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+
+        return entry
+
+    def put(self, key: Hashable, entry: CachedDecode) -> None:
+        """
+        Stores a decoded position string, evicting the least recently used entry if the cache is full.
+        :param Hashable key: The key of the position string.
+        :param CachedDecode entry: Its decoded state.
+        :return: None
+        """
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes every entry, but keeps the counters.
+        :return: None
+        """
+        self.__entries.clear()
+
+    def get_summary(self) -> Dict:
+        """
+        Summarises how effective the cache has been.
+        :return: Dict
+        """
+        lookups = self.__hits + self.__misses
+
+        return {
+            "Size": len(self.__entries),
+            "Max Size": self.__max_size,
+            "Hits": self.__hits,
+            "Misses": self.__misses,
+            "Hit Rate": self.__hits / lookups if lookups else 0.,
+            "Evictions": self.__evictions
+        }
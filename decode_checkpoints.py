@@ -0,0 +1,131 @@
+from typing import Dict, NamedTuple
+import numpy as np
+
+# The base of the rolling hash of a prefix, which wraps around modulo 2^64.
+_HASH_BASE = np.uint64(1_000_003)
+
+
+class Checkpoint(NamedTuple):
+    """The partially decoded state each group resumes decoding from."""
+    depths: np.ndarray  # (groups,) the number of position numbers that have already been decoded.
+    centres: np.ndarray  # (groups, cylinders, 2) the centres of the cylinders placed within those position numbers.
+    chosen: np.ndarray  # (groups, length) the position chosen for each of them, -1 if the cylinder was discarded.
+
+
+def prefix_hashes(positions: np.ndarray) -> np.ndarray:
+    """
+    Computes a rolling hash of every prefix of each position string.
+    :param np.ndarray positions: (groups, length) the position strings.
+    :return: np.ndarray, (groups, length) where column d holds the hash of the first d + 1 position numbers.
+    """
+    hashes = np.zeros(positions.shape, dtype=np.uint64)
+    running = np.zeros(len(positions), dtype=np.uint64)
+
+    with np.errstate(over="ignore"):
+        for d, column in enumerate(positions.T):
+            running = running * _HASH_BASE + (column.astype(np.uint64) + np.uint64(1))
+            hashes[:, d] = running
+
+    return hashes
+
+
+class CheckpointStore:
+    """
+    Remembers the partial decodes of the last generation, keyed by a rolling hash of each prefix of its position strings.
+    As a cylinder's placement only depends on the position numbers before it, a position string that shares a prefix
+    with one that has been decoded can resume decoding from the end of that prefix.
+    Both the position strings that were decoded, and the repaired strings they decoded into (up to their first
+    discarded cylinder), are remembered, as the offspring of the next generation are made from the repaired strings.
+    """
+
+    def __init__(self):
+        self.__keys = np.zeros(0, dtype=np.uint64)  # sorted hashes of every remembered prefix
+        self.__sources = np.zeros(0, dtype=np.int64)  # the row of the remembered position strings each key came from
+        self.__positions = np.zeros((0, 1), dtype=np.int64)  # the remembered position strings
+        self.__centres = np.zeros((0, 1, 2))  # the centres each remembered position string decoded into
+        self.__chosen = np.zeros((0, 1), dtype=np.int64)  # the position chosen for each of its position numbers
+
+        self.__placements = 0
+        self.__placements_saved = 0
+        self.__resumed = 0
+
+    @property
+    def placements_saved(self) -> int:
+        return self.__placements_saved
+
+    def resume(self, positions: np.ndarray, depths: np.ndarray) -> Checkpoint:
+        """
+        Finds the deepest remembered prefix of each position string.
+        :param np.ndarray positions: (groups, length) the position strings that are about to be decoded.
+        :param np.ndarray depths: (groups,) the number of position numbers each group will decode.
+        :return: Checkpoint, with depths of 0 for the groups that share no prefix with a remembered one.
+        """
+        size, width = positions.shape
+        resumed = Checkpoint(np.zeros(size, dtype=np.int64), np.zeros((size, self.__centres.shape[1], 2)), np.zeros(positions.shape, dtype=np.int64))
+
+        self.__placements += int(depths.sum())
+        if not len(self.__keys) or self.__positions.shape[1] != width:
+            return resumed
+
+        # - Look up every prefix at once - #
+        hashes = prefix_hashes(positions)
+        found_at = np.minimum(np.searchsorted(self.__keys, hashes), len(self.__keys) - 1)
+        found = (self.__keys[found_at] == hashes) & (np.arange(width) < depths[:, None])
+
+        # Every shorter prefix of a remembered prefix is remembered too, so the deepest is the first one that's missing.
+        deepest = np.where(found.all(axis=1), width, found.argmin(axis=1))
+        rows = np.flatnonzero(deepest)
+        sources = self.__sources[found_at[rows, deepest[rows] - 1]]
+
+        # Make sure that a match is not a collision of two hashes.
+        shared = np.arange(width) < deepest[rows, None]
+        matches = ((self.__positions[sources] == positions[rows]) | ~shared).all(axis=1)
+        rows, sources, shared = rows[matches], sources[matches], shared[matches]
+
+        resumed.depths[rows] = deepest[rows]
+        resumed.centres[rows] = np.where(np.arange(self.__centres.shape[1])[:, None] <= resumed.depths[rows, None, None], self.__centres[sources], 0.)
+        resumed.chosen[rows] = np.where(shared, self.__chosen[sources], 0)
+
+        self.__placements_saved += int(resumed.depths.sum())
+        self.__resumed += len(rows)
+
+        return resumed
+
+    def record(self, positions: np.ndarray, chosen: np.ndarray, centres: np.ndarray, depths: np.ndarray) -> None:
+        """
+        Remembers the partial decodes of a generation, replacing those of the last.
+        :param np.ndarray positions: (groups, length) the position strings that were decoded.
+        :param np.ndarray chosen: (groups, length) the position chosen for each position number, -1 if discarded.
+        :param np.ndarray centres: (groups, cylinders, 2) the centres of the cylinders after decoding.
+        :param np.ndarray depths: (groups,) the number of position numbers each group decoded.
+        :return: None
+        """
+        columns = np.arange(positions.shape[1])
+
+        # A repaired string only leads to the same placements up until its first discarded cylinder.
+        discarded = chosen == -1
+        repaired_depths = np.where(discarded.any(axis=1), discarded.argmax(axis=1), positions.shape[1])
+
+        remembered = np.concatenate((positions, chosen))
+        valid = np.concatenate((columns < depths[:, None], columns < np.minimum(depths, repaired_depths)[:, None]))
+
+        keys = prefix_hashes(remembered)[valid]
+        order = np.argsort(keys, kind="stable")
+
+        self.__keys = keys[order]
+        self.__sources = np.nonzero(valid)[0][order]
+        self.__positions = remembered
+        self.__centres = np.concatenate((centres, centres))
+        self.__chosen = np.concatenate((chosen, chosen))
+
+    def get_summary(self) -> Dict:
+        """
+        Summarises how many placements were saved by resuming decodes.
+        :return: Dict
+        """
+        return {
+            "Placements": self.__placements,
+            "Placements Saved": self.__placements_saved,
+            "Saved Rate": self.__placements_saved / self.__placements if self.__placements else 0.,
+            "Groups Resumed": self.__resumed
+        }
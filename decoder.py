@@ -0,0 +1,475 @@
+from typing import List, NamedTuple, Sequence, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor
+from config import DECODE_WORKERS, PARALLEL_DECODE_MIN_SIZE, SPATIAL_INDEX_MIN_CYLINDERS
+from decode_cache import DecodeCache, CachedDecode
+from decode_checkpoints import CheckpointStore, Checkpoint
+from math import cos, sin, radians, dist
+from utils import BatchSpatialGrid
+import numpy as np
+
+
+def builtin_sum(terms: np.ndarray) -> np.ndarray:
+    """
+    Sums each row of terms from left to right, with the same compensated (Neumaier) summation that the builtin sum()
+    uses for floats, so that the results are identical to summing each row in Python. Zero terms leave a sum unchanged.
+    :param np.ndarray terms: A 2D array of the values to sum.
+    :return: np.ndarray, the sum of each row.
+    """
+    total, compensation = np.zeros(len(terms)), np.zeros(len(terms))
+    for column in terms.T:
+        running = total + column
+        compensation += np.where(np.abs(total) >= np.abs(column), (total - running) + column, (column - running) + total)
+        total = running
+
+    return np.where((compensation != 0) & np.isfinite(compensation), total + compensation, total)
+
+
+class DecodeResult(NamedTuple):
+    """The outcome of decoding a batch of position strings."""
+    positions: np.ndarray  # (population, length) the repaired position strings, padded with 0s beyond their lengths.
+    lengths: np.ndarray  # (population,) the length of each repaired position string.
+    centres: np.ndarray  # (population, cylinders, 2) centres of every cylinder after decoding.
+    decoded: np.ndarray  # (population, cylinders) mask of the cylinders that make up each group's decoded cylinders.
+    num_cylinders: np.ndarray  # (population,) the number of cylinders each group still considers after discarding.
+    weights: np.ndarray  # (population,) the weight of each group.
+    fitnesses: np.ndarray  # (population,) the fitness of each group.
+    tried: np.ndarray  # (population,) the number of positions tried whilst placing the cylinders of this decode.
+    rejected: np.ndarray  # (population,) the number of those positions that were infeasible.
+
+    def group(self, i: int) -> List[int]:
+        """
+        Gets the ith repaired position string, as a list.
+        :param int i: The index of the group.
+        :return: List[int]
+        """
+        return self.positions[i, :self.lengths[i]].tolist()
+
+
+def pad_groups(groups: Sequence[List[int]], width: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pads position strings of differing lengths into a matrix.
+    :param Sequence[List[int]] groups: The position strings.
+    :param int width: The minimum width of the matrix.
+    :return: Tuple[np.ndarray, np.ndarray], the matrix of position strings, padded with 0s, and the length of each.
+    """
+    lengths = np.fromiter(map(len, groups), dtype=np.int64, count=len(groups))
+    positions = np.zeros((len(groups), max(int(lengths.max(initial=0)), width)), dtype=np.int64)
+    for row, group in enumerate(groups):
+        positions[row, :len(group)] = group
+
+    return positions, lengths
+
+
+class BatchDecoder:
+    """
+    Decodes the position strings of a whole population at once, as NumPy arrays.
+    The placements produced are identical to CylinderGroup.decode, which remains the reference implementation.
+    """
+
+    def __init__(self, cylinder_sides: int, container_width: float, container_height: float, window: int = -1, *,
+                 workers: int = DECODE_WORKERS, min_parallel_size: int = PARALLEL_DECODE_MIN_SIZE,
+                 spatial_index_min_cylinders: int = SPATIAL_INDEX_MIN_CYLINDERS):
+        self.__cylinder_sides = cylinder_sides
+        self.__container_width = container_width
+        self.__container_height = container_height
+
+        # The number of consecutive positions that are tested at once for every unresolved cylinder.
+        self.__window = cylinder_sides if window == -1 else window
+
+        # A table of the unit vectors for each side of a cylinder, computed in the same way as utils.rotate() does.
+        self.__unit_vectors = np.array([
+            (cos(radians(side * (360 / cylinder_sides))), sin(radians(side * (360 / cylinder_sides))))
+            for side in range(cylinder_sides)
+        ])
+
+        # Bins of at least this many cylinders only check the cylinders in the grid cells around each candidate for
+        # intersections, rather than every cylinder placed before it.
+        self.__spatial_index_min_cylinders = spatial_index_min_cylinders
+
+        # - Parallel evaluation - #
+        # Populations of at least min_parallel_size are split into a chunk per worker, smaller ones are decoded here as
+        # the overhead of the workers outweighs the gain.
+        self.__workers = workers
+        self.__min_parallel_size = min_parallel_size
+        self.__executor: ProcessPoolExecutor | None = None  # Started on the first parallel decode.
+
+    def __getstate__(self) -> Dict:
+        """
+        Leaves out the executor when pickling, and makes sure a copy sent to a worker decodes serially.
+        :return: Dict
+        """
+        state = self.__dict__.copy()
+        state["_BatchDecoder__executor"] = None
+        state["_BatchDecoder__workers"] = 1
+
+        return state
+
+    @property
+    def unit_vectors(self) -> np.ndarray:
+        return self.__unit_vectors
+
+    def shutdown(self) -> None:
+        """
+        Shuts down the worker processes, if any were started.
+        :return: None
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def decode(self, groups: Sequence[List[int]], num_cylinders: Sequence[int], radii: Sequence[float], weights: Sequence[float],
+               cache: DecodeCache | None = None, checkpoints: CheckpointStore | None = None) -> DecodeResult:
+        """
+        Decodes each position string within groups, following the same procedure as CylinderGroup.decode.
+        :param Sequence[List[int]] groups: The position strings to decode.
+        :param Sequence[int] num_cylinders: The number of cylinders each group considers.
+        :param Sequence[float] radii: The radius of each cylinder in the bin, in the order they are placed.
+        :param Sequence[float] weights: The weight of each cylinder in the bin, in the order they are placed.
+        :param DecodeCache | None cache: A cache of previously decoded position strings to reuse, if any.
+        :param CheckpointStore | None checkpoints: The partial decodes of the last generation to resume from, if any.
+        :return: DecodeResult
+        """
+        positions, lengths = pad_groups(groups, len(radii) - 1)
+
+        return self.decode_matrix(positions, lengths, num_cylinders, radii, weights, cache, checkpoints)
+
+    def decode_matrix(self, positions: np.ndarray, lengths: np.ndarray, num_cylinders: Sequence[int], radii: Sequence[float],
+                      weights: Sequence[float], cache: DecodeCache | None = None, checkpoints: CheckpointStore | None = None) -> DecodeResult:
+        """
+        Decodes each row of a matrix of position strings, following the same procedure as CylinderGroup.decode.
+        :param np.ndarray positions: (population, length) the position strings, each padded beyond its length.
+        :param np.ndarray lengths: (population,) the length of each position string.
+        :param Sequence[int] num_cylinders: The number of cylinders each group considers.
+        :param Sequence[float] radii: The radius of each cylinder in the bin, in the order they are placed.
+        :param Sequence[float] weights: The weight of each cylinder in the bin, in the order they are placed.
+        :param DecodeCache | None cache: A cache of previously decoded position strings to reuse, if any.
+        :param CheckpointStore | None checkpoints: The partial decodes of the last generation to resume from, if any.
+        :return: DecodeResult, whose repaired position strings have the same width as positions.
+        """
+        num_cylinders, radii, weights = np.asarray(num_cylinders, dtype=np.int64), np.asarray(radii, dtype=float), np.asarray(weights)
+
+        if cache is not None:
+            return self.__decode_cached(positions, lengths, num_cylinders, radii, weights, cache, checkpoints)
+
+        return self.__decode_uncached(positions, lengths, num_cylinders, radii, weights, checkpoints)
+
+    def __decode_uncached(self, positions: np.ndarray, lengths: np.ndarray, num_cylinders: np.ndarray, radii: np.ndarray, weights: np.ndarray,
+                          checkpoints: CheckpointStore | None = None) -> DecodeResult:
+        """
+        Decodes each row of a matrix of position strings, across the worker processes if the population is big enough.
+        :param np.ndarray positions: (population, length) the position strings, each padded beyond its length.
+        :param np.ndarray lengths: (population,) the length of each position string.
+        :param np.ndarray num_cylinders: The number of cylinders each group considers.
+        :param np.ndarray radii: The radius of each cylinder in the bin, in the order they are placed.
+        :param np.ndarray weights: The weight of each cylinder in the bin, in the order they are placed.
+        :param CheckpointStore | None checkpoints: The partial decodes of the last generation to resume from, which are
+        then replaced by the partial decodes of these position strings.
+        :return: DecodeResult
+        """
+        depths = np.clip(np.minimum(num_cylinders - 1, lengths), 0, None)  # the number of position numbers each group decodes
+        resume = checkpoints.resume(positions, depths) if checkpoints is not None else None
+
+        if self.__workers > 1 and len(positions) >= self.__min_parallel_size:
+            result, chosen = self.__decode_parallel(positions, lengths, num_cylinders, radii, weights, resume)
+        else:
+            result, chosen = self.decode_rows(positions, lengths, num_cylinders, radii, weights, resume)
+
+        if checkpoints is not None:
+            checkpoints.record(positions, chosen, result.centres, depths)
+
+        return result
+
+    def decode_rows(self, positions: np.ndarray, lengths: np.ndarray, num_cylinders: np.ndarray, radii: np.ndarray, weights: np.ndarray,
+                    resume: Checkpoint | None = None) -> Tuple[DecodeResult, np.ndarray]:
+        """
+        Decodes each row of a matrix of position strings within this process.
+        :param np.ndarray positions: (population, length) the position strings, each padded beyond its length.
+        :param np.ndarray lengths: (population,) the length of each position string.
+        :param np.ndarray num_cylinders: The number of cylinders each group considers.
+        :param np.ndarray radii: The radius of each cylinder in the bin, in the order they are placed.
+        :param np.ndarray weights: The weight of each cylinder in the bin, in the order they are placed.
+        :param Checkpoint | None resume: The partially decoded state each group resumes decoding from, if any.
+        :return: Tuple[DecodeResult, np.ndarray], the result and the position chosen for each position number before
+        any are filtered out (-1 if the cylinder was discarded).
+        """
+        size, n = len(positions), len(radii)
+        sides = self.__cylinder_sides
+        positions = positions.copy()
+
+        # The number of position numbers each group decodes. A position string shorter than its group (e.g. an
+        # offspring of a parent that discarded cylinders) leaves the cylinders after it unplaced, as if discarded.
+        processed = np.minimum(num_cylinders - 1, lengths)
+        failures = np.zeros(size, dtype=np.int64)
+        tried = np.zeros(size, dtype=np.int64)
+        placements = np.zeros(size, dtype=np.int64)
+
+        # Every cylinder starts at the origin, apart from the first which is placed in the centre of the container.
+        centres = np.zeros((size, n, 2))
+        centres[:, 0] = (self.__container_width / 2, self.__container_height / 2)
+
+        # - Restore the placements each group resumes from - #
+        depths = np.zeros(size, dtype=np.int64)
+        if resume is not None:
+            depths = resume.depths
+            resumed = np.flatnonzero(depths)
+            restored = np.arange(positions.shape[1]) < depths[resumed, None]
+
+            centres[resumed] = resume.centres[resumed]
+            positions[resumed] = np.where(restored, resume.chosen[resumed], positions[resumed])
+            failures[resumed] = (restored & (resume.chosen[resumed] == -1)).sum(axis=1)
+
+        # Cells as wide as the largest cylinder, such that any intersecting cylinders are in neighbouring cells.
+        grid = None
+        if n >= self.__spatial_index_min_cylinders:
+            grid = BatchSpatialGrid(size, 2 * radii.max(), self.__container_width, self.__container_height)
+            grid.insert(np.arange(size), centres[:, 0], radii[0])
+
+        # - Place the (i + 1)th cylinder of every group at the same time - #
+        for i in range(int(processed.max(initial=0))):
+            rows = np.flatnonzero((processed > i) & (depths <= i))
+            max_positions = (i + 1) * sides
+            start = positions[rows, i]
+            start[start > max_positions] = 0
+
+            chosen, centres[rows, i + 1], tried[rows] = self.__place(centres, rows, start, i + 1, max_positions, radii, grid, tried[rows])
+            positions[rows, i] = chosen
+            failures[rows] += chosen == -1
+            placements[rows] += chosen != -1
+
+            if grid is not None:
+                # A discarded cylinder is still checked against from the last position it was tried at.
+                placed = np.flatnonzero(processed > i)
+                grid.insert(placed, centres[placed, i + 1], radii[i + 1])
+
+        # --- Filter any -1 positions and any cylinders at those positions --- #
+        # Only the pairs made by zip(group, cylinders[1:]) are considered, as done in CylinderGroup.decode
+        pairs = np.arange(positions.shape[1]) < np.minimum(lengths, n - 1)[:, None]
+        kept = pairs & (positions != -1)
+
+        decoded = np.zeros((size, n), dtype=bool)
+        decoded[:, 0] = True
+        decoded[:, 1:] = kept[:, :n - 1]
+
+        # - Accumulate in placement order, exactly as the builtin sum() does over the decoded cylinders - #
+        weight = builtin_sum(np.where(decoded, weights, 0.))
+        mma_x = builtin_sum(np.where(decoded, weights * centres[..., 0], 0.))
+        mma_y = builtin_sum(np.where(decoded, weights * centres[..., 1], 0.))
+
+        # Groups that discarded every cylinder keep the weight of all their cylinders.
+        weight = np.where(kept.any(axis=1), weight, sum(weights.tolist()))
+
+        container_centre = (self.__container_width / 2, self.__container_height / 2)
+        distances = [dist(point, container_centre) for point in zip((mma_x / weight).tolist(), (mma_y / weight).tolist())]
+        fitnesses = np.array([float("inf") if distance == 0 else 1. / distance for distance in distances])
+
+        # - Move the kept positions to the front of each row, keeping their order - #
+        repaired = np.take_along_axis(positions, np.argsort(~kept, axis=1, kind="stable"), axis=1)
+        repaired_lengths = kept.sum(axis=1)
+        repaired[np.arange(repaired.shape[1]) >= repaired_lengths[:, None]] = 0
+
+        return DecodeResult(repaired, repaired_lengths, centres, decoded, processed + 1 - failures, weight, fitnesses, tried, tried - placements), positions
+
+    def __decode_parallel(self, positions: np.ndarray, lengths: np.ndarray, num_cylinders: np.ndarray, radii: np.ndarray, weights: np.ndarray,
+                          resume: Checkpoint | None = None) -> Tuple[DecodeResult, np.ndarray]:
+        """
+        Splits the position strings into a chunk per worker, decodes each chunk in a worker process and joins the
+        results back together in order. Only the arrays of position strings and of the results are sent between
+        processes.
+        :param np.ndarray positions: (population, length) the position strings, each padded beyond its length.
+        :param np.ndarray lengths: (population,) the length of each position string.
+        :param np.ndarray num_cylinders: The number of cylinders each group considers.
+        :param np.ndarray radii: The radius of each cylinder in the bin, in the order they are placed.
+        :param np.ndarray weights: The weight of each cylinder in the bin, in the order they are placed.
+        :param Checkpoint | None resume: The partially decoded state each group resumes decoding from, if any.
+        :return: Tuple[DecodeResult, np.ndarray], the result and the position chosen for each position number.
+        """
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.__workers, initializer=_initialise_worker, initargs=(self,))
+
+        bounds = np.linspace(0, len(positions), self.__workers + 1).astype(int)
+        chunks = [
+            self.__executor.submit(
+                _decode_chunk, positions[low:high], lengths[low:high], num_cylinders[low:high], radii, weights,
+                None if resume is None else Checkpoint(*(field[low:high] for field in resume))
+            )
+            for low, high in zip(bounds[:-1], bounds[1:]) if high > low
+        ]
+        results, chosen = zip(*(chunk.result() for chunk in chunks))
+
+        return DecodeResult(*(np.concatenate(field) for field in zip(*results))), np.concatenate(chosen)
+
+    def __place(self, centres: np.ndarray, rows: np.ndarray, start: np.ndarray, cylinder: int, max_positions: int,
+                radii: np.ndarray, grid: BatchSpatialGrid | None = None, tried: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the first feasible position for a cylinder in each group, scanning forward from each start position in
+        windows of positions, in the same order as CylinderGroup.check_feasibility.
+        :param np.ndarray centres: (population, cylinders, 2) the current centres of the cylinders in each group.
+        :param np.ndarray rows: The indices of the groups that are placing this cylinder.
+        :param np.ndarray start: The position number each of those groups starts scanning from.
+        :param int cylinder: The index of the cylinder being placed.
+        :param int max_positions: The total number of possible positions for this cylinder.
+        :param np.ndarray radii: The radius of each cylinder.
+        :param BatchSpatialGrid | None grid: An index of the cylinders placed so far in every group, if any.
+        :param np.ndarray | None tried: The number of positions each of those groups has tried so far, if counted.
+        :return: Tuple[np.ndarray, np.ndarray, np.ndarray], the chosen positions (-1 if the cylinder is discarded), the
+        centre the cylinder was left at, and the number of positions each group has tried including these.
+        """
+        size = len(start)
+        radius = radii[cylinder]
+
+        tried = np.zeros(size, dtype=np.int64) if tried is None else tried.copy()
+        chosen = np.full(size, -1, dtype=np.int64)
+        placed = np.zeros((size, 2))
+        pending = np.arange(size)
+
+        for offset in range(0, max_positions, self.__window):
+            steps = np.arange(offset, min(offset + self.__window, max_positions))
+
+            # The first position tried is the start itself, each following one wraps around the possible positions.
+            candidates = np.where(steps == 0, start[pending, None], (start[pending, None] + steps) % max_positions)
+
+            # - Rotate each candidate around its target cylinder - #
+            targets = candidates // self.__cylinder_sides
+            owners = rows[pending]
+            target_centres = centres[owners[:, None], targets]
+            x_diff = (target_centres[..., 0] + radii[targets]) + radius - target_centres[..., 0]
+            unit_vectors = self.__unit_vectors[candidates % self.__cylinder_sides]
+            xs = target_centres[..., 0] + x_diff * unit_vectors[..., 0]
+            ys = target_centres[..., 1] + x_diff * unit_vectors[..., 1]
+
+            # - Container-based - #
+            feasible = (xs - radius >= 0) & (xs + radius <= self.__container_width) & \
+                       (ys - radius >= 0) & (ys + radius <= self.__container_height)
+
+            # - Neighbour-based - #
+            # Compare against every cylinder before this one, or only those nearby, using squared distances.
+            if grid is None:
+                x_gap = centres[owners, None, :cylinder, 0] - xs[..., None]
+                y_gap = centres[owners, None, :cylinder, 1] - ys[..., None]
+                feasible &= ~((x_gap * x_gap + y_gap * y_gap) < np.square(radii[:cylinder] + radius - .01)).any(axis=2)
+
+            else:
+                neighbours = grid.nearby(owners, xs, ys)
+                x_gap = neighbours[..., 0] - xs[..., None]
+                y_gap = neighbours[..., 1] - ys[..., None]
+                feasible &= ~((x_gap * x_gap + y_gap * y_gap) < np.square(neighbours[..., 2] + radius - .01)).any(axis=2)
+
+            # - Record the first feasible candidate, or the last candidate tried for those still unresolved - #
+            found = feasible.any(axis=1)
+            first = np.where(found, feasible.argmax(axis=1), len(steps) - 1)
+            picked = np.arange(len(pending))
+
+            chosen[pending[found]] = candidates[picked[found], first[found]]
+            placed[pending, 0], placed[pending, 1] = xs[picked, first], ys[picked, first]
+            tried[pending] += np.where(found, first + 1, len(steps))
+
+            pending = pending[~found]
+            if not len(pending):
+                break
+
+        return chosen, placed, tried
+
+    def decode_groups(self, groups: List, cache: DecodeCache | None = None, checkpoints: CheckpointStore | None = None) -> DecodeResult:
+        """
+        Decodes every CylinderGroup in groups, and applies the results back onto each of them.
+        :param List[CylinderGroup] groups: The cylinder groups to decode, which must all share the same cylinders.
+        :param DecodeCache | None cache: A cache of previously decoded position strings to reuse, if any.
+        :param CheckpointStore | None checkpoints: The partial decodes of the last generation to resume from, if any.
+        :return: DecodeResult
+        """
+        cylinders = groups[0].cylinders
+        result = self.decode(
+            [group.group for group in groups], [group.num_cylinders for group in groups],
+            [cylinder.radius for cylinder in cylinders], [cylinder.weight for cylinder in cylinders], cache, checkpoints
+        )
+
+        for i, group in enumerate(groups):
+            group.apply_decode(result.group(i), result.centres[i], result.decoded[i], int(result.num_cylinders[i]), result.weights[i].item())
+
+        return result
+
+    def __decode_cached(self, positions: np.ndarray, lengths: np.ndarray, num_cylinders: np.ndarray, radii: np.ndarray, weights: np.ndarray,
+                        cache: DecodeCache, checkpoints: CheckpointStore | None = None) -> DecodeResult:
+        """
+        Decodes each row of a matrix of position strings, reusing any decode found within the cache. Each distinct
+        position string that's missing from the cache is decoded once, and then stored.
+        :param np.ndarray positions: (population, length) the position strings, each padded beyond its length.
+        :param np.ndarray lengths: (population,) the length of each position string.
+        :param np.ndarray num_cylinders: The number of cylinders each group considers.
+        :param np.ndarray radii: The radius of each cylinder in the bin.
+        :param np.ndarray weights: The weight of each cylinder in the bin.
+        :param DecodeCache cache: The cache of previously decoded position strings.
+        :param CheckpointStore | None checkpoints: The partial decodes of the last generation to resume any missing
+        position strings from, if any.
+        :return: DecodeResult
+        """
+        # A decode depends on the position string, the number of cylinders considered, the bin's cylinders, the
+        # container's dimensions and the number of sides per cylinder.
+        signature = (self.__cylinder_sides, self.__container_width, self.__container_height, tuple(radii.tolist()), tuple(weights.tolist()))
+        keys = [
+            (signature, tuple(row[:length]), num)
+            for row, length, num in zip(positions.tolist(), lengths.tolist(), num_cylinders.tolist())
+        ]
+        entries = [cache.get(key) for key in keys]
+
+        missing = {}  # {key: index of its decode}
+        decoded_by = np.full(len(keys), -1)  # the decode each group's positions were tried in, if any (once per key)
+        for row, (key, entry) in enumerate(zip(keys, entries)):
+            if entry is None and key not in missing:
+                decoded_by[row] = missing.setdefault(key, len(missing))
+
+        tried, rejected = np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=np.int64)
+        if missing:
+            missing_positions, missing_lengths = pad_groups([group for _, group, _ in missing], positions.shape[1])
+            result = self.__decode_uncached(missing_positions, missing_lengths, np.array([num for _, _, num in missing]), radii, weights, checkpoints)
+            decodes = [
+                CachedDecode(tuple(result.group(i)), result.centres[i].copy(), result.decoded[i].copy(), int(result.num_cylinders[i]),
+                             result.weights[i].item(), result.fitnesses[i].item())
+                for i in range(len(missing))
+            ]
+
+            for key, i in missing.items():
+                cache.put(key, decodes[i])
+
+            entries = [decodes[missing[key]] if entry is None else entry for key, entry in zip(keys, entries)]
+
+            rows = np.flatnonzero(decoded_by != -1)
+            tried[rows], rejected[rows] = result.tried[decoded_by[rows]], result.rejected[decoded_by[rows]]
+
+        repaired, repaired_lengths = pad_groups([entry.group for entry in entries], positions.shape[1])
+
+        return DecodeResult(
+            repaired, repaired_lengths,
+            np.array([entry.centres for entry in entries]), np.array([entry.decoded for entry in entries]),
+            np.array([entry.num_cylinders for entry in entries]), np.array([entry.weight for entry in entries]),
+            np.array([entry.fitness for entry in entries]), tried, rejected
+        )
+
+
+# The decoder of a worker process, set once when the worker starts so it isn't sent with every chunk.
+_worker_decoder: BatchDecoder | None = None
+
+
+def _initialise_worker(decoder: BatchDecoder) -> None:
+    """
+    Stores the decoder a worker process uses to decode each chunk it's given.
+    :param BatchDecoder decoder: A (serial) copy of the decoder that started the worker.
+    :return: None
+    """
+    global _worker_decoder
+    _worker_decoder = decoder
+
+
+def _decode_chunk(positions: np.ndarray, lengths: np.ndarray, num_cylinders: np.ndarray, radii: np.ndarray, weights: np.ndarray,
+                  resume: Checkpoint | None = None) -> Tuple[DecodeResult, np.ndarray]:
+    """
+    Decodes a chunk of position strings within a worker process.
+    :param np.ndarray positions: The position strings of the chunk, each padded beyond its length.
+    :param np.ndarray lengths: The length of each position string of the chunk.
+    :param np.ndarray num_cylinders: The number of cylinders each group of the chunk considers.
+    :param np.ndarray radii: The radius of each cylinder in the bin.
+    :param np.ndarray weights: The weight of each cylinder in the bin.
+    :param Checkpoint | None resume: The partially decoded state each group of the chunk resumes decoding from, if any.
+    :return: Tuple[DecodeResult, np.ndarray], the result and the position chosen for each position number.
+    """
+    return _worker_decoder.decode_rows(positions, lengths, num_cylinders, radii, weights, resume)
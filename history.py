@@ -0,0 +1,38 @@
+from typing import List, Tuple
+
+
+class HistoryRecorder:
+    """
+    Records the key generations of a bin's evolution: each generation that improved the best cylinder group, with the
+    fitness and centres of that group. It only holds plain data, so it's recorded the same way whether or not the
+    evolution is visualised, and can be sent between processes, checkpointed, or replayed into a container afterwards.
+    """
+
+    def __init__(self, key_generations: List[Tuple[int, float, List[Tuple[float, float]]]] | None = None):
+        """
+        :param List[Tuple[int, float, List[Tuple[float, float]]]] | None key_generations: Key generations that have
+        already been recorded, e.g. by a worker process.
+        """
+        self.__key_generations: List[Tuple[int, float, List[Tuple[float, float]]]] = list(key_generations or [])
+
+    def __len__(self) -> int:
+        return len(self.__key_generations)
+
+    @property
+    def key_generations(self) -> List[Tuple[int, float, List[Tuple[float, float]]]]:
+        return self.__key_generations
+
+    @property
+    def last_improvement(self) -> int:
+        """The generation at which the best fitness last improved, -1 if it hasn't been recorded yet."""
+        return self.__key_generations[-1][0] if self.__key_generations else -1
+
+    def record(self, generation: int, fitness: float, centres: List[Tuple[float, float]]) -> None:
+        """
+        Records a key generation.
+        :param int generation: The generation the best cylinder group improved at.
+        :param float fitness: The fitness of the best cylinder group.
+        :param List[Tuple[float, float]] centres: The centre of each cylinder of the best cylinder group.
+        :return: None
+        """
+        self.__key_generations.append((generation, fitness, centres))
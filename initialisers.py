@@ -0,0 +1,325 @@
+from config import SEEDED_FRACTION, GREEDY_CANDIDATES, GREEDY_TARGETS, SPATIAL_INDEX_MIN_CYLINDERS
+from cylinders import Cylinder
+from utils import BatchSpatialGrid
+from numpy.random import Generator
+from typing import Dict, List, Sequence, Tuple
+from math import cos, sin, radians
+from json import loads
+import numpy as np
+import random
+import os
+import re
+
+# How the position strings of a bin's first generation can be created: drawn at random, built greedily, rebuilt from the
+# placements of earlier runs, or a mix of those seeded groups and random ones.
+INITIALISERS = ("random", "greedy", "archive", "mixed")
+
+# The cylinders and centres within results recorded before their placements were saved as numbers.
+_LEGACY_CYLINDER = re.compile(r"ID: (\d+)\):\s*- Radius: ([\d.]+)\s*- Weight: ([\d.]+)")
+_LEGACY_CENTRE = re.compile(r"ID: (\d+)\):\s*- Centre: \(([\d.-]+), ([\d.-]+)\)")
+
+
+def random_genomes(size: int, num_cylinders: int, cylinder_sides: int) -> np.ndarray:
+    """
+    Draws a random position number for every cylinder apart from the first, which is placed in the centre of the
+    container, in the same way as CylinderGroup does.
+    :param int size: The number of position strings.
+    :param int num_cylinders: The number of cylinders within the bin.
+    :param int cylinder_sides: The number of sides each cylinder's polygon has.
+    :return: np.ndarray, (size, num_cylinders - 1) the position strings.
+    """
+    genomes = np.zeros((size, max(num_cylinders - 1, 0)), dtype=np.int64)
+    for i in range(size):
+        genomes[i] = random.sample(range(num_cylinders * cylinder_sides), k=num_cylinders - 1)
+
+    return genomes
+
+
+def _placements(data: Dict | List) -> List[Tuple[float, List[List[float]]]]:
+    """
+    Finds the placements within a record: a ResultCache entry, a telemetry record of a bin's placements, or the
+    summary of every bin of a run (either with its centres as numbers, or as the text recorded by older runs).
+    :return: List[Tuple[float, List[List[float]]]], the fitness and [diameter, weight, x, y] of each placement.
+    """
+    if "Placement" in data:  # a ResultCache entry
+        return [(data["Fitness"], data["Placement"])]
+
+    if data.get("type") == "placements":  # a telemetry record
+        return [(data["fitness"], [list(row) for row in zip(data["diameters"], data["weights"], *zip(*data["centres"]))])]
+
+    placements = []
+    for summary in (value for key, value in data.items() if key.startswith("Bin ")):
+        best = summary["Best Cylinder Group"]
+
+        if "Centres" in best:
+            placements.append((best["Fitness"], [[d, w, x, y] for d, w, (x, y) in zip(best["Diameters"], best["Weights"], best["Centres"])]))
+
+        elif "Cylinder Positions" in best:
+            cylinders = {id_: (2 * float(r), float(w)) for id_, r, w in _LEGACY_CYLINDER.findall(summary["Binned Cylinders"])}
+            placements.append((best["Fitness"], [[*cylinders[id_], float(x), float(y)] for id_, x, y in _LEGACY_CENTRE.findall(best["Cylinder Positions"]) if id_ in cylinders]))
+
+    return placements
+
+
+def load_archive(paths: Sequence[str]) -> List[Tuple[float, List[List[float]]]]:
+    """
+    Loads the best placements found by earlier runs, to seed the first generation of later ones. Each path can be a
+    file of results recorded into _TEST_RESULTS, an entry of a ResultCache, a telemetry file of JSON lines, or a
+    directory of any of those.
+    :param Sequence[str] paths: The files and directories to load.
+    :return: List[Tuple[float, List[List[float]]]], the fitness and [diameter, weight, x, y] of each placement, fittest
+    first.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(entry.path for entry in os.scandir(path) if entry.name.endswith((".json", ".jsonl"))))
+        else:
+            files.append(path)
+
+    archive = []
+    for path in files:
+        with open(path) as file:
+            records = [loads(line) for line in file if line.strip()] if path.endswith(".jsonl") else [loads(file.read())]
+
+        for record in records:
+            archive.extend(_placements(record))
+
+    return sorted(archive, key=lambda placement: -placement[0])
+
+
+def guide_centres(cylinders: List[Cylinder], placement: List[List[float]]) -> Tuple[np.ndarray, int]:
+    """
+    Matches the cylinders of a bin to those of a placement by their diameter and weight, in order, as cylinders that
+    share both are interchangeable.
+    :param List[Cylinder] cylinders: The cylinders of the bin.
+    :param List[List[float]] placement: The [diameter, weight, x, y] of each cylinder of the placement.
+    :return: Tuple[np.ndarray, int], (cylinders, 2) the centre of each cylinder within the placement (NaN for those it
+    doesn't hold), and the number of cylinders it holds.
+    """
+    centres: Dict[Tuple[float, float], List[Tuple[float, float]]] = {}
+    for diameter, weight, x, y in placement:
+        centres.setdefault((float(diameter), float(weight)), []).append((x, y))
+
+    guides = np.full((len(cylinders), 2), np.nan)
+    for i, cylinder in enumerate(cylinders):
+        if centres.get((cylinder.diameter, cylinder.weight)):
+            guides[i] = centres[(cylinder.diameter, cylinder.weight)].pop(0)
+
+    return guides, int((~np.isnan(guides[:, 0])).sum())
+
+
+def _try_positions(centres: np.ndarray, rows: np.ndarray, positions: np.ndarray, cylinder: int, radii: np.ndarray, unit_vectors: np.ndarray,
+                   cylinder_sides: int, container_width: float, container_height: float, grid: BatchSpatialGrid | None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes where a cylinder would be placed at each position, and whether it'd be feasible there, in exactly the
+    same way as the BatchDecoder.
+    :param np.ndarray centres: (groups, cylinders, 2) the centres of the cylinders placed so far.
+    :param np.ndarray rows: The groups placing the cylinder.
+    :param np.ndarray positions: The position numbers to try, the same for each group.
+    :param int cylinder: The index of the cylinder being placed.
+    :return: Tuple[np.ndarray, np.ndarray, np.ndarray], (rows, positions) the x and y of each centre, and whether it's
+    feasible.
+    """
+    radius = radii[cylinder]
+    targets = positions // cylinder_sides
+    target_centres = centres[rows[:, None], targets]
+    x_diff = (target_centres[..., 0] + radii[targets]) + radius - target_centres[..., 0]
+    vectors = unit_vectors[positions % cylinder_sides]
+    xs = target_centres[..., 0] + x_diff * vectors[:, 0]
+    ys = target_centres[..., 1] + x_diff * vectors[:, 1]
+
+    feasible = (xs - radius >= 0) & (xs + radius <= container_width) & (ys - radius >= 0) & (ys + radius <= container_height)
+
+    if grid is None:
+        x_gap = centres[rows, None, :cylinder, 0] - xs[..., None]
+        y_gap = centres[rows, None, :cylinder, 1] - ys[..., None]
+        feasible &= ~((x_gap * x_gap + y_gap * y_gap) < np.square(radii[:cylinder] + radius - .01)).any(axis=2)
+
+    else:
+        neighbours = grid.nearby(rows, xs, ys)
+        x_gap = neighbours[..., 0] - xs[..., None]
+        y_gap = neighbours[..., 1] - ys[..., None]
+        feasible &= ~((x_gap * x_gap + y_gap * y_gap) < np.square(neighbours[..., 2] + radius - .01)).any(axis=2)
+
+    return xs, ys, feasible
+
+
+def build_genomes(radii: np.ndarray, weights: np.ndarray, cylinder_sides: int, container_width: float, container_height: float,
+                  guides: np.ndarray, best_only: np.ndarray, rng: Generator, *, candidates: int = GREEDY_CANDIDATES,
+                  max_targets: int = GREEDY_TARGETS, spatial_index_min_cylinders: int = SPATIAL_INDEX_MIN_CYLINDERS) -> np.ndarray:
+    """
+    Builds position strings one cylinder at a time, for every group at once. Each cylinder takes a feasible position
+    that either keeps the centre of mass of the cylinders placed so far closest to the centre of the container, or is
+    closest to where the cylinder is guided to (e.g. by an earlier run's placement). Every position chosen is the first
+    one the decoder tries, so each position string decodes into the placement it was built from without discards,
+    unless a cylinder had no feasible position at all.
+    :param np.ndarray radii: The radius of each cylinder, in the order they're placed.
+    :param np.ndarray weights: The weight of each cylinder, in the same order.
+    :param int cylinder_sides: The number of sides each cylinder's polygon has.
+    :param float container_width: The width of the container.
+    :param float container_height: The height of the container.
+    :param np.ndarray guides: (groups, cylinders, 2) where each cylinder of each group is guided to, NaN for those
+    that are balanced around the centre instead.
+    :param np.ndarray best_only: (groups,) whether each group always takes the best position, rather than one of the
+    best few drawn at random, so the groups differ.
+    :param Generator rng: Draws the positions taken, and the cylinders tried around within large bins.
+    :param int candidates: The number of best positions each balanced cylinder is drawn from.
+    :param int max_targets: The most placed cylinders a cylinder tries the positions around, drawn at random once more
+    have been placed, so building a large bin stays quick. Should none of them be feasible, every position is tried.
+    :param int spatial_index_min_cylinders: Bins of at least this many cylinders index the placed cylinders in a grid.
+    :return: np.ndarray, (groups, cylinders - 1) the position strings.
+    """
+    size, n = len(guides), len(radii)
+    rows = np.arange(size)
+    unit_vectors = np.array([
+        (cos(radians(side * (360 / cylinder_sides))), sin(radians(side * (360 / cylinder_sides))))
+        for side in range(cylinder_sides)
+    ])
+    container_centre = (container_width / 2, container_height / 2)
+
+    genomes = np.zeros((size, max(n - 1, 0)), dtype=np.int64)
+    centres = np.zeros((size, n, 2))
+    centres[:, 0] = container_centre
+
+    # The weighted sum of the placed cylinders' centres, and their weight, for the centre of mass of each group.
+    moments = np.tile(weights[0] * np.array(container_centre), (size, 1))
+    total = np.full(size, float(weights[0]))
+
+    grid = None
+    if n >= spatial_index_min_cylinders:
+        grid = BatchSpatialGrid(size, 2 * radii.max(), container_width, container_height)
+        grid.insert(rows, centres[:, 0], radii[0])
+
+    for cylinder in range(1, n):
+        max_positions = cylinder * cylinder_sides
+        positions = np.arange(max_positions)
+        if cylinder > max_targets:
+            targets = np.sort(rng.choice(cylinder, max_targets, replace=False))
+            positions = (targets[:, None] * cylinder_sides + np.arange(cylinder_sides)).ravel()
+
+        xs, ys, feasible = _try_positions(centres, rows, positions, cylinder, radii, unit_vectors, cylinder_sides, container_width, container_height, grid)
+
+        # - Score each position: the distance to its guide, or of the centre of mass from the centre - #
+        weight = weights[cylinder]
+        com_x = (moments[:, 0, None] + weight * xs) / (total[:, None] + weight) - container_centre[0]
+        com_y = (moments[:, 1, None] + weight * ys) / (total[:, None] + weight) - container_centre[1]
+        guide_x, guide_y = guides[:, cylinder, 0, None], guides[:, cylinder, 1, None]
+        guided = ~np.isnan(guides[:, cylinder, 0])
+
+        scores = np.where(guided[:, None], np.square(xs - guide_x) + np.square(ys - guide_y), com_x * com_x + com_y * com_y)
+        scores[~feasible] = np.inf
+
+        # - Take one of the best few feasible positions - #
+        options = np.minimum(feasible.sum(axis=1), 1 if candidates < 1 else candidates)
+        choices = np.where(best_only | guided | (options <= 1), 0, rng.integers(0, np.maximum(options, 1)))
+        picked = np.argsort(scores, axis=1, kind="stable")[rows, choices]
+
+        placed = feasible[rows, picked]
+        genomes[:, cylinder - 1] = positions[picked]
+        centres[:, cylinder] = np.column_stack((xs[rows, picked], ys[rows, picked]))
+
+        # - Groups without a feasible position try every one, from the first, as the decoder would - #
+        # A cylinder that's discarded from position 0 is left at the last position, which is the last one tried.
+        failed = np.flatnonzero(~placed)
+        if len(failed) and len(positions) < max_positions:
+            xs, ys, feasible = _try_positions(centres, failed, np.arange(max_positions), cylinder, radii, unit_vectors, cylinder_sides, container_width, container_height, grid)
+            found = feasible.any(axis=1)
+            first = np.where(found, feasible.argmax(axis=1), max_positions - 1)
+
+            placed[failed] = found
+            genomes[failed, cylinder - 1] = np.where(found, first, 0)
+            centres[failed, cylinder] = np.column_stack((xs[np.arange(len(failed)), first], ys[np.arange(len(failed)), first]))
+
+        elif len(failed):
+            genomes[failed, cylinder - 1] = 0
+            centres[failed, cylinder] = np.column_stack((xs[failed, -1], ys[failed, -1]))
+
+        moments[placed] += weight * centres[placed, cylinder]
+        total[placed] += weight
+
+        if grid is not None:
+            # A discarded cylinder is still checked against from the last position it was tried at.
+            grid.insert(rows, centres[:, cylinder], radii[cylinder])
+
+    return genomes
+
+
+def initial_genomes(method: str, size: int, cylinders: List[Cylinder], cylinder_sides: int, container_width: float, container_height: float,
+                    archive: List[Tuple[float, List[List[float]]]] = (), seeded_fraction: float = SEEDED_FRACTION, *,
+                    candidates: int = GREEDY_CANDIDATES, max_targets: int = GREEDY_TARGETS) -> Tuple[np.ndarray | None, Dict[str, int]]:
+    """
+    Creates the position strings of a bin's first generation.
+    :param str method: "random" draws every position number at random, "greedy" builds every group greedily, "archive"
+    rebuilds a group from each placement within the archive that holds at least half of the bin's cylinders (drawing
+    the rest at random), and "mixed" seeds a fraction of the groups from the archive then greedily, drawing the rest
+    at random. Every method apart from "mixed" rebuilds each placement of the archive that it can, so "random" and
+    "greedy" are seeded by a warm start passed as the archive. "mixed" always rebuilds the archive's first placement it
+    can, even when its fraction rounds down to no groups, so a warm start is never dropped.
+    :param int size: The number of groups.
+    :param List[Cylinder] cylinders: The cylinders of the bin, in the order they're placed.
+    :param int cylinder_sides: The number of sides each cylinder's polygon has.
+    :param float container_width: The width of the container.
+    :param float container_height: The height of the container.
+    :param List[Tuple[float, List[List[float]]]] archive: The (fitness, placement) of earlier runs, e.g. from load_archive().
+    :param float seeded_fraction: The fraction of the groups [0-1] that "mixed" seeds.
+    :param int candidates: The number of best positions each greedily placed cylinder is drawn from.
+    :param int max_targets: The most placed cylinders each greedily placed cylinder tries the positions around.
+    :return: Tuple[np.ndarray | None, Dict[str, int]], (size, cylinders - 1) the position strings, or None when
+    they're all drawn at random (by the PopulationStore), and the number of groups created in each way.
+    """
+    if method not in INITIALISERS:
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown initialiser '{method}', use one of {list(INITIALISERS)}\033[0m")
+
+    n = len(cylinders)
+    if (method == "random" and not archive) or n < 2:
+        return None, {"Archived": 0, "Greedy": 0, "Random": size}
+
+    seeded = size if method == "greedy" else round(size * seeded_fraction) if method == "mixed" else 0
+
+    # - The placements that hold at least half of the bin's cylinders, those holding the most first - #
+    matches = [guide_centres(cylinders, placement) for _, placement in archive]
+    matches = [guides for guides, held in sorted(matches, key=lambda match: -match[1]) if 2 * held >= n]
+
+    archived = min(len(matches), max(seeded, 1) if method == "mixed" else size)
+    seeded = max(seeded, archived)
+
+    rng = np.random.default_rng(random.getrandbits(64))
+    genomes = np.zeros((size, n - 1), dtype=np.int64)
+    genomes[seeded:] = random_genomes(size - seeded, n, cylinder_sides)
+
+    if seeded:
+        guides = np.full((seeded, n, 2), np.nan)
+        if archived:
+            guides[:archived] = matches[:archived]
+
+        # Only the first of the greedy groups always takes the best position, the rest differ from it.
+        best_only = np.arange(seeded) <= archived
+
+        radii = np.array([cylinder.radius for cylinder in cylinders])
+        weights = np.array([cylinder.weight for cylinder in cylinders])
+        genomes[:seeded] = build_genomes(radii, weights, cylinder_sides, container_width, container_height, guides, best_only, rng,
+                                         candidates=candidates, max_targets=max_targets)
+
+    return genomes, {"Archived": archived, "Greedy": seeded - archived, "Random": size - seeded}
+
+
+if __name__ == "__main__":
+    from decoder import BatchDecoder
+    from TEST import test_instances
+    from time import perf_counter
+
+    (_width, _height, _), _cylinders = test_instances(7)
+    _cylinders = sorted(_cylinders, reverse=True, key=lambda cylinder: cylinder.weight)
+    _decoder = BatchDecoder(8, _width, _height)
+    _radii, _weights = [cylinder.radius for cylinder in _cylinders], [cylinder.weight for cylinder in _cylinders]
+
+    for _method in ("random", "greedy"):
+        _start = perf_counter()
+        _genomes, _counts = initial_genomes(_method, 50, _cylinders, 8, _width, _height)
+        _genomes = random_genomes(50, len(_cylinders), 8) if _genomes is None else _genomes
+        _seconds = perf_counter() - _start
+
+        _result = _decoder.decode_matrix(_genomes, np.full(50, len(_cylinders) - 1), np.full(50, len(_cylinders)), _radii, _weights)
+        print(f"{_method:<8} {_counts}, created in {_seconds:.3f}s: best fitness {_result.fitnesses.max():.3f}, mean {_result.fitnesses.mean():.3f}, "
+              f"{_result.rejected.sum() / _result.tried.sum():.0%} of the positions tried were infeasible")
@@ -0,0 +1,254 @@
+from population import Population
+from stopping import StoppingCriteria
+from config import ISLANDS, MIGRATION_INTERVAL, MIGRANTS, MIGRATION_TOPOLOGY, ISLAND_OPERATORS
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from time import perf_counter
+from typing import Dict, List, Tuple
+from statistics import fmean
+import numpy as np
+import random
+
+# The ways the migrants of each island can move between the islands.
+TOPOLOGIES = ("ring", "fully connected", "random")
+
+
+def _run_island(connection: Connection, population: Population, bin_focus: int, operators: Dict[str, str], migrants: int, seed: int) -> None:
+    """
+    The loop each island's process runs. The island evolves for the number of generations it's sent, after taking in
+    any migrants, then reports its fittest groups back. It's sent None once the evolution of the bin has stopped, to
+    which it replies with its summary and key generations.
+    :param Connection connection: The island's end of the pipe to the IslandModel.
+    :param Population population: The population, which has had its cylinders binned.
+    :param int bin_focus: The bin of cylinders to evolve.
+    :param Dict[str, str] operators: The selection, crossover and mutation of this island, if they differ.
+    :param int migrants: The number of the island's fittest groups that migrate.
+    :param int seed: The seed of this island's random number generator.
+    :return: None
+    """
+    try:
+        random.seed(seed)
+        population.set_operators(**operators)
+        population.generate_groups(bin_focus)
+        start_time = perf_counter()
+
+        while (message := connection.recv()) is not None:
+            generations, immigrants = message
+            if immigrants is not None:
+                population.immigrate(*immigrants)
+
+            for _ in range(generations):
+                population.evolve(bin_focus)
+
+            connection.send((
+                population.emigrants(migrants),
+                population.best_fitness,
+                population.key_generations[-1][0] if population.key_generations else -1,
+                population.diversity()
+            ))
+
+        connection.send((population.get_summary(perf_counter() - start_time, bin_focus), population.key_generations))
+
+    except Exception as error:  # handed to the IslandModel, which raises it
+        connection.send(error)
+
+    finally:
+        population.shutdown()
+        connection.close()
+
+
+class IslandModel:
+    """
+    Evolves the population of a bin as several sub-populations (islands), each within its own process. Every few
+    generations, the fittest groups of each island migrate to the others, replacing some of their offspring. Each
+    island can use its own selection, crossover and mutation, so islands that would stagnate on their own are kept
+    supplied with groups found in other ways.
+    """
+
+    def __init__(self, islands: int = ISLANDS, *, migration_interval: int = MIGRATION_INTERVAL, migrants: int = MIGRANTS,
+                 topology: str = MIGRATION_TOPOLOGY, operators: List[Dict[str, str]] | None = None):
+        """
+        :param int islands: The number of islands.
+        :param int migration_interval: The number of generations between each migration.
+        :param int migrants: The number of each island's fittest groups that migrate.
+        :param str topology: Where the migrants go: "ring", "fully connected" or "random".
+        :param List[Dict[str, str]] | None operators: The selection, crossover and mutation of each island, cycled
+        through when there are more islands than entries. If None is specified, the config file's ISLAND_OPERATORS are
+        used.
+        """
+        if topology not in TOPOLOGIES:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown migration topology '{topology}', use one of {list(TOPOLOGIES)}\033[0m")
+
+        if islands < 1 or migration_interval < 1:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: There must be at least 1 island and 1 generation between migrations\033[0m")
+
+        self.__islands = islands
+        self.__migration_interval = migration_interval
+        self.__migrants = migrants
+        self.__topology = topology
+        self.__operators = ISLAND_OPERATORS if operators is None else operators
+
+    @property
+    def islands(self) -> int:
+        return self.__islands
+
+    def operators(self, island: int) -> Dict[str, str]:
+        """
+        Gets the operators of an island that differ from the population's.
+        :param int island: The index of the island.
+        :return: Dict[str, str]
+        """
+        return self.__operators[island % len(self.__operators)] if self.__operators else {}
+
+    def __sources(self) -> List[List[int]]:
+        """
+        Finds the islands that each island receives migrants from.
+        :return: List[List[int]]
+        """
+        if self.__topology == "ring":
+            return [[(i - 1) % self.__islands] for i in range(self.__islands)]
+
+        if self.__topology == "fully connected":
+            return [[j for j in range(self.__islands) if j != i] for i in range(self.__islands)]
+
+        sources = [[] for _ in range(self.__islands)]
+        for i in range(self.__islands):
+            sources[(i + random.randrange(1, self.__islands)) % self.__islands].append(i)
+
+        return sources
+
+    def __migrate(self, emigrants: List[Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> List[Tuple[np.ndarray, np.ndarray] | None]:
+        """
+        Decides which groups migrate to each island. An island that receives from several others keeps the fittest of
+        them.
+        :param List[Tuple[np.ndarray, np.ndarray, np.ndarray]] emigrants: The position strings, lengths and fitnesses of
+        the fittest groups of each island.
+        :return: List[Tuple[np.ndarray, np.ndarray] | None], the position strings and lengths of the groups each island
+        receives, None if it receives none.
+        """
+        immigrants = []
+        for sources in self.__sources():
+            if not sources:
+                immigrants.append(None)
+                continue
+
+            genomes, lengths, fitnesses = (np.concatenate(arrays) for arrays in zip(*(emigrants[source] for source in sources)))
+            fittest = np.argsort(-fitnesses, kind="stable")[:self.__migrants]
+            immigrants.append((genomes[fittest], lengths[fittest]))
+
+        return immigrants
+
+    @staticmethod
+    def __receive(connection: Connection):
+        """Receives a reply from an island, raising any exception it was stopped by."""
+        reply = connection.recv()
+        if isinstance(reply, Exception):
+            raise reply
+
+        return reply
+
+    def evolve_bin(self, population: Population, bin_focus: int, stopping: StoppingCriteria) -> Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]]:
+        """
+        Evolves the population of a bin across every island, until any of the stopping criteria are met. The islands
+        evolve in step, so the criteria are checked at each migration, using the best of every island, and an
+        island's generations are those of the bin.
+        :param Population population: The population, which has had its cylinders binned.
+        :param int bin_focus: The bin of cylinders to evolve.
+        :param StoppingCriteria stopping: The criteria to stop evolving at.
+        :return: Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]], the summary and key generations of
+        the island that found the best group, alongside the details of every island within the summary.
+        """
+        start_time = perf_counter()
+        stopping.start_bin()
+
+        connections, processes = [], []
+        for i in range(self.__islands):
+            connection, island_connection = Pipe()
+            process = Process(
+                target=_run_island,
+                args=(island_connection, population, bin_focus, self.operators(i), min(self.__migrants, population.size), random.getrandbits(32)),
+                daemon=True
+            )
+            process.start()
+            island_connection.close()
+
+            connections.append(connection)
+            processes.append(process)
+
+        try:
+            generations, migrations, reports = 0, 0, []
+            best_fitness, last_improvement, diversities = 0., -1, [1.]
+
+            while (reason := stopping.check(generations, last_improvement, best_fitness, lambda: fmean(diversities))) is None:
+                immigrants = [None] * self.__islands
+                if reports and self.__islands > 1:
+                    immigrants = self.__migrate([report[0] for report in reports])
+                    migrations += 1
+
+                epoch = min(self.__migration_interval, stopping.max_generations - generations)
+                for connection, arrivals in zip(connections, immigrants):
+                    connection.send((epoch, arrivals))
+
+                reports = [self.__receive(connection) for connection in connections]
+                generations += epoch
+
+                best_fitness = max(report[1] for report in reports)
+                last_improvement = max(report[2] for report in reports)
+                diversities = [report[3] for report in reports]
+
+            for connection in connections:
+                connection.send(None)
+
+            results = [self.__receive(connection) for connection in connections]
+
+        finally:
+            for connection, process in zip(connections, processes):
+                connection.close()
+                process.join()
+
+        # - Summarise the bin with the island that found the best group - #
+        fitnesses = [summary["Best Cylinder Group"]["Fitness"] for summary, _ in results]
+        best_island = int(np.argmax(fitnesses))
+        summary, key_generations = results[best_island]
+
+        summary["Compute Time"] = perf_counter() - start_time
+        summary["Stop Reason"] = reason
+        summary["Decodes"] = sum(island_summary["Decodes"] for island_summary, _ in results)
+
+        # The islands evolve alongside each other, so the bin reached its target as soon as any island did.
+        reached = [island_summary["Time To Target"] for island_summary, _ in results
+                   if island_summary["Time To Target"] is not None and island_summary["Time To Target"]["Seconds"] is not None]
+        if reached:
+            summary["Time To Target"] = min(reached, key=lambda time_to_target: time_to_target["Seconds"])
+        summary["Islands"] = {
+            "Islands": self.__islands,
+            "Topology": self.__topology,
+            "Migration Interval": self.__migration_interval,
+            "Migrants": self.__migrants,
+            "Migrations": migrations,
+            "Best Island": best_island,
+            "Best Fitnesses": tuple(fitnesses),
+            "Operators": tuple(
+                f"{island_summary['Selection Method Used']}, {island_summary['Crossover Technique Used']}, {island_summary['Mutation Mode']} mutation"
+                for island_summary, _ in results
+            )
+        }
+
+        return summary, key_generations
+
+
+if __name__ == "__main__":
+    from TEST import test_instances
+
+    random.seed(0)
+    (_container_width, _container_height, _max_weight), _cylinders = test_instances(5)
+
+    _population = Population(50, list(_cylinders), len(_cylinders), .1, 8, _max_weight, verbose=False)
+    _population.bin_cylinders()
+    _population.set_dimensions(_container_width, _container_height)
+
+    _model = IslandModel(4, operators=[{}, {"crossover": "uniform"}, {"selection": "rank based"}, {"crossover": "davis order"}])
+    _summary, _ = _model.evolve_bin(_population, 0, StoppingCriteria(100))
+
+    print(f"Best fitness:\t{_summary['Best Cylinder Group']['Fitness']}\n"
+          f"Islands:\t\t{_summary['Islands']}")
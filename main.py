@@ -1,22 +1,39 @@
-from config import CYLINDER_SIDES, EXECUTE_TEST_CASE, CONTAINER_HEIGHT, CONTAINER_WIDTH, VISUALISE_EVOLUTION, RECORD_RESULTS, SAVE_ANIMATION, SLIDE_ANIMATION, SAVE_FORMAT
-from event_manager import EventManager
-from population import Population
+from config import CYLINDER_SIDES, EXECUTE_TEST_CASE, CONTAINER_HEIGHT, CONTAINER_WIDTH, VISUALISE_EVOLUTION, RECORD_RESULTS, SAVE_ANIMATION, SLIDE_ANIMATION, SAVE_FORMAT, BIN_WORKERS, DECODE_WORKERS, DECODE_CACHE_SIZE, RESUME_DECODES, MANIFEST_PATH, SELECTION_METHOD, MUTATION_MODE, BIN_PACKING, CROSSOVER_METHOD, ISLANDS, MIGRATION_INTERVAL, MIGRANTS, MIGRATION_TOPOLOGY, CHECKPOINT_PATH, TELEMETRY_PATH, RESULT_CACHE_MODE, RESULT_CACHE_DIRECTORY, INITIALISER, SEEDED_FRACTION, INITIAL_ARCHIVE, TIME_TO_TARGET
+from concurrent.futures import ProcessPoolExecutor
+from population import Population, evolve_bin
+from islands import IslandModel
+from checkpoint import Checkpointer, load_checkpoint, restore_random_state
+from telemetry import TelemetryWriter
+from result_cache import ResultCache, CACHE_MODES
+from render import render_bins
+from stopping import StoppingCriteria
+from profiler import PhaseProfiler
 from cylinders import Cylinder
-import matplotlib.pyplot as plt
+from manifest import Manifest, load_manifest
 from numpy import ndarray
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Sequence, TYPE_CHECKING
 from math import sqrt
 from TEST import test_instances
 from time import perf_counter
 from json import dump
 
+import random
 
-def create_subplots(population: Population) -> Tuple[plt.Figure, plt.Axes, EventManager]:
+# matplotlib is only imported once a run is visualised, so headless runs don't pay for it.
+if TYPE_CHECKING:
+    from event_manager import EventManager
+    import matplotlib.pyplot as plt
+
+
+def create_subplots(population: Population) -> Tuple["plt.Figure", "plt.Axes", "EventManager"]:
     """
     Creates subplots depending on the quantity of how many cylinders that were binned.
     :param Population population: Population obj.
     :return: Tuple[plt.Figure, plt.Axes, EventManager]
     """
+    from event_manager import EventManager
+    import matplotlib.pyplot as plt
+
     # Create square-sized subplot to store animations of different bins
     n_row_col = sqrt(population.bins.total)
     if int(n_row_col) != n_row_col:
@@ -37,77 +54,321 @@ def create_subplots(population: Population) -> Tuple[plt.Figure, plt.Axes, Event
     return fig, ax, EventManager(fig)
 
 
-def run_ga(cylinders: List[Cylinder],
+def run_ga(cylinders: List[Cylinder] | Manifest,
            num_cylinders: int = 5,
            *,
            population_size: int = 50,
            mutation_rate: float = .1,
+           selection: str = SELECTION_METHOD,
+           crossover: str = CROSSOVER_METHOD,
+           mutation: str = MUTATION_MODE,
+           packing: str = BIN_PACKING,
+           initialiser: str = INITIALISER,
+           seeded_fraction: float = SEEDED_FRACTION,
+           initial_archive: Sequence[str] = INITIAL_ARCHIVE,
            max_generations: int = 100,
            max_weight: int = 10_000,
            cylinder_sides: int = CYLINDER_SIDES,
            container_width: float = CONTAINER_WIDTH,
            container_height: float = CONTAINER_HEIGHT,
-           visualise: bool = VISUALISE_EVOLUTION) -> None:
+           visualise: bool = VISUALISE_EVOLUTION,
+           workers: int = BIN_WORKERS,
+           decode_workers: int = DECODE_WORKERS,
+           cache_size: int = DECODE_CACHE_SIZE,
+           resume_decodes: bool = RESUME_DECODES,
+           islands: int = ISLANDS,
+           migration_interval: int = MIGRATION_INTERVAL,
+           migrants: int = MIGRANTS,
+           migration_topology: str = MIGRATION_TOPOLOGY,
+           checkpoint_path: str | None = CHECKPOINT_PATH,
+           result_cache: str | None = RESULT_CACHE_MODE,
+           result_cache_directory: str = RESULT_CACHE_DIRECTORY,
+           resume: bool = False,
+           telemetry_path: str | None = TELEMETRY_PATH,
+           time_to_target: float | None = TIME_TO_TARGET,
+           verbose: bool = True,
+           record: bool = RECORD_RESULTS,
+           stopping: StoppingCriteria | None = None,
+           profiler: PhaseProfiler | None = None) -> Dict[str, Dict]:
     """
     Runs the genetic algorithm for the cargo loading problem provided.
 
-    :param List[Cylinder] cylinders: A list of cylinders that will be grouped up. If [] is specified, a default range
-    of cylinders based on num_cylinders will be created, with weights and diameter in accordance to the config file
-    CYLINDER_TYPES.
+    :param List[Cylinder] | Manifest cylinders: A list of cylinders that will be grouped up. If [] is specified, a
+    default range of cylinders based on num_cylinders will be created, with weights and diameter in accordance to the
+    config file CYLINDER_TYPES. A Manifest (from manifest.load_manifest()) is binned straight from its columns, with
+    the cylinders of each bin only created once it's evolved.
 
     :param int num_cylinders: The number of cylinders provided or in the case of [] cylinders, the number of cylinders
-    to generate.
+    to generate. It's ignored for a Manifest.
 
     :param int population_size: The amount of groups to create with the given cylinders.
     :param float mutation_rate: The probability of a mutation to occur: a new position number to be randomly assigned.
-    :param int max_generations: The number of generations to compute for.
+    :param str selection: How the parents of each generation are selected, e.g. "tournament" or "rank based".
+    :param str crossover: How the parents are crossed over: "single point", "multi point", "uniform" or "davis order".
+    :param str mutation: How mutated position numbers are replaced, either "uniform" or "feasible".
+    :param str packing: How the cylinders are packed into bins, heaviest first: "first fit" or "best fit".
+
+    :param str initialiser: How the first generation of each bin is created: "random", "greedy" (placing each cylinder
+    to keep the centre of mass near the centre of the container), "archive" (rebuilt from the placements of earlier
+    runs) or "mixed" (a fraction seeded from the archive then greedily, the rest random).
+    :param float seeded_fraction: The fraction of each first generation [0-1] that the "mixed" initialiser seeds.
+    :param Sequence[str] initial_archive: The results, result cache entries or telemetry files (or directories of them)
+    whose placements seed the first generations, e.g. ["_TEST_RESULTS"].
+
+    :param int max_generations: The number of generations to compute for, at most.
     :param int max_weight: The maximum weight of the container.
     :param int cylinder_sides: How many sides of a cylinder to compute for.
     :param float container_width: The width of the given container.
     :param float container_height: The height of the given container.
     :param bool visualise: Whether to visualise the evolution of the population or not.
 
-    :return: None
+    :param int workers: The number of worker processes that evolve separate bins in parallel. When it's 1, each bin is
+    evolved one after another.
+
+    :param int decode_workers: The number of worker processes that share the decoding of a population within each
+    generation. Small populations are still decoded serially.
+
+    :param int cache_size: The number of decoded position strings to remember, 0 disables the cache.
+    :param bool resume_decodes: Whether position strings resume decoding from a prefix shared with the last generation.
+
+    :param int islands: The number of sub-populations each bin is evolved across, each within its own process. When
+    it's more than 1, the bins are evolved one after another, and workers is unused.
+
+    :param int migration_interval: The number of generations between each migration of groups between islands.
+    :param int migrants: The number of each island's fittest groups that migrate.
+    :param str migration_topology: Where the migrants go: "ring", "fully connected" or "random".
+
+    :param str | None checkpoint_path: Where a checkpoint of the bin being evolved is written, every few generations as
+    set within the config file. Only bins evolved one after another, as a single population, are checkpointed. If None
+    is specified, no checkpoints are written.
+
+    :param str | None result_cache: How bins solved by earlier runs, with the same cylinders (by diameter and weight),
+    container and parameters, are used: "reuse" returns their placements without evolving them, "warm start" evolves
+    them starting from their placements. Each bin's best placement is stored for later runs, and the hit rate is shown
+    in each bin's summary. If None is specified, nothing is cached.
+    :param str result_cache_directory: The directory the solved bins are kept within.
+
+    :param bool resume: Whether to resume the run from the checkpoint at checkpoint_path, which must have been written
+    with the same cylinders and parameters. Bins that had finished aren't evolved again.
+
+    :param str | None telemetry_path: Where a record of every generation of each bin is streamed to, as JSON lines,
+    followed by the final placements of each bin. Only bins evolved within this process, one after another as a single
+    population, stream their generations. If None is specified, nothing is streamed.
+    :param float | None time_to_target: The fitness whose time to reach, in generations and seconds, is shown in each
+    bin's summary. If None is specified, the config file's TARGET_FITNESS is used.
+    :param bool verbose: Whether to print the progress of the evolution.
+    :param bool record: Whether to record the key events of the evolution into the _TEST_RESULTS directory.
+    :param StoppingCriteria | None stopping: When each bin stops evolving. If None is specified, the criteria within
+    the config file are used alongside max_generations.
+    :param PhaseProfiler | None profiler: Times each phase of every generation. If None is specified, one is created
+    that's enabled by the config file's PROFILE_PHASES.
+
+    :return: Dict[str, Dict], the summary of the evolution within each bin: {'Bin i': summary}.
     """
+    checkpointer = None
+    if checkpoint_path is not None:
+        if workers > 1 or islands > 1:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Checkpoints can only be written when bins are evolved one after another, with a single island\033[0m")
+
+        checkpointer = Checkpointer(checkpoint_path)
+
+    # The state of the bin that was being evolved, and the bins that had finished, when resuming.
+    resumed_state, completed = load_checkpoint(checkpoint_path) if resume and checkpoint_path is not None else (None, {})
+
+    telemetry = TelemetryWriter(telemetry_path) if telemetry_path is not None else None
+
     # Init population and bin cylinders
-    population = Population(population_size, cylinders, num_cylinders, mutation_rate, cylinder_sides, max_weight)
+    population = Population(population_size, cylinders, num_cylinders, mutation_rate, cylinder_sides, max_weight,
+                            selection=selection, crossover=crossover, mutation=mutation, packing=packing, decode_workers=decode_workers, cache_size=cache_size,
+                            resume_decodes=resume_decodes, profiler=profiler, checkpointer=checkpointer,
+                            telemetry=telemetry, initialiser=initialiser, seeded_fraction=seeded_fraction, archive=initial_archive,
+                            target_fitness=time_to_target, verbose=verbose)
     population.bin_cylinders()
 
-    fig, ax, event_manager = create_subplots(population)
-    population.create_containers(fig, ax, event_manager, container_width, container_height)
+    if visualise:
+        fig, ax, event_manager = create_subplots(population)
+        population.create_containers(fig, ax, event_manager, container_width, container_height)
+    else:
+        population.set_dimensions(container_width, container_height)
+
+    # The bins that were solved by earlier runs, which are looked up by the key of each bin that needs evolving.
+    cache, cache_keys, cached, reused = None, {}, {}, {}
+    if result_cache is not None:
+        if result_cache not in CACHE_MODES:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown result cache mode '{result_cache}', use one of {list(CACHE_MODES)}\033[0m")
+
+        cache = ResultCache(result_cache_directory)
+        parameters = {"population_size": population_size, "mutation_rate": mutation_rate, "selection": selection, "crossover": crossover,
+                      "mutation": mutation, "max_generations": max_generations, "initialiser": initialiser}
+
+        for i in range(population.bins.total):
+            if not population.needs_evolution(i) or f"Bin {i}" in completed:
+                continue
+
+            cylinders = population.bins.bins[i].cylinders
+            diameters, weights = [cylinder.diameter for cylinder in cylinders], [cylinder.weight for cylinder in cylinders]
+            cache_keys[i] = cache.key(diameters, weights, container_width, container_height, cylinder_sides, parameters)
+
+            cached[i] = cache.get(cache_keys[i], diameters, weights)
+            if cached[i] is not None:
+                if result_cache == "reuse":
+                    reused[i] = cached[i]["Placement"]
+                else:
+                    population.set_warm_start(i, cached[i]["Placement"], cached[i]["Fitness"])
+
+    stopping = stopping or StoppingCriteria(max_generations)
+    stopping.start_run()
 
     # For each bin generate its own initial population and evolve them, whilst storing each animation and the key events
     animations = []
     key_events = {}  # {'bin number': {summary of evolution in that bin}}
-    for i in range(population.bins.total):
-        start_time = perf_counter()
+    histories = {}  # {bin number: key generations}, rendered into saved animations once every bin has evolved
+    if islands > 1:
+        # Each bin is evolved across every island in turn, with the islands' own processes running alongside each other.
+        model = IslandModel(islands, migration_interval=migration_interval, migrants=migrants, topology=migration_topology)
+
+        for i in range(population.bins.total):
+            if i in reused:  # solved by an earlier run
+                population.load_placement(i, reused[i])
+                key_events[f"Bin {i}"], histories[i] = population.get_summary(0., i), population.key_generations
+
+                if visualise: animations.append(population.visualise_evolution(i))
+                continue
 
-        if not population.generate_groups(i):  # checks whether there's any need to evolve this bin
-            continue  # Skip the evolving process when there's no need.
+            if not population.needs_evolution(i):
+                population.generate_groups(i)  # draws the static bin
+                continue
 
-        for generation in range(max_generations):
-            population.evolve(i)
+            key_events[f"Bin {i}"], key_generations = model.evolve_bin(population, i, stopping)
+            population.load_key_generations(i, key_generations)
+            histories[i] = key_generations
 
-        if visualise: animations.append(population.visualise_evolution(i))
-        key_events[f"Bin {i}"] = population.get_summary(perf_counter() - start_time, i)
+            if visualise: animations.append(population.visualise_evolution(i))
 
-    if visualise: plt.show()
+    elif workers > 1:
+        # Each bin that needs evolving is sent to a worker, with its own seed drawn so the run stays reproducible.
+        # All results are collected before the population is touched again, as it's pickled for each task.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                i: executor.submit(evolve_bin, population, i, stopping, random.getrandbits(32))
+                for i in range(population.bins.total) if population.needs_evolution(i) and i not in reused
+            }
+            results = {i: future.result() for i, future in futures.items()}
+
+        for i in range(population.bins.total):
+            if i in reused:  # solved by an earlier run
+                population.load_placement(i, reused[i])
+                key_events[f"Bin {i}"], histories[i] = population.get_summary(0., i), population.key_generations
+
+                if visualise: animations.append(population.visualise_evolution(i))
+                continue
+
+            if i not in results:
+                population.generate_groups(i)  # draws the static bin
+                continue
+
+            key_events[f"Bin {i}"], key_generations = results[i]
+            population.load_key_generations(i, key_generations)
+            histories[i] = key_generations
+
+            if visualise: animations.append(population.visualise_evolution(i))
+
+    else:
+        if resumed_state is not None and "bin_focus" not in resumed_state:  # the checkpoint was written as a bin finished
+            restore_random_state(resumed_state["random_state"])
+
+        for i in range(population.bins.total):
+            if f"Bin {i}" in completed:  # the bin had finished evolving before the run was resumed
+                key_events[f"Bin {i}"], key_generations = completed[f"Bin {i}"]
+                population.load_key_generations(i, key_generations)
+                histories[i] = key_generations
+                checkpointer.complete_bin(f"Bin {i}", key_events[f"Bin {i}"], key_generations)
+
+                if visualise: animations.append(population.visualise_evolution(i))
+                continue
+
+            if i in reused:  # solved by an earlier run
+                population.load_placement(i, reused[i])
+                key_events[f"Bin {i}"], histories[i] = population.get_summary(0., i), population.key_generations
+
+                if visualise: animations.append(population.visualise_evolution(i))
+                continue
+
+            start_time = perf_counter()
+
+            if not population.generate_groups(i):  # checks whether there's any need to evolve this bin
+                continue  # Skip the evolving process when there's no need.
+
+            if resumed_state is not None and int(resumed_state.get("bin_focus", -1)) == i:
+                population.restore(i, resumed_state)
+
+            population.evolve_until(stopping, i)
+
+            if visualise: animations.append(population.visualise_evolution(i))
+            key_events[f"Bin {i}"] = population.get_summary(perf_counter() - start_time, i)
+            histories[i] = population.key_generations
+
+            if checkpointer is not None:
+                checkpointer.complete_bin(f"Bin {i}", key_events[f"Bin {i}"], population.key_generations)
+
+    if cache is not None:
+        # Each bin's best placement is stored, unless the cache already holds one at least as fit, which may be that of
+        # another bin of this run with the same cylinders.
+        fittest = {key: cached[i]["Fitness"] for i, key in cache_keys.items() if cached[i] is not None}
+        for i, key in cache_keys.items():
+            best = key_events[f"Bin {i}"]["Best Cylinder Group"]
+            if key not in fittest or best["Fitness"] > fittest[key]:
+                cache.put(key, best["Fitness"], [[diameter, weight, *centre] for diameter, weight, centre in zip(best["Diameters"], best["Weights"], best["Centres"])])
+                fittest[key] = best["Fitness"]
+
+        for i in cache_keys:
+            key_events[f"Bin {i}"]["Result Cache"] = {
+                "Mode": result_cache,
+                "Hit": cached[i] is not None,
+                "Cached Fitness": cached[i]["Fitness"] if cached[i] is not None else None,
+                **cache.get_summary()
+            }
+
+    if checkpointer is not None:
+        checkpointer.close()
+
+    if telemetry is not None:
+        for name, summary in key_events.items():
+            telemetry.record_placements(int(name.split(' ')[1]), summary["Best Cylinder Group"])
+        telemetry.close()
+
+    population.shutdown()
+
+    if visualise:
+        import matplotlib.pyplot as plt
+        plt.show()
 
     smu, ctu, mut_rate = '', '', 0.
-    if RECORD_RESULTS or SAVE_ANIMATION:
+    if record or SAVE_ANIMATION:
         smu, ctu, mut_rate = (
             key_events["Bin 0"]["Selection Method Used"],
             ''.join(map(lambda x: x[0], key_events["Bin 0"]["Crossover Technique Used"].split(' '))),
             key_events["Bin 0"]["Mutation Rate"]
         )
 
-    if RECORD_RESULTS:
+    if record:
         with open(f"_TEST_RESULTS/TEST_Instance[{EXECUTE_TEST_CASE}]-SMU[{smu}]-CTU[{ctu}]-MR[{mut_rate}].json", 'w') as json_file:
             dump(key_events, json_file)
 
     if SAVE_ANIMATION:
-        for bin_focus, animation in enumerate(animations):
-            animation.save(f"_ANIMATIONS/TEST_Instance[{EXECUTE_TEST_CASE}]-Bin[{bin_focus}]-SMU[{smu}]-CTU[{ctu}]-MR[{mut_rate}]-SLIDING[{SLIDE_ANIMATION}].{SAVE_FORMAT}", fps=60)
+        # Each bin's animation is rendered from its key generations within a worker process, off screen.
+        render_bins({
+            f"_ANIMATIONS/TEST_Instance[{EXECUTE_TEST_CASE}]-Bin[{i}]-SMU[{smu}]-CTU[{ctu}]-MR[{mut_rate}]-SLIDING[{SLIDE_ANIMATION}].{SAVE_FORMAT}": {
+                "key_generations": key_generations,
+                "diameters": key_events[f"Bin {i}"]["Best Cylinder Group"]["Diameters"],
+                "weights": key_events[f"Bin {i}"]["Best Cylinder Group"]["Weights"],
+                "container_width": container_width,
+                "container_height": container_height
+            }
+            for i, key_generations in histories.items()
+        })
+
+    return key_events
 
 
 if __name__ == "__main__":
@@ -121,6 +382,10 @@ if __name__ == "__main__":
         _num_cylinders = len(_cylinders)
         _container_width, _container_height, _max_weight = _test_instance[0]
 
+    if MANIFEST_PATH is not None:  # a shipment's manifest replaces the test instance's cylinders
+        _cylinders = load_manifest(MANIFEST_PATH)
+        _num_cylinders = len(_cylinders)
+
     run_ga(
         _cylinders,
         _num_cylinders,  # How many cylinders should be generated
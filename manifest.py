@@ -0,0 +1,314 @@
+from config import CYLINDER_SIDES
+from TEST import TestCylinder
+from typing import Dict, Iterator, List, Tuple
+from os.path import splitext
+from json import loads
+import numpy as np
+import csv
+
+# The columns (or fields) every manifest holds for each cylinder.
+MANIFEST_COLUMNS = ("id", "diameter", "weight")
+
+# The number of rows read and validated at once, so a manifest is never held as Python objects all at once.
+_BATCH_ROWS = 65_536
+
+# The most bad rows named by a validation error.
+_REPORTED_ROWS = 10
+
+
+def _manifest_error(path: str, message: str) -> Exception:
+    return Exception(f"\r\033[1m\033[31mCustom Exception: Manifest '{path}' {message}\033[0m")
+
+
+class Manifest:
+    """
+    The cylinders of a shipment held as columns of numbers (id, diameter, weight), rather than as a Cylinder for every
+    row, so large manifests can be binned straight from their weights. Cylinders are only created for the rows of a
+    bin once it's evolved.
+    """
+
+    def __init__(self, ids: np.ndarray, diameters: np.ndarray, weights: np.ndarray):
+        """
+        :param np.ndarray ids: The id of each cylinder.
+        :param np.ndarray diameters: The diameter of each cylinder.
+        :param np.ndarray weights: The weight of each cylinder.
+        """
+        self.__ids = ids
+        self.__diameters = diameters
+        self.__weights = weights
+
+    def __len__(self) -> int:
+        return len(self.__weights)
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.__ids
+
+    @property
+    def diameters(self) -> np.ndarray:
+        return self.__diameters
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self.__weights
+
+    def sorted_by_weight(self) -> "Manifest":
+        """
+        Orders the rows from heaviest to lightest, keeping the order of equal weights, in the same way Population sorts
+        a list of cylinders.
+        :return: Manifest, a copy in that order.
+        """
+        order = np.argsort(-np.asarray(self.__weights), kind="stable")
+        return Manifest(np.asarray(self.__ids)[order], np.asarray(self.__diameters)[order], np.asarray(self.__weights)[order])
+
+    def take(self, rows: np.ndarray) -> "Manifest":
+        """
+        :param np.ndarray rows: The indices of the rows to keep, in the order they're kept in.
+        :return: Manifest, a copy holding only those rows.
+        """
+        return Manifest(np.asarray(self.__ids)[rows], np.asarray(self.__diameters)[rows], np.asarray(self.__weights)[rows])
+
+    def cylinders(self, cylinder_sides: int = CYLINDER_SIDES) -> List[TestCylinder]:
+        """
+        Creates a cylinder for every row.
+        :param int cylinder_sides: The number of sides each cylinder's polygon has.
+        :return: List[TestCylinder]
+        """
+        return [TestCylinder(int(id_), float(diameter), float(weight), cylinder_sides)
+                for id_, diameter, weight in zip(self.__ids.tolist(), self.__diameters.tolist(), self.__weights.tolist())]
+
+
+def _validate(path: str, first_row: int, diameters: np.ndarray, weights: np.ndarray) -> None:
+    """
+    Checks a batch of rows all at once: every diameter and weight must be a finite, positive number.
+    :param str path: The manifest, for the error.
+    :param int first_row: The row number of the batch's first row, counted from 1 after any header.
+    :return: None
+    """
+    bad = ~(np.isfinite(diameters) & np.isfinite(weights) & (diameters > 0) & (weights > 0))
+    if bad.any():
+        rows = (np.flatnonzero(bad)[:_REPORTED_ROWS] + first_row).tolist()
+        raise _manifest_error(path, f"has {int(bad.sum())} row(s) without a positive, finite diameter and weight, e.g. rows {rows}")
+
+
+def _whole_numbers(ids: np.ndarray) -> np.ndarray:
+    """
+    Finds the ids that are whole numbers, so that bools (e.g. JSON's true) and fractions are rejected rather than
+    being cast to an integer.
+    :param np.ndarray ids: The ids, either as numbers or as an object array of numbers and strings.
+    :return: np.ndarray, whether each id is a whole number.
+    """
+    if ids.dtype == object:
+        bools = np.frompyfunc(lambda id_: isinstance(id_, (bool, np.bool_)), 1, 1)(ids).astype(bool)
+    else:
+        bools = np.full(ids.shape, ids.dtype.kind == "b")
+
+    return ~bools & np.equal(np.mod(ids.astype(np.float64), 1), 0)
+
+
+def _bad_row_error(path: str, row: int, values: List) -> Exception:
+    return _manifest_error(path, f"has an id that isn't a whole number, or a diameter or weight that isn't a number, on row {row}: {values}")
+
+
+def _columns(path: str, first_row: int, rows: List[Tuple[str, ...]] | List[Tuple[float, ...]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts a batch of (id, diameter, weight) rows into columns.
+    :return: Tuple[np.ndarray, np.ndarray, np.ndarray], the ids, diameters and weights.
+    """
+    try:
+        ids, diameters, weights = np.array(rows, dtype=object).reshape(-1, 3).T
+        columns = ids.astype(np.int64), diameters.astype(np.float64), weights.astype(np.float64)
+        whole = _whole_numbers(ids)
+
+    except (TypeError, ValueError):
+        # Found one at a time, only once the batch is known to hold a bad row.
+        for i, row in enumerate(rows):
+            try:
+                _ = int(row[0]), float(row[1]), float(row[2])
+                if not _whole_numbers(np.array([row[0]], dtype=object))[0]:
+                    raise ValueError
+            except (TypeError, ValueError):
+                raise _bad_row_error(path, first_row + i, list(row))
+        raise
+
+    if not whole.all():
+        i = int(np.argmin(whole))
+        raise _bad_row_error(path, first_row + i, list(rows[i]))
+
+    return columns
+
+
+def _read_csv(path: str) -> Iterator[Tuple[int, List[Tuple[str, ...]]]]:
+    """
+    Streams the rows of a CSV manifest, whose header names its id, diameter and weight columns in any order.
+    :return: Iterator[Tuple[int, List[Tuple[str, ...]]]], the row number of each batch's first row, and its rows.
+    """
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        header = [column.strip().lower() for column in next(reader, [])]
+
+        if any(column not in header for column in MANIFEST_COLUMNS):
+            raise _manifest_error(path, f"needs a header with the columns {list(MANIFEST_COLUMNS)}, it has {header}")
+
+        indices = [header.index(column) for column in MANIFEST_COLUMNS]
+        batch, first_row = [], 1
+        for row in reader:
+            if not row:
+                continue
+
+            if len(row) < len(header):
+                raise _manifest_error(path, f"has {len(row)} column(s) on row {first_row + len(batch)}, rather than {len(header)}")
+
+            batch.append(tuple(row[i] for i in indices))
+            if len(batch) == _BATCH_ROWS:
+                yield first_row, batch
+                batch, first_row = [], first_row + _BATCH_ROWS
+
+        if batch:
+            yield first_row, batch
+
+
+def _read_jsonl(path: str) -> Iterator[Tuple[int, List[Tuple[float, ...]]]]:
+    """
+    Streams the rows of a JSON lines manifest, with an object holding the id, diameter and weight of a cylinder on
+    each line.
+    :return: Iterator[Tuple[int, List[Tuple[float, ...]]]], the row number of each batch's first row, and its rows.
+    """
+    with open(path) as file:
+        batch, first_row = [], 1
+        for line in file:
+            if not line.strip():
+                continue
+
+            try:
+                record = loads(line)
+                batch.append(tuple(record[column] for column in MANIFEST_COLUMNS))
+            except (ValueError, KeyError, TypeError):
+                raise _manifest_error(path, f"needs an object with the keys {list(MANIFEST_COLUMNS)} on row {first_row + len(batch)}, it has: {line.strip()[:80]}")
+
+            if len(batch) == _BATCH_ROWS:
+                yield first_row, batch
+                batch, first_row = [], first_row + _BATCH_ROWS
+
+        if batch:
+            yield first_row, batch
+
+
+def _load_npy(path: str) -> Manifest:
+    """
+    Memory maps a NumPy manifest: either a structured array with id, diameter and weight fields, or a (rows, 3) array
+    of those columns in that order. Its columns are validated a batch at a time, so only the pages being checked are
+    read in.
+    :return: Manifest, whose columns are views of the mapped file.
+    """
+    array = np.load(path, mmap_mode="r")
+
+    if array.dtype.names is not None:
+        if any(column not in array.dtype.names for column in MANIFEST_COLUMNS):
+            raise _manifest_error(path, f"needs the fields {list(MANIFEST_COLUMNS)}, it has {list(array.dtype.names)}")
+        ids, diameters, weights = (array[column] for column in MANIFEST_COLUMNS)
+
+    elif array.ndim == 2 and array.shape[1] == len(MANIFEST_COLUMNS):
+        ids, diameters, weights = array.T
+
+    else:
+        raise _manifest_error(path, f"needs a structured array or a (rows, 3) array, it has the shape {array.shape}")
+
+    for start in range(0, len(array), _BATCH_ROWS):
+        batch = slice(start, start + _BATCH_ROWS)
+        _validate(path, start + 1, diameters[batch].astype(np.float64), weights[batch].astype(np.float64))
+
+        whole = _whole_numbers(ids[batch])
+        if not whole.all():
+            i = start + int(np.argmin(whole))
+            raise _bad_row_error(path, i + 1, [ids[i].item(), diameters[i].item(), weights[i].item()])
+
+    return Manifest(ids, diameters, weights)
+
+
+def _check_ids(path: str, manifest: Manifest) -> Manifest:
+    """
+    Checks the manifest has rows, each with a unique id.
+    :return: Manifest, the same manifest.
+    """
+    if not len(manifest):
+        raise _manifest_error(path, "has no rows")
+
+    ids, counts = np.unique(np.asarray(manifest.ids), return_counts=True)
+    if (counts > 1).any():
+        raise _manifest_error(path, f"has {int((counts > 1).sum())} duplicated id(s), e.g. {ids[counts > 1][:_REPORTED_ROWS].tolist()}")
+
+    return manifest
+
+
+def manifest_from_rows(rows: List[Tuple[int, float, float]], name: str = "rows") -> Manifest:
+    """
+    Builds a manifest from rows that are already in memory, e.g. those sent with a job, validated in the same way as a
+    loaded manifest.
+    :param List[Tuple[int, float, float]] rows: The (id, diameter, weight) of each cylinder.
+    :param str name: What the rows are called in any error.
+    :return: Manifest
+    """
+    if any(len(row) != len(MANIFEST_COLUMNS) for row in rows):
+        raise _manifest_error(name, f"needs {len(MANIFEST_COLUMNS)} values {list(MANIFEST_COLUMNS)} in every row")
+
+    columns = _columns(name, 1, rows) if rows else (np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0))
+    _validate(name, 1, *columns[1:])
+
+    return _check_ids(name, Manifest(*columns))
+
+
+# The readers of the manifests streamed from text, by their extension.
+_READERS = {".csv": _read_csv, ".jsonl": _read_jsonl}
+
+
+def load_manifest(path: str) -> Manifest:
+    """
+    Loads a shipment's manifest of cylinders, by its extension: ".csv" (with a header naming the id, diameter and
+    weight columns), ".jsonl" (an object per line with those keys) or ".npy" (memory mapped). Text is streamed a
+    batch of rows at a time, with each batch validated as it's read, so every row never exists as Python objects at
+    once. Every diameter and weight must be a finite, positive number, and every id unique.
+    :param str path: The manifest.
+    :return: Manifest, which can be passed to run_ga() in place of a list of cylinders.
+    """
+    extension = splitext(path)[1].lower()
+
+    if extension == ".npy":
+        manifest = _load_npy(path)
+
+    elif extension in _READERS:
+        columns: Dict[str, List[np.ndarray]] = {column: [] for column in MANIFEST_COLUMNS}
+
+        for first_row, rows in _READERS[extension](path):
+            batch = _columns(path, first_row, rows)
+            _validate(path, first_row, *batch[1:])
+
+            for column, values in zip(MANIFEST_COLUMNS, batch):
+                columns[column].append(values)
+
+        manifest = Manifest(*(np.concatenate(values) if values else np.zeros(0) for values in columns.values()))
+
+    else:
+        raise _manifest_error(path, f"has an unknown extension '{extension}', use one of ['.csv', '.jsonl', '.npy']")
+
+    return _check_ids(path, manifest)
+
+
+if __name__ == "__main__":
+    from synthetic import synthetic_instance
+    from time import perf_counter
+    import os
+
+    _, _cylinders = synthetic_instance(50_000, distribution="uniform")
+    _path = "_manifest_example.csv"
+
+    with open(_path, 'w', newline='') as _file:
+        _writer = csv.writer(_file)
+        _writer.writerow(MANIFEST_COLUMNS)
+        _writer.writerows((_cylinder.id, _cylinder.diameter, _cylinder.weight) for _cylinder in _cylinders)
+
+    _start = perf_counter()
+    _manifest = load_manifest(_path)
+    os.remove(_path)
+
+    print(f"Loaded {len(_manifest)} cylinders in {perf_counter() - _start:.2f}s, weighing {_manifest.weights.sum():.1f} in total")
@@ -0,0 +1,151 @@
+from utils import RowSets
+import numpy as np
+
+# The number of allowed positions batch_mutate_feasible() draws for each position number before checking all of them,
+# and the most elements it compares at once when it does (of position numbers by positions by cylinders).
+_FEASIBLE_DRAWS = 8
+_CHUNK_ELEMENTS = 1 << 22
+
+
+def batch_mutate(genomes: np.ndarray, lengths: np.ndarray, mutation_rate: float, cylinder_sides: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Applies the replacement mutation of Population.mutate() to every position string at once. Each position number
+    (at index i) is replaced, at the mutation rate, by a number in the range (i + 1) * cylinder_sides that isn't
+    already within its position string.
+    Rather than building the set of allowed numbers for each mutated position number, the nth allowed number is found
+    directly from the sorted numbers of each position string, where n is drawn uniformly from how many are allowed.
+    :param np.ndarray genomes: (groups, width) the position strings, padded to the width of the matrix.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :param float mutation_rate: The chance of each position number being mutated.
+    :param int cylinder_sides: The number of sides each cylinder has.
+    :param np.random.Generator rng: The generator the mutations are drawn from.
+    :return: np.ndarray, the potentially mutated position strings.
+    """
+    valid = np.arange(genomes.shape[1]) < lengths[:, None]
+    rows, columns = np.nonzero(valid & (rng.random(genomes.shape) < mutation_rate))
+
+    # The numbers already within each position string, before any of them are mutated.
+    existing = RowSets(genomes, valid)
+
+    limits = (columns + 1) * cylinder_sides
+    allowed = limits - existing.count_below(rows, limits)
+
+    # A position number with no allowed replacement is left as it is.
+    rows, columns, allowed = rows[allowed > 0], columns[allowed > 0], allowed[allowed > 0]
+    ranks = (rng.random(len(rows)) * allowed).astype(np.int64)
+
+    mutated = genomes.copy()
+    mutated[rows, columns] = existing.nth_missing(rows, ranks)
+
+    return mutated
+
+
+def reference_parents(offspring: np.ndarray, lengths: np.ndarray, genomes: np.ndarray, parents: np.ndarray) -> np.ndarray:
+    """
+    Finds the parent each offspring shares the most position numbers with, in the same places.
+    :param np.ndarray offspring: (offspring, width) the position strings of the offspring.
+    :param np.ndarray lengths: (offspring,) the length of each of their position strings.
+    :param np.ndarray genomes: (groups, width) the position strings of the parents' generation.
+    :param np.ndarray parents: (offspring, 2) the indices of the pair of groups each offspring was made from.
+    :return: np.ndarray, (offspring,) the index of each offspring's closest parent.
+    """
+    valid = np.arange(offspring.shape[1]) < lengths[:, None]
+    shared = ((offspring[:, None] == genomes[parents]) & valid[:, None]).sum(axis=2)
+
+    return parents[np.arange(len(parents)), shared.argmax(axis=1)]
+
+
+def _feasible(centres: np.ndarray, rows: np.ndarray, cylinders: np.ndarray, candidates: np.ndarray, cylinder_sides: int, radii: np.ndarray,
+              unit_vectors: np.ndarray, container_width: float, container_height: float) -> np.ndarray:
+    """
+    Checks whether placing each cylinder at each of its candidate positions would be feasible, in the same way as the
+    decoder: within the container, and not intersecting any cylinder before it.
+    :return: np.ndarray, of the same shape as candidates, (rows, candidates).
+    """
+    targets = candidates // cylinder_sides
+    radius = radii[cylinders, None]
+    target_centres = centres[rows[:, None], targets]
+    x_diff = (target_centres[..., 0] + radii[targets]) + radius - target_centres[..., 0]
+    xs = target_centres[..., 0] + x_diff * unit_vectors[candidates % cylinder_sides, 0]
+    ys = target_centres[..., 1] + x_diff * unit_vectors[candidates % cylinder_sides, 1]
+
+    feasible = (xs - radius >= 0) & (xs + radius <= container_width) & (ys - radius >= 0) & (ys + radius <= container_height)
+
+    x_gap = centres[rows, None, :, 0] - xs[..., None]
+    y_gap = centres[rows, None, :, 1] - ys[..., None]
+    before = np.arange(centres.shape[1]) < cylinders[:, None, None]
+
+    return feasible & ~(before & ((x_gap * x_gap + y_gap * y_gap) < np.square(radii + radius[..., None] - .01))).any(axis=2)
+
+
+def batch_mutate_feasible(genomes: np.ndarray, lengths: np.ndarray, mutation_rate: float, cylinder_sides: int, rng: np.random.Generator,
+                          centres: np.ndarray, radii: np.ndarray, unit_vectors: np.ndarray, container_width: float, container_height: float) -> np.ndarray:
+    """
+    A replacement mutation like batch_mutate(), that only picks replacements at positions which would be feasible
+    given the placements of a decoded reference (usually a parent of each position string). A position is feasible
+    if the cylinder it places would be within the container, and wouldn't intersect any cylinder placed before it,
+    using the same checks as the decoder. Where no allowed position is feasible, any allowed position is picked.
+    Allowed positions are drawn and checked one at a time for a few rounds, and only the position numbers still
+    without a feasible replacement check every one of their positions.
+    :param np.ndarray genomes: (groups, width) the position strings, padded to the width of the matrix.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :param float mutation_rate: The chance of each position number being mutated.
+    :param int cylinder_sides: The number of sides each cylinder has.
+    :param np.random.Generator rng: The generator the mutations are drawn from.
+    :param np.ndarray centres: (groups, cylinders, 2) the decoded centres of each position string's reference.
+    :param np.ndarray radii: (cylinders,) the radius of each cylinder, in the order they are placed.
+    :param np.ndarray unit_vectors: (cylinder_sides, 2) the direction of each side of a cylinder.
+    :param float container_width: The width of the container.
+    :param float container_height: The height of the container.
+    :return: np.ndarray, the potentially mutated position strings.
+    """
+    valid = np.arange(genomes.shape[1]) < lengths[:, None]
+    rows, columns = np.nonzero(valid & (rng.random(genomes.shape) < mutation_rate))
+    existing = RowSets(genomes, valid)
+    geometry = (cylinder_sides, radii, unit_vectors, container_width, container_height)
+
+    # A position number with no allowed replacement is left as it is.
+    max_positions = (columns + 1) * cylinder_sides
+    allowed = max_positions - existing.count_below(rows, max_positions)
+    rows, columns, max_positions, allowed = rows[allowed > 0], columns[allowed > 0], max_positions[allowed > 0], allowed[allowed > 0]
+
+    mutated = genomes.copy()
+
+    # - Draw allowed positions until each is feasible, i.e. uniformly from those that are both - #
+    pending = np.arange(len(rows))
+    for _ in range(_FEASIBLE_DRAWS):
+        candidates = existing.nth_missing(rows[pending], (rng.random(len(pending)) * allowed[pending]).astype(np.int64))
+        feasible = _feasible(centres, rows[pending], columns[pending] + 1, candidates[:, None], *geometry)[:, 0]
+
+        mutated[rows[pending[feasible]], columns[pending[feasible]]] = candidates[feasible]
+        pending = pending[~feasible]
+
+    # - Check every position of those left, in chunks that bound the memory used - #
+    chunk_size = max(1, _CHUNK_ELEMENTS // (genomes.shape[1] * cylinder_sides * centres.shape[1]))
+    for low in range(0, len(pending), chunk_size):
+        chunk = pending[low:low + chunk_size]
+
+        candidates = np.arange(int(max_positions[chunk].max()))
+        feasible = (candidates < max_positions[chunk, None]) & \
+            _feasible(centres, rows[chunk], columns[chunk] + 1, np.broadcast_to(candidates, (len(chunk), len(candidates))), *geometry) & \
+            ~existing.contains(np.broadcast_to(rows[chunk, None], (len(chunk), len(candidates))), np.broadcast_to(candidates, (len(chunk), len(candidates))))
+
+        keys = np.where(feasible, rng.random(feasible.shape), -1.)
+        found = keys.max(axis=1) >= 0
+        mutated[rows[chunk[found]], columns[chunk[found]]] = keys[found].argmax(axis=1)
+
+        # Those without a feasible position fall back to any allowed position.
+        chunk = chunk[~found]
+        mutated[rows[chunk], columns[chunk]] = existing.nth_missing(rows[chunk], (rng.random(len(chunk)) * allowed[chunk]).astype(np.int64))
+
+    return mutated
+
+
+if __name__ == "__main__":
+    _genomes = np.array([[3, 0, 7, 1, 12], [2, 5, 9, 0, 0]])
+    _lengths = np.array([5, 3])
+
+    print(
+        f"Position strings:\t{_genomes.tolist()}\n"
+        f"Mutated (rate 0.5):\t{batch_mutate(_genomes, _lengths, .5, 4, np.random.default_rng(0)).tolist()}\n"
+    )
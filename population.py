@@ -1,17 +1,39 @@
-from cylinders import Cylinder, BasicGroup, CylinderGroup
-from canvas import AnimatedContainer, Container, FuncAnimation
-from event_manager import EventManager
-from utils import get_random_indices
-from config import SLIDE_ANIMATION, CYLINDER_TYPES, FRAMES_PER_PATCH, MANUAL_FLICK
-from numpy import array, ndarray
+from cylinders import Cylinder, BasicGroup
+from population_store import PopulationStore, GroupView
+from decoder import BatchDecoder
+from decode_cache import DecodeCache
+from decode_checkpoints import CheckpointStore
+from stopping import StoppingCriteria
+from profiler import PhaseProfiler
+from selection import SelectionEngine
+from checkpoint import Checkpointer, random_state, restore_random_state
+from telemetry import TelemetryWriter
+from history import HistoryRecorder
+from bin_packing import assign_bins
+from manifest import Manifest
+from initialisers import INITIALISERS, initial_genomes, load_archive
+from mutation import batch_mutate, batch_mutate_feasible, reference_parents
+from utils import cprint
+from config import SLIDE_ANIMATION, CYLINDER_TYPES, FRAMES_PER_PATCH, MANUAL_FLICK, DECODE_WORKERS, DECODE_CACHE_SIZE, RESUME_DECODES, PROFILE_PHASES, BIN_PACKING, SELECTION_METHOD, MUTATION_MODE, CROSSOVER_METHOD, MULTI_POINT_CROSSOVERS, INITIALISER, SEEDED_FRACTION, INITIAL_ARCHIVE, TIME_TO_TARGET, TARGET_FITNESS
+from numpy import ndarray, array, argsort, bincount, cumsum
+from numpy.random import default_rng, Generator
 from crossovers import *
-from re import sub
+from json import dumps, loads
+from time import perf_counter
 
-from typing import List, Tuple, Union, Dict
-from matplotlib.pyplot import Figure, Axes
+from typing import List, Sequence, Tuple, Union, Dict, TYPE_CHECKING
 
 import random
 
+# The visualisation is only imported when it's used, so a headless run never imports matplotlib.
+if TYPE_CHECKING:
+    from canvas import FuncAnimation
+    from event_manager import EventManager
+    from matplotlib.pyplot import Figure, Axes
+
+# The most bins whose cylinders are printed once they're packed, so large manifests don't flood the output.
+_PRINTED_BINS = 20
+
 
 class Bin:
     def __init__(self, max_weight: float):
@@ -52,6 +74,46 @@ class Bin:
         return False
 
 
+class ManifestBin(Bin):
+    """A bin of a manifest's rows, whose cylinders are only created the first time they're needed, e.g. once it's evolved."""
+
+    def __init__(self, max_weight: float, rows: Manifest, cylinder_sides: int):
+        super().__init__(max_weight)
+        self.__rows = rows
+        self.__cylinder_sides = cylinder_sides
+        self.__cylinders: List[Cylinder] | None = None
+        self.__weight = sum(rows.weights.tolist())  # summed in the same order as Bin.add() would
+
+    def __str__(self):
+        return '\n'.join([str(cylinder) for cylinder in self.cylinders])
+
+    @property
+    def cylinders(self) -> List[Cylinder]:
+        if self.__cylinders is None:
+            self.__cylinders = self.__rows.cylinders(self.__cylinder_sides)
+
+        return self.__cylinders
+
+    @property
+    def weight(self) -> float:
+        return self.__weight
+
+    def size(self) -> int:
+        return len(self.__rows) if self.__cylinders is None else len(self.__cylinders)
+
+    def add(self, cylinder: Cylinder) -> bool:
+        """
+        Adds a cylinder to the bin
+        :return: True, if cylinder can fit in the bin, False otherwise.
+        """
+        if self.__weight + cylinder.weight <= self.max_weight:
+            self.cylinders.append(cylinder)
+            self.__weight += cylinder.weight
+            return True
+
+        return False
+
+
 class Bins:
     def __init__(self, max_weight: float):
         self.__max_weight = max_weight
@@ -84,63 +146,241 @@ class Bins:
         self.__bins[-1].add(cylinder)
         self.__total_bins += 1
 
+    def pack_cylinders(self, cylinders: List[Cylinder], method: str = BIN_PACKING) -> None:
+        """
+        Packs every cylinder, in the order given, into a new set of bins. Each bin is found through an index of the
+        bins' loads rather than by checking every bin, so "first fit" packs the same bins as pack_cylinder_ff() would.
+        :param List[Cylinder] cylinders: The cylinders to pack.
+        :param str method: Either "first fit" (the first bin with room) or "best fit" (the fullest bin with room).
+        :return: None
+        """
+        assignments = assign_bins([cylinder.weight for cylinder in cylinders], self.__max_weight, method)
+
+        self.__bins = [Bin(self.__max_weight) for _ in range(max(assignments + [0]) + 1)]
+        self.__total_bins = len(self.__bins)
+
+        for cylinder, bin_index in zip(cylinders, assignments):
+            if bin_index != -1:  # the cylinder is discarded when it's heavier than a bin's maximum capacity
+                self.__bins[bin_index].add(cylinder)
+
+    def pack_manifest(self, manifest: Manifest, cylinder_sides: int, method: str = BIN_PACKING) -> None:
+        """
+        Packs every row of a manifest, in the order given, into a new set of bins, in the same way as pack_cylinders(),
+        but straight from the manifest's weights. Each bin holds its rows, so its cylinders are only created once needed.
+        :param Manifest manifest: The cylinders to pack.
+        :param int cylinder_sides: The number of sides each cylinder's polygon has.
+        :param str method: Either "first fit" (the first bin with room) or "best fit" (the fullest bin with room).
+        :return: None
+        """
+        assignments = array(assign_bins(manifest.weights.tolist(), self.__max_weight, method))
+        self.__total_bins = int(assignments.max()) + 1 if assignments.max() >= 0 else 1
+
+        # The rows of each bin, in their order within the manifest, with the discarded rows (-1) before them.
+        order = argsort(assignments, kind="stable")
+        bounds = cumsum(bincount(assignments + 1, minlength=self.__total_bins + 1))
+
+        self.__bins = [ManifestBin(self.__max_weight, manifest.take(order[bounds[i]:bounds[i + 1]]), cylinder_sides) for i in range(self.__total_bins)]
+
 
 class Population:
     """Manages a population of individuals and evolutionary operations inside a container."""
 
-    def __init__(self, size: int, cylinders: List[Cylinder], num_cylinders: int, mutation_rate: float, cylinder_sides: int, max_weight: float):
+    def __init__(self, size: int, cylinders: List[Cylinder] | Manifest, num_cylinders: int, mutation_rate: float, cylinder_sides: int, max_weight: float,
+                 *, selection: str = SELECTION_METHOD, crossover: str = CROSSOVER_METHOD, mutation: str = MUTATION_MODE, packing: str = BIN_PACKING, decode_workers: int = DECODE_WORKERS,
+                 cache_size: int = DECODE_CACHE_SIZE, resume_decodes: bool = RESUME_DECODES, profiler: PhaseProfiler | None = None,
+                 checkpointer: Checkpointer | None = None, telemetry: TelemetryWriter | None = None, initialiser: str = INITIALISER,
+                 seeded_fraction: float = SEEDED_FRACTION, archive: Sequence[str] = INITIAL_ARCHIVE, target_fitness: float | None = TIME_TO_TARGET,
+                 verbose: bool = True):
         self.__size = size
+        self.__verbose = verbose  # Whether to print the progress of the evolution.
         self.__mutation_rate = mutation_rate
+        self.__mutation_mode = ""
         self.__cylinder_sides = cylinder_sides
         self.__max_weight = max_weight
-        self.__population = []
+        self.__population: List[GroupView] = []
+        self.__store: PopulationStore | None = None  # Holds the groups of the bin in focus as arrays.
         self.__bins = Bins(max_weight)
+        self.__packing = packing  # How the cylinders are packed into bins, by bin_cylinders().
 
         self.__generations = 0
+        self.__decodes = 0  # The number of position strings decoded for the bin in focus.
+        self.__stop_reason = ""  # Why the evolution of the bin in focus stopped.
+
+        # The positions tried by the decoder for the bin in focus, and how many of them were infeasible.
+        self.__positions_tried = 0
+        self.__positions_rejected = 0
         self.__best_cylinder_group: BasicGroup | None = None
+        self.__best_fitness = 0.  # The fitness of the best cylinder group, so its COM is only computed when it changes.
+
+        # The generations that improved the best cylinder group of the bin in focus: [(generation, fitness, centres)]
+        self.__history = HistoryRecorder()
+
+        # The placements each bin's evolution starts from, e.g. found by an earlier run: {bin: (fitness, [[diameter, weight, x, y]])}
+        self.__warm_starts: Dict[int, Tuple[float, List[List[float]]]] = {}
+
+        # - Initialisation - #
+        # How the first generation of each bin is created, from the placements of earlier runs within the archive if any.
+        if initialiser not in INITIALISERS:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown initialiser '{initialiser}', use one of {list(INITIALISERS)}\033[0m")
+
+        self.__initialiser = initialiser
+        self.__seeded_fraction = seeded_fraction
+        self.__archive = load_archive(archive) if initialiser in ("archive", "mixed") else []
+        self.__initialisation: Dict = {}  # how the first generation of the bin in focus was created
+
+        # The fitness whose time to reach is reported, when the bin in focus started, and the generation and seconds at
+        # which its best fitness first reached the target.
+        self.__target_fitness = target_fitness if target_fitness is not None else TARGET_FITNESS
+        self.__bin_start = 0.
+        self.__time_to_target: Tuple[int, float] | None = None
 
         # - Initialise cylinders - #
         self.__cylinders = cylinders
 
+        # A manifest is kept as its columns, ordered in the same way, with its cylinders created once they're binned.
+        if isinstance(cylinders, Manifest):
+            self.__cylinders = cylinders.sorted_by_weight()
+            cprint(verbose, f"+-----------\tLoaded {len(cylinders)} cylinders from a manifest\t-----------+")
+
         # Check whether a list of cylinders has been passed through
-        if not cylinders:
+        elif not cylinders:
             # Get a random selection of different cylinder types and save them as objects
             self.__cylinders = [Cylinder(cylinder_sides, diameter, weight) for weight, diameter in random.choices(CYLINDER_TYPES, k=num_cylinders)]
 
-        # Sorts the cylinders in descending order based on size (weight)
-        self.__cylinders = sorted(self.__cylinders, reverse=True, key=lambda x: x.weight)
+        if not isinstance(self.__cylinders, Manifest):
+            # Sorts the cylinders in descending order based on size (weight)
+            self.__cylinders = sorted(self.__cylinders, reverse=True, key=lambda x: x.weight)
 
-        print("+-----------\tInitialised cylinders\t-----------+")
-        for cylinder in self.__cylinders: print(cylinder)
+            cprint(verbose, "+-----------\tInitialised cylinders\t-----------+")
+            for cylinder in self.__cylinders: cprint(verbose, cylinder)
 
         self.__containers = []
         self.__container_width = -1.
         self.__container_height = -1.
 
-        # Keeps a track of the selection and crossover that was called within evolve() : mainly for get_summary()
+        self.__decoder: BatchDecoder | None = None  # Created once the container's dimensions are known.
+        self.__decode_workers = decode_workers
+        self.__decode_cache = DecodeCache(cache_size) if cache_size else None
+        self.__resume_decodes = resume_decodes
+        self.__decode_checkpoints: CheckpointStore | None = None  # The partial decodes of the bin in focus' last generation.
+
+        # Times each phase of a generation, for the bin in focus.
+        self.__profiler = profiler or PhaseProfiler(enabled=PROFILE_PHASES)
+
+        # Writes a checkpoint of the bin in focus every few generations, if any.
+        self.__checkpointer = checkpointer
+
+        # Streams a record of every generation, if any.
+        self.__telemetry = telemetry
+
+        # The selection and crossover used by evolve(), and the crossover that was called within it : mainly for get_summary()
         self.__selection_method = ""
+        self.__crossover = ""
         self.__crossover_method = ""
+        self.set_operators(selection, crossover, mutation)
+
+        # Selects, crosses over and mutates the parents of each generation, using a generator seeded from the random
+        # module per bin.
+        self.__rng: Generator | None = None
+        self.__selection: SelectionEngine | None = None
+
+    def __getstate__(self) -> Dict:
+        """
+        Leaves out the containers (and any groups) when pickling, so a population can be sent to a worker process.
+        :return: Dict
+        """
+        state = self.__dict__.copy()
+        state["_Population__containers"] = []
+        state["_Population__population"] = []
+        state["_Population__store"] = None
+        state["_Population__decode_checkpoints"] = None
+        state["_Population__selection"] = None
+        state["_Population__checkpointer"] = None
+        state["_Population__telemetry"] = None
+
+        return state
+
+    @property
+    def size(self) -> int:
+        return self.__size
 
     @property
     def bins(self) -> Bins:
         return self.__bins
 
+    @property
+    def decode_cache(self) -> DecodeCache | None:
+        return self.__decode_cache
+
+    @property
+    def fitnesses(self) -> ndarray:
+        """The fitness of each group in the generation last decoded, as a read-only array."""
+        return self.__store.fitnesses
+
+    @property
+    def key_generations(self) -> List[Tuple[int, float, List[Tuple[float, float]]]]:
+        return self.__history.key_generations
+
+    @property
+    def best_fitness(self) -> float:
+        return self.__best_fitness
+
+    def set_operators(self, selection: str | None = None, crossover: str | None = None, mutation: str | None = None) -> None:
+        """
+        Sets the operators evolve() uses, e.g. so each island of an IslandModel can use its own.
+        :param str | None selection: How the parents of each generation are selected, e.g. "tournament".
+        :param str | None crossover: How the parents are crossed over: "single point", "multi point", "uniform" or
+        "davis order".
+        :param str | None mutation: How mutated position numbers are replaced, either "uniform" or "feasible".
+        :return: None
+        """
+        if crossover is not None and crossover not in ("single point", "multi point", "uniform", "davis order"):
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown crossover method '{crossover}', use one of 'single point', 'multi point', 'uniform' or 'davis order'\033[0m")
+
+        if mutation is not None and mutation not in ("uniform", "feasible"):
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown mutation mode '{mutation}', use either 'uniform' or 'feasible'\033[0m")
+
+        self.__selection_method = selection or self.__selection_method
+        self.__crossover = crossover or self.__crossover
+        self.__mutation_mode = mutation or self.__mutation_mode
+
     def bin_cylinders(self) -> None:
         """
-        Groups cylinders into different bins using first fit bin packing, based on their weight.
+        Groups cylinders into different bins, heaviest first, using first fit or best fit bin packing based on their
+        weight.
         :return: None
         """
-        for cylinder in self.__cylinders:
-            self.__bins.pack_cylinder_ff(cylinder)
+        if isinstance(self.__cylinders, Manifest):
+            self.__bins.pack_manifest(self.__cylinders, self.__cylinder_sides, self.__packing)
+        else:
+            self.__bins.pack_cylinders(self.__cylinders, self.__packing)
 
         if not self.__bins.bins[0].cylinders:  # if no cylinders could be packed.
             raise Exception(f"\r\033[1m\033[31mCustom Exception: No cylinder can be packed with a maximum weight limit of: {self.__max_weight}\033[0m")
 
+        if not self.__verbose:
+            return
+
         print(f"\nCylinders have been packed into the following bins:")
-        for i, binn in enumerate(self.__bins.bins):
+        for i, binn in enumerate(self.__bins.bins[:_PRINTED_BINS]):
             print(f"\t\033[4mBin {i}\033[0m\n\t\t- {'\n\t\t- '.join([cylinder for cylinder in str(binn).split('\n')])}")
 
-    def create_containers(self, fig: Figure, ax: Union[Axes, ndarray[Axes]], event_manager: EventManager,
+        if self.__bins.total > _PRINTED_BINS:
+            print(f"\t... and {self.__bins.total - _PRINTED_BINS} more bins")
+
+    def set_dimensions(self, container_width: float, container_height: float) -> None:
+        """
+        Sets the dimensions of the container every bin is packed into. This is done by create_containers(), so it only
+        needs to be called directly when evolving without any visualisation.
+        :param float container_width: The width of the container.
+        :param float container_height: The height of the container.
+        :return: None
+        """
+        self.__container_width = container_width
+        self.__container_height = container_height
+        self.__decoder = BatchDecoder(self.__cylinder_sides, container_width, container_height, workers=self.__decode_workers)
+
+    def create_containers(self, fig: "Figure", ax: Union["Axes", ndarray], event_manager: "EventManager",
                           container_width: float, container_height: float, fpp: int = FRAMES_PER_PATCH) -> None:
         """
         Create a container visualisation object for each possible bin.
@@ -152,8 +392,9 @@ class Population:
         :param int fpp: The frames per patch for the animation within each container.
         :return: None
         """
-        self.__container_width = container_width
-        self.__container_height = container_height
+        from canvas import AnimatedContainer, Container
+
+        self.set_dimensions(container_width, container_height)
 
         if not SLIDE_ANIMATION:
             fpp = 1
@@ -171,11 +412,28 @@ class Population:
 
             self.__containers.append(AnimatedContainer(fpp, fig, ax[i], event_manager, container_width, container_height))
 
-    def generate_groups(self, bin_focus: int = 0) -> int:
+    def shutdown(self) -> None:
         """
-        Generates the initial groups, containing random position strings, for the population.
+        Releases any worker processes that were started to decode the population.
+        :return: None
+        """
+        if self.__decoder is not None:
+            self.__decoder.shutdown()
+
+    def needs_evolution(self, bin_focus: int = 0) -> bool:
+        """
+        Checks whether a bin needs to be evolved, which isn't the case for a bin with a singular cylinder (unless it's
+        the only bin), as it's drawn statically.
         :param int bin_focus: The bin of cylinders to focus on.
-        :return: int, 0 --> if there's no evolution that needs to take place, 1 --> if there is.
+        :return: bool
+        """
+        return self.__bins.total == 1 or self.__bins.bins[bin_focus].size() != 1
+
+    def __prepare_best_group(self, bin_focus: int) -> None:
+        """
+        Creates the best cylinder group of a bin, and hands it to the bin's container when there is one.
+        :param int bin_focus: The bin of cylinders to focus on.
+        :return: None
         """
         focussed_bin = self.__bins.bins[bin_focus]
 
@@ -184,101 +442,176 @@ class Population:
             [cylinder.__class__(sides=self.__cylinder_sides, diameter=cylinder.diameter, weight=cylinder.weight, id_=cylinder.id) for cylinder in focussed_bin.cylinders],
             focussed_bin.size(), self.__cylinder_sides, self.__container_width, self.__container_height
         )
+        self.__best_fitness = self.__best_cylinder_group.fitness()
 
-        self.__containers[bin_focus].best_cylinder_group = self.__best_cylinder_group
-        self.__containers[bin_focus].add_cylinders()
+        if self.__containers:
+            self.__containers[bin_focus].best_cylinder_group = self.__best_cylinder_group
+            self.__containers[bin_focus].add_cylinders()
 
-        if type(self.__containers[bin_focus]) is Container:  # checks if this bin is static, i.e. only one cylinder exists
-            # if static then draw the cylinders statically
-            self.__containers[bin_focus].draw()
-            self.__containers[bin_focus].update_title("No evolution needed for singular cylinder.")
+    def __place(self, placement: List[List[float]]) -> None:
+        """
+        Moves the cylinders of the best cylinder group to a placement of the same cylinders, matched by their diameter
+        and weight, as cylinders that share both are interchangeable whatever their ids or order.
+        :param List[List[float]] placement: The [diameter, weight, x, y] of each cylinder.
+        :return: None
+        """
+        centres: Dict[Tuple[float, float], List[Tuple[float, float]]] = {}
+        for diameter, weight, x, y in placement:
+            centres.setdefault((diameter, weight), []).append((x, y))
+
+        for cylinder in self.__best_cylinder_group.cylinders:
+            cylinder.centre = centres[(cylinder.diameter, cylinder.weight)].pop(0)
+
+        self.__best_fitness = self.__best_cylinder_group.fitness()
+        self.__history.record(self.__generations, self.__best_fitness, [cylinder.centre for cylinder in self.__best_cylinder_group.cylinders])
+        self.__check_target()
+
+    def __check_target(self) -> None:
+        """
+        Records the generation and the seconds since the bin in focus started at which its best fitness first reached the
+        target fitness, if there is one.
+        :return: None
+        """
+        if self.__target_fitness is not None and self.__time_to_target is None and self.__best_fitness >= self.__target_fitness:
+            self.__time_to_target = (self.__generations, perf_counter() - self.__bin_start)
+
+    def set_warm_start(self, bin_focus: int, placement: List[List[float]], fitness: float) -> None:
+        """
+        Sets a placement of a bin's cylinders (e.g. from a ResultCache) that its evolution starts from. It's rebuilt as
+        the first group of generation 0, and is the best cylinder group until a generation's best group is fitter.
+        :param int bin_focus: The bin of cylinders.
+        :param List[List[float]] placement: The [diameter, weight, x, y] of each of the bin's cylinders.
+        :param float fitness: The fitness of the placement.
+        :return: None
+        """
+        self.__warm_starts[bin_focus] = (fitness, placement)
+
+    def load_placement(self, bin_focus: int, placement: List[List[float]]) -> None:
+        """
+        Loads a placement of a bin's cylinders (e.g. from a ResultCache) in place of evolving the bin, so its summary
+        and visualisation show that placement.
+        :param int bin_focus: The bin of cylinders.
+        :param List[List[float]] placement: The [diameter, weight, x, y] of each of the bin's cylinders.
+        :return: None
+        """
+        self.__reset_bin(bin_focus)
+        self.__place(placement)
+        self.__stop_reason = "Cached"
 
-            # Log this
-            cylinder = self.__containers[bin_focus].cylinder_patches[0]
-            print(f"# {'-' * 26} \033[1mRecorded data for Bin {bin_focus}\033[0m {'-' * 26} #")
-            print(f"{cylinder}:\n\t- Centre history:\t{cylinder.centre}\n\t- Increments:\n")
+    def __reset_bin(self, bin_focus: int) -> None:
+        """
+        Resets everything recorded about the bin in focus, and prepares its best cylinder group.
+        :param int bin_focus: The bin of cylinders to focus on.
+        :return: None
+        """
+        # Each bin is evolved from its own generation 0, and is timed from here, so its time to target includes the time
+        # taken to create its first generation.
+        self.__bin_start = perf_counter()
+        self.__time_to_target = None
+        self.__initialisation = {}
+        self.__generations = 0
+        self.__decodes = 0
+        self.__stop_reason = ""
+        self.__positions_tried = 0
+        self.__positions_rejected = 0
+        self.__history = HistoryRecorder()
+        self.__decode_checkpoints = CheckpointStore() if self.__resume_decodes else None
+        self.__profiler.reset()
+        self.__prepare_best_group(bin_focus)
+
+    def generate_groups(self, bin_focus: int = 0) -> int:
+        """
+        Generates the initial groups for the population, whose position strings are created by its initialiser.
+        :param int bin_focus: The bin of cylinders to focus on.
+        :return: int, 0 --> if there's no evolution that needs to take place, 1 --> if there is.
+        """
+        focussed_bin = self.__bins.bins[bin_focus]
+        self.__reset_bin(bin_focus)
+
+        if not self.needs_evolution(bin_focus):  # checks if this bin is static, i.e. only one cylinder exists
+            if self.__containers:
+                # if static then draw the cylinders statically
+                self.__containers[bin_focus].draw()
+                self.__containers[bin_focus].update_title("No evolution needed for singular cylinder.")
+
+                # Log this
+                cylinder = self.__containers[bin_focus].cylinder_patches[0]
+                print(f"# {'-' * 26} \033[1mRecorded data for Bin {bin_focus}\033[0m {'-' * 26} #")
+                print(f"{cylinder}:\n\t- Centre history:\t{cylinder.centre}\n\t- Increments:\n")
 
             return 0
 
-        # Need to create clones of each Cylinder, instead of taking focussed_bin's cylinder as it will take a reference
-        # of each class, thus essentially sharing the same cylinder's amongst each group, instead of having their own.
-        self.__population = [
-            CylinderGroup(
-                [cylinder.__class__(sides=self.__cylinder_sides, diameter=cylinder.diameter, weight=cylinder.weight, id_=cylinder.id) for cylinder in focussed_bin.cylinders],
-                focussed_bin.size(), self.__cylinder_sides, self.__container_width, self.__container_height
-            ) for _ in range(self.__size)
-        ]
+        initialisation_start = perf_counter()
+
+        # A warm start's placement heads the archive, so it's rebuilt as the first group and the population evolves from it.
+        warm_start = self.__warm_starts.get(bin_focus)
+        archive = self.__archive if warm_start is None else [warm_start, *self.__archive]
+        genomes, counts = initial_genomes(self.__initialiser, self.__size, focussed_bin.cylinders, self.__cylinder_sides,
+                                          self.__container_width, self.__container_height, archive, self.__seeded_fraction)
+
+        # Each group is a view of the store, which holds every position string and decoded placement as arrays,
+        # instead of each group owning its own clone of every Cylinder.
+        self.__store = PopulationStore(self.__size, focussed_bin.cylinders, self.__cylinder_sides, self.__container_width, self.__container_height, genomes)
+        self.__initialisation = {"Method": self.__initialiser, **counts, "Warm Start": warm_start is not None, "Seconds": perf_counter() - initialisation_start}
+        self.__population = self.__store.views
+
+        sample = random.sample(self.__population, k=3)  # always drawn, so a quiet run evolves the same way
+        cprint(self.__verbose, f"\nSample of population: {sample}\n")
+
+        self.__rng = default_rng(random.getrandbits(64))
 
-        print(f"\nSample of population: {random.sample(self.__population, k=3)}\n")
+        if warm_start is not None:
+            self.__place(warm_start[1])
 
         return 1
 
-    def tournament_selection(self, k: int = 3) -> CylinderGroup:
+    def tournament_selection(self, k: int = 3) -> GroupView:
         """
         Select a cylinder group using tournament selection.
         :param int k: The size of the selection.
-        :return: CylinderGroup
+        :return: GroupView
         """
-        self.__selection_method = "tournament"
-
         # Randomly select k cylinder groups and return the one with the highest fitness
-        return max(random.sample(self.__population, k), key=lambda x: x.fitness())
+        return self.__population[self.__selection.tournament(1, k)[0]]
 
     def get_normalised_fitness(self) -> ndarray:
         """
         Get an array of normalised fitnesses from the population
         :return: ndarray
         """
-        fitnesses = array([group.fitness() for group in self.__population])
-        return fitnesses / sum(fitnesses)
+        return self.__store.fitnesses / self.__store.fitnesses.sum()
 
-    def roulette_wheel_selection(self) -> CylinderGroup:
+    def roulette_wheel_selection(self) -> GroupView:
         """
         Perform roulette wheel selection to select a cylinder group.
-        :return: CylinderGroup
+        :return: GroupView
         """
-        self.__selection_method = "roulette wheel"
-
-        return self.__population[
-            get_random_indices(self.get_normalised_fitness())[0]
-        ]
+        return self.__population[self.__selection.roulette_wheel(1)[0]]
 
-    def stochastic_universal_sampling(self) -> Tuple[CylinderGroup, CylinderGroup]:
+    def stochastic_universal_sampling(self) -> Tuple[GroupView, GroupView]:
         """
         Similar to Roulette Wheel Selection, but instead of one fixed point there's two.
-        :return: Tuple[CylinderGroup, CylinderGroup]
+        :return: Tuple[GroupView, GroupView]
         """
-        self.__selection_method = "stochastic universal sampling"
-
-        child1_ind, child2_ind = get_random_indices(self.get_normalised_fitness(), 2)
+        child1_ind, child2_ind = self.__selection.stochastic_universal_sampling(2)
         return (
             self.__population[child1_ind],
             self.__population[child2_ind]
         )
 
-    def rank_based_selection(self) -> CylinderGroup:
+    def rank_based_selection(self) -> GroupView:
         """
         Performs ranked based selection to select a cylinder group.
-        :return: CylinderGroup
+        :return: GroupView
         """
-        self.__selection_method = "rank based"
-
-        # - Sort the population in terms of fitness from smallest to largest - #
-        sorted_population = sorted(self.__population, key=lambda group: group.fitness())
-
-        total_ranks = sum(range(1, self.__size + 1))
-        normalised_ranks = [i / total_ranks for i in range(1, self.__size + 1)]
-
-        return sorted_population[get_random_indices(normalised_ranks)[0]]
+        return self.__population[self.__selection.rank_based(1)[0]]
 
-    def elitist_selection(self, k: int = 5) -> CylinderGroup:
+    def elitist_selection(self, k: int = 5) -> GroupView:
         """
         Gets one of the best k groups from the population.
-        :return: CylinderGroup
+        :return: GroupView
         """
-        self.__selection_method = "elitist"
-
-        return random.choice(sorted(self.__population, key=lambda group: group.fitness())[-k:])
+        return self.__population[self.__selection.elitist(1, k)[0]]
 
     def single_point_crossover(self, group1: List[int], group2: List[int]) -> List[int]:
         """
@@ -331,6 +664,30 @@ class Population:
 
         return davis_order_crossover(group1, group2)
 
+    def __batch_crossover(self, parents: ndarray) -> Tuple[ndarray, ndarray]:
+        """
+        Crosses over every pair of parents at once, with the batched version of the population's crossover.
+        :param ndarray parents: (offspring, 2) the indices of the pair of groups each offspring is made from.
+        :return: Tuple[ndarray, ndarray], the position strings of the offspring and their lengths.
+        """
+        genomes, lengths = self.__store.genomes, self.__store.lengths
+        shortest = int(lengths.min())
+
+        if self.__crossover == "multi point":
+            self.__crossover_method = "multi point crossover"
+            return batch_multi_point_crossover(genomes, lengths, parents, self.__rng, crossovers=max(1, min(MULTI_POINT_CROSSOVERS, shortest)))
+
+        if self.__crossover == "uniform":
+            self.__crossover_method = "uniform crossover"
+            return batch_uniform_crossover(genomes, lengths, parents, self.__rng)
+
+        if self.__crossover == "davis order" and shortest >= 2:  # it needs two points within every position string
+            self.__crossover_method = "davis order crossover"
+            return batch_davis_order_crossover(genomes, lengths, parents, self.__rng)
+
+        self.__crossover_method = "single point crossover"
+        return batch_single_point_crossover(genomes, lengths, parents, self.__rng)
+
     def mutate(self, group: List[int]) -> List[int]:
         """
         Applies a replacement mutation to a position number with another number in the range (i + 1) * cylinder_sides
@@ -353,51 +710,225 @@ class Population:
         :param int bin_focus: The bin of cylinders to focus on.
         :return: None
         """
+        profiler = self.__profiler
+        generation_start = perf_counter()
+
         # - Decode each position string in each group - #
-        for i, cylinder_group in enumerate(self.__population):
-            cylinder_group.decode()
+        # All groups are decoded together, CylinderGroup.decode() remains the reference for a single group.
+        with profiler.phase("Decode"):
+            result = self.__store.decode(self.__decoder, self.__decode_cache, self.__decode_checkpoints)
+            self.__decodes += self.__size
+            self.__positions_tried += int(result.tried.sum())
+            self.__positions_rejected += int(result.rejected.sum())
+
+        # The fitnesses are computed once by the decode, and shared by the selection, best tracking and summary.
+        fitnesses = self.__store.fitnesses
+        self.__selection = SelectionEngine(fitnesses, self.__rng)
 
         # - Track the best packing - #
-        # Get the best cylinder group in the current generation.
-        best_cylinder_group_gen = max(self.__population, key=lambda x: x.fitness())
+        with profiler.phase("Best Tracking"):
+            # Get the best cylinder group in the current generation (the first, if several share the best fitness).
+            best_index = int(fitnesses.argmax())
+            best_cylinder_group_gen = self.__population[best_index]
+
+            # Check whether the best cylinder group in this generation group outperforms any previous ones.
+            best_fitness, best_gen_fitness = self.__best_fitness, fitnesses[best_index].item()
 
-        # Check whether the best cylinder group in this generation group outperforms any previous ones.
-        best_fitness, best_gen_fitness = self.__best_cylinder_group.fitness(), best_cylinder_group_gen.fitness()
         if best_gen_fitness > best_fitness:
-            print(f"# {'-'*20} \033[1mNew Solution found at Generation {self.__generations}\033[0m {'-'*20} #\n"
-                  f"{best_cylinder_group_gen}"
-                  f"New fitness: \033[1m{best_gen_fitness}\033[0m\t\033[32m+{best_gen_fitness - best_fitness}\033[0m (from {best_fitness})\n"
-                  f"{'='*80}\n")
+            with profiler.phase("Printing"):
+                cprint(self.__verbose,
+                       f"# {'-'*20} \033[1mNew Solution found at Generation {self.__generations}\033[0m {'-'*20} #\n"
+                       f"{best_cylinder_group_gen}"
+                       f"New fitness: \033[1m{best_gen_fitness}\033[0m\t\033[32m+{best_gen_fitness - best_fitness}\033[0m (from {best_fitness})\n"
+                       f"{'='*80}\n")
 
             # Update the centre values of the Cylinders within the best cylinder group.
-            for i, decoded_cylinder in enumerate(best_cylinder_group_gen.decoded_cylinders):
-                self.__best_cylinder_group.cylinders[i].centre = decoded_cylinder.centre
+            with profiler.phase("Best Tracking"):
+                for i, decoded_cylinder in enumerate(best_cylinder_group_gen.decoded_cylinders):
+                    self.__best_cylinder_group.cylinders[i].centre = decoded_cylinder.centre
 
-            self.__containers[bin_focus].save_state(self.__generations)
+                self.__best_fitness = self.__best_cylinder_group.fitness()
+
+            with profiler.phase("Save State"):
+                self.__history.record(self.__generations, self.__best_fitness, [cylinder.centre for cylinder in self.__best_cylinder_group.cylinders])
+                self.__check_target()
 
         # - Create new population - #
-        # Use the recycling method within existing cylinder groups to avoid creating many objects that will be unused.
-        next_groups = [
-            self.mutate(
-                self.single_point_crossover(
-                    self.tournament_selection().group,
-                    self.tournament_selection().group
+        # Every parent is selected at once, then the whole generation of offspring is crossed over and mutated as a
+        # matrix and written into the store's spare buffer, so no groups are created for the next generation.
+        # The crossovers of the crossovers package, and mutate(), remain the reference for a single pair of groups.
+        with profiler.phase("Selection"):
+            parents = self.__selection.select(self.__selection_method, 2 * self.__size).reshape(self.__size, 2)
+
+        with profiler.phase("Crossover"):
+            offspring, lengths = self.__batch_crossover(parents)
+
+        with profiler.phase("Mutation"):
+            if self.__mutation_mode == "feasible":
+                # Each offspring is mutated around the placements of the parent it shares the most with.
+                references = reference_parents(offspring, lengths, self.__store.genomes, parents)
+                offspring = batch_mutate_feasible(
+                    offspring, lengths, self.__mutation_rate, self.__cylinder_sides, self.__rng,
+                    self.__store.centres[references], self.__store.radii, self.__decoder.unit_vectors,
+                    self.__container_width, self.__container_height
+                )
+            else:
+                offspring = batch_mutate(offspring, lengths, self.__mutation_rate, self.__cylinder_sides, self.__rng)
+
+        # - Swap to the new population - #
+        with profiler.phase("Recycle"):
+            self.__store.write_generation(offspring, lengths)
+            self.__store.swap()
+
+        if self.__telemetry is not None:
+            # The fitnesses are never written to once decoded, so they're shared with the writer as they are.
+            with profiler.phase("Telemetry"):
+                self.__telemetry.record_generation(
+                    bin_focus, self.__generations, fitnesses, self.__store.genomes.copy(), self.__store.lengths.copy(),
+                    {"decodes": self.__decodes, "positions_tried": self.__positions_tried, "positions_rejected": self.__positions_rejected},
+                    perf_counter() - generation_start
                 )
-            ) for _ in range(self.__size)
-        ]
-
-        # - Recycle old cylinder groups - #
-        for i, group in enumerate(self.__population):
-            group.recycle(next_groups[i])
 
+        profiler.end_generation(self.__generations)
         self.__generations += 1
 
-    def visualise_evolution(self, bin_focus: int = 0) -> Union[FuncAnimation, None]:
+        if self.__checkpointer is not None and self.__checkpointer.due(self.__generations):
+            self.__checkpointer.save(self.checkpoint_state(bin_focus))
+
+    def evolve_until(self, stopping: StoppingCriteria, bin_focus: int = 0) -> str:
+        """
+        Evolves the population of a bin, one generation at a time, until any of the stopping criteria are met.
+        :param StoppingCriteria stopping: The criteria to stop evolving at.
+        :param int bin_focus: The bin of cylinders to focus on.
+        :return: str, the reason the evolution stopped.
+        """
+        stopping.start_bin()
+
+        while (reason := stopping.check(
+                self.__generations,
+                self.__history.last_improvement,
+                self.__best_fitness,
+                self.__store.diversity
+        )) is None:
+            self.evolve(bin_focus)
+
+        self.__stop_reason = reason
+
+        return reason
+
+    def diversity(self) -> float:
+        """
+        The fraction of position strings in the current generation that are distinct.
+        :return: float
+        """
+        return self.__store.diversity()
+
+    def emigrants(self, k: int) -> Tuple[ndarray, ndarray, ndarray]:
+        """
+        Gets the k fittest groups of the generation last decoded, to migrate to another island.
+        :param int k: The number of groups that migrate.
+        :return: Tuple[ndarray, ndarray, ndarray], their position strings, lengths and fitnesses.
+        """
+        return self.__store.fittest(k)
+
+    def immigrate(self, genomes: ndarray, lengths: ndarray) -> None:
         """
-        Uses the dynamic visualiser to illustrate the placement of cylinders between key generations.
+        Replaces groups of the next generation, before it's decoded, with those that migrated from another island. The
+        offspring of a generation are in no particular order, so the last of them are replaced.
+        :param ndarray genomes: (groups, width) the position strings of the migrants.
+        :param ndarray lengths: (groups,) the length of each position string.
+        :return: None
+        """
+        self.__store.replace_groups(genomes, lengths)
+
+    def load_key_generations(self, bin_focus: int, key_generations: List[Tuple[int, float, List[Tuple[float, float]]]]) -> None:
+        """
+        Loads key generations that were recorded elsewhere (e.g. by a worker process) onto this population, so the
+        evolution of the bin can still be visualised.
+        :param int bin_focus: The bin of cylinders the key generations belong to.
+        :param List[Tuple[int, float, List[Tuple[float, float]]]] key_generations: The recorded key generations.
+        :return: None
+        """
+        self.__history = HistoryRecorder(key_generations)
+        self.__prepare_best_group(bin_focus)
+
+        if key_generations:
+            self.__generations, self.__best_fitness, centres = key_generations[-1]
+
+            for cylinder, centre in zip(self.__best_cylinder_group.cylinders, centres):
+                cylinder.centre = centre
+
+    def checkpoint_state(self, bin_focus: int) -> Dict[str, ndarray]:
+        """
+        Copies everything the evolution of the bin in focus needs to carry on exactly where it is: the next generation
+        (before it's decoded), the best group, the key generations and the state of both random number generators.
+        :param int bin_focus: The bin of cylinders in focus.
+        :return: Dict[str, ndarray], the state as arrays, for a Checkpointer to write.
+        """
+        return {
+            "bin_focus": array(bin_focus),
+            "generations": array(self.__generations),
+            "decodes": array(self.__decodes),
+            "positions_tried": array(self.__positions_tried),
+            "positions_rejected": array(self.__positions_rejected),
+            "radii": self.__store.radii.copy(),
+            "genomes": self.__store.genomes.copy(),
+            "lengths": self.__store.lengths.copy(),
+            "num_cylinders": self.__store.num_cylinders.copy(),
+            "best_fitness": array(self.__best_fitness),
+            "best_centres": array([cylinder.centre for cylinder in self.__best_cylinder_group.cylinders], dtype=float),
+            "key_generations": array([generation for generation, _, _ in self.key_generations], dtype=int),
+            "key_fitnesses": array([fitness for _, fitness, _ in self.key_generations], dtype=float),
+            "key_centres": array([centres for _, _, centres in self.key_generations], dtype=float).reshape(len(self.key_generations), -1, 2),
+            "rng_state": array(dumps(self.__rng.bit_generator.state)),
+            "time_to_target": array(dumps(self.__time_to_target)),
+            "random_state": random_state()
+        }
+
+    def restore(self, bin_focus: int, state: Dict[str, ndarray]) -> None:
+        """
+        Restores the evolution of a bin from a checkpoint, so it carries on exactly where it was. The groups of the bin
+        must have been generated first, by generate_groups().
+        :param int bin_focus: The bin of cylinders in focus.
+        :param Dict[str, ndarray] state: The state from checkpoint_state().
+        :return: None
+        """
+        if int(state["bin_focus"]) != bin_focus or state["radii"].shape != self.__store.radii.shape or (state["radii"] != self.__store.radii).any():
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: The checkpoint doesn't belong to Bin {bin_focus} of these cylinders\033[0m")
+
+        self.load_key_generations(bin_focus, [
+            (int(generation), float(fitness), [tuple(centre) for centre in centres])
+            for generation, fitness, centres in zip(state["key_generations"], state["key_fitnesses"], state["key_centres"].tolist())
+        ])
+
+        for cylinder, centre in zip(self.__best_cylinder_group.cylinders, state["best_centres"].tolist()):
+            cylinder.centre = tuple(centre)
+
+        self.__best_fitness = float(state["best_fitness"])
+        self.__generations = int(state["generations"])
+        self.__decodes = int(state["decodes"])
+        self.__positions_tried = int(state["positions_tried"])
+        self.__positions_rejected = int(state["positions_rejected"])
+        self.__store.restore(state["genomes"], state["lengths"], state["num_cylinders"])
+        self.__time_to_target = loads(state["time_to_target"].item()) if "time_to_target" in state else None
+
+        self.__rng.bit_generator.state = loads(state["rng_state"].item())
+        restore_random_state(state["random_state"])
+
+    def visualise_evolution(self, bin_focus: int = 0) -> Union["FuncAnimation", None]:
+        """
+        Uses the dynamic visualiser to illustrate the placement of cylinders between key generations, which are replayed
+        into the bin's container from the recorded history.
         :return: Union[FuncAnimation, None], the animation for this bin's evolution, if there's more than one save point, otherwise None (and is treated statically)
         """
         current_container = self.__containers[bin_focus]
+
+        for generation, _, centres in self.__history.key_generations:
+            for cylinder, centre in zip(self.__best_cylinder_group.cylinders, centres):
+                cylinder.centre = centre
+
+            current_container.save_state(generation)
+
         current_container.draw()
         current_container.choose_title(current_container.BEST_TITLE)
 
@@ -412,6 +943,20 @@ class Population:
 
         return current_container.ready_animation()  # Ready the animation for that container/axes.
 
+    def placements(self) -> Dict[str, List]:
+        """
+        The placements of the best cylinder group of the bin in focus, as numbers.
+        :return: Dict[str, List], the id, diameter, weight and centre of each of its cylinders.
+        """
+        cylinders = self.__best_cylinder_group.cylinders
+
+        return {
+            "Ids": [cylinder.id for cylinder in cylinders],
+            "Diameters": [cylinder.diameter for cylinder in cylinders],
+            "Weights": [cylinder.weight for cylinder in cylinders],
+            "Centres": [[float(x), float(y)] for x, y in (cylinder.centre for cylinder in cylinders)]
+        }
+
     def get_summary(self, time_taken: float, bin_focus: int = 0) -> Dict:
         """
         Generate a dictionary that contains a summary of the key events within this populations evolution.
@@ -422,20 +967,60 @@ class Population:
         return {
             "Compute Time": time_taken,
             "Population Size": self.__size,
-            "Binned Cylinders": sub(r"\033\[[0-9]*m", '', '\n'.join(['\t'.join(str(cylinder).split('\t')[:1] + str(cylinder).split('\t')[2:]) for cylinder in self.__bins.bins[bin_focus].cylinders])),
+            "Generations": self.__generations,
+            "Stop Reason": self.__stop_reason,
+            "Decodes": self.__decodes,
+            "Binned Cylinders": {
+                "Ids": [cylinder.id for cylinder in self.__bins.bins[bin_focus].cylinders],
+                "Diameters": [cylinder.diameter for cylinder in self.__bins.bins[bin_focus].cylinders],
+                "Weights": [cylinder.weight for cylinder in self.__bins.bins[bin_focus].cylinders]
+            },
             "Max Weight": self.__bins.bins[bin_focus].max_weight,
 
             "Best Cylinder Group": {
                 "Weight": self.__best_cylinder_group.weight,
-                "Fitness": self.__best_cylinder_group.fitness(),
-                "Cylinder Positions": sub(r"\033\[[0-9]*m", '', '\n'.join(['\t'.join(str(cylinder).split('\t')[:2]) for cylinder in self.__best_cylinder_group.cylinders])),
+                "Fitness": self.__best_fitness,
+                **self.placements()
             },
 
-            "Key Generations": list(zip(*self.__containers[bin_focus].saved_generations))[0],
-            "Fitness History": list(zip(*self.__containers[bin_focus].saved_generations))[1],
+            "Key Generations": tuple(generation for generation, _, _ in self.key_generations),
+            "Fitness History": tuple(fitness for _, fitness, _ in self.key_generations),
 
             "Selection Method Used": self.__selection_method,
             "Crossover Technique Used": self.__crossover_method,
-            "Mutation Rate": self.__mutation_rate
+            "Mutation Rate": self.__mutation_rate,
+            "Mutation Mode": self.__mutation_mode,
+            "Positions Tried": self.__positions_tried,
+            "Rejection Rate": self.__positions_rejected / self.__positions_tried if self.__positions_tried else 0.,
+            "Decode Cache": self.__decode_cache.get_summary() if self.__decode_cache else None,
+            "Decode Checkpoints": self.__decode_checkpoints.get_summary() if self.__decode_checkpoints else None,
+            "Profile": self.__profiler.get_summary() if self.__profiler.enabled else None,
+            "Checkpoints": self.__checkpointer.get_summary() if self.__checkpointer else None,
+            "Telemetry": self.__telemetry.get_summary() if self.__telemetry else None,
+            "Initialisation": self.__initialisation or None,
+            "Time To Target": {
+                "Target": self.__target_fitness,
+                "Generation": self.__time_to_target[0] if self.__time_to_target else None,
+                "Seconds": self.__time_to_target[1] if self.__time_to_target else None
+            } if self.__target_fitness is not None else None
         }
 
+
+def evolve_bin(population: Population, bin_focus: int, stopping: StoppingCriteria, seed: int) -> Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]]:
+    """
+    Generates and evolves the population of a single bin. This is the task each worker process runs when bins are
+    evolved in parallel, as bins share no state between one another.
+    :param Population population: The population, which has had its cylinders binned.
+    :param int bin_focus: The bin of cylinders to evolve.
+    :param StoppingCriteria stopping: The criteria to stop evolving at.
+    :param int seed: The seed of this worker's random number generator.
+    :return: Tuple[Dict, List[Tuple[int, float, List[Tuple[float, float]]]]], the summary of the bin's evolution and
+    its key generations.
+    """
+    random.seed(seed)
+    start_time = perf_counter()
+
+    population.generate_groups(bin_focus)
+    population.evolve_until(stopping, bin_focus)
+
+    return population.get_summary(perf_counter() - start_time, bin_focus), population.key_generations
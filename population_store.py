@@ -0,0 +1,283 @@
+from cylinders import Cylinder
+from decoder import BatchDecoder, DecodeResult
+from decode_cache import DecodeCache
+from decode_checkpoints import CheckpointStore
+from initialisers import random_genomes
+from typing import List, Tuple
+import numpy as np
+
+
+def diversity(genomes: np.ndarray, lengths: np.ndarray) -> float:
+    """
+    The fraction of position strings that are distinct.
+    :param np.ndarray genomes: (groups, width) the position strings, padded to the width of the matrix.
+    :param np.ndarray lengths: (groups,) the length of each position string.
+    :return: float
+    """
+    padded = np.where(np.arange(genomes.shape[1]) < lengths[:, None], genomes, -1)
+
+    return len(np.unique(np.column_stack((lengths, padded)), axis=0)) / len(genomes)
+
+
+class PopulationStore:
+    """
+    Holds every group of a population as arrays, rather than as CylinderGroups that each own a clone of every Cylinder.
+    The position strings are kept in a matrix that's double-buffered, so each new generation is written into the spare
+    buffer without allocating. The radii and weights of the bin's cylinders are shared by every group.
+    """
+
+    def __init__(self, size: int, cylinders: List[Cylinder], cylinder_sides: int, container_width: float, container_height: float,
+                 genomes: np.ndarray | None = None):
+        """
+        :param int size: The number of groups.
+        :param List[Cylinder] cylinders: The cylinders of the bin, in the order they're placed.
+        :param int cylinder_sides: The number of sides each cylinder's polygon has.
+        :param float container_width: The width of the container.
+        :param float container_height: The height of the container.
+        :param np.ndarray | None genomes: (size, cylinders - 1) the position strings of the first generation, e.g. from
+        initialisers.initial_genomes(). If None is specified, they're drawn at random.
+        """
+        num_cylinders = len(cylinders)
+
+        self.__size = size
+        self.__cylinders = cylinders  # The cylinders of the bin, which are only cloned when a group is materialised.
+        self.__cylinder_sides = cylinder_sides
+
+        self.__radii = np.array([cylinder.radius for cylinder in cylinders])
+        self.__weights = np.array([cylinder.weight for cylinder in cylinders])
+
+        # - Position strings - #
+        # Each group holds a position number for every cylinder apart from the first, which is placed in the centre of
+        # the container. Unless they're given, the numbers are drawn in the same way as CylinderGroup does.
+        self.__genomes = np.zeros((2, size, max(num_cylinders - 1, 1)), dtype=np.int64)
+        self.__lengths = np.full((2, size), num_cylinders - 1, dtype=np.int64)
+        self.__current = 0  # the buffer holding the current generation
+        self.__decoded_buffer = 0  # the buffer holding the generation last decoded
+
+        self.__genomes[0, :, :num_cylinders - 1] = random_genomes(size, num_cylinders, cylinder_sides) if genomes is None else genomes
+
+        self.__num_cylinders = np.full(size, num_cylinders, dtype=np.int64)
+
+        # - Decoded state - #
+        self.__centres = np.zeros((size, num_cylinders, 2))
+        self.__centres[:, 0] = (container_width / 2, container_height / 2)
+
+        self.__decoded = np.zeros((size, num_cylinders), dtype=bool)
+        self.__decoded[:, 0] = True
+
+        self.__group_weights = np.full(size, sum(cylinder.weight for cylinder in cylinders))
+        self.__fitnesses = np.zeros(size)
+        self.__fitnesses.flags.writeable = False  # only written by decode(), shared read-only with everything else
+
+        self.__views = [GroupView(self, i) for i in range(size)]
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def views(self) -> List["GroupView"]:
+        return self.__views
+
+    @property
+    def genomes(self) -> np.ndarray:
+        return self.__genomes[self.__current]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.__lengths[self.__current]
+
+    @property
+    def num_cylinders(self) -> np.ndarray:
+        return self.__num_cylinders
+
+    @property
+    def centres(self) -> np.ndarray:
+        return self.__centres
+
+    @property
+    def decoded(self) -> np.ndarray:
+        return self.__decoded
+
+    @property
+    def group_weights(self) -> np.ndarray:
+        return self.__group_weights
+
+    @property
+    def fitnesses(self) -> np.ndarray:
+        return self.__fitnesses
+
+    @property
+    def radii(self) -> np.ndarray:
+        return self.__radii
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self.__weights
+
+    def group(self, i: int) -> List[int]:
+        """
+        Gets the position string of the ith group of the current generation.
+        :param int i: The index of the group.
+        :return: List[int]
+        """
+        return self.__genomes[self.__current, i, :self.__lengths[self.__current, i]].tolist()
+
+    def write_offspring(self, i: int, group: List[int]) -> None:
+        """
+        Writes the position string of the ith group of the next generation into the spare buffer.
+        :param int i: The index of the group.
+        :param List[int] group: The position string.
+        :return: None
+        """
+        spare = 1 - self.__current
+        self.__genomes[spare, i, :len(group)] = group
+        self.__lengths[spare, i] = len(group)
+
+    def write_generation(self, genomes: np.ndarray, lengths: np.ndarray) -> None:
+        """
+        Writes the position strings of every group of the next generation into the spare buffer at once.
+        :param np.ndarray genomes: (groups, width) the position strings.
+        :param np.ndarray lengths: (groups,) the length of each position string.
+        :return: None
+        """
+        spare = 1 - self.__current
+        self.__genomes[spare] = genomes
+        self.__lengths[spare] = lengths
+
+    def restore(self, genomes: np.ndarray, lengths: np.ndarray, num_cylinders: np.ndarray) -> None:
+        """
+        Replaces the current generation, before it's decoded, e.g. with one from a checkpoint.
+        :param np.ndarray genomes: (groups, width) the position strings.
+        :param np.ndarray lengths: (groups,) the length of each position string.
+        :param np.ndarray num_cylinders: (groups,) the number of cylinders each group considers.
+        :return: None
+        """
+        self.__genomes[self.__current] = genomes
+        self.__lengths[self.__current] = lengths
+        self.__num_cylinders[:] = num_cylinders
+
+    def swap(self) -> None:
+        """
+        Makes the next generation, written by write_offspring, the current generation.
+        :return: None
+        """
+        self.__current = 1 - self.__current
+
+    def decode(self, decoder: BatchDecoder, cache: DecodeCache | None = None, checkpoints: CheckpointStore | None = None) -> DecodeResult:
+        """
+        Decodes the current generation, and stores the repaired position strings and the decoded state of each group.
+        :param BatchDecoder decoder: The decoder to use.
+        :param DecodeCache | None cache: A cache of previously decoded position strings to reuse, if any.
+        :param CheckpointStore | None checkpoints: The partial decodes of the last generation to resume from, if any.
+        :return: DecodeResult
+        """
+        result = decoder.decode_matrix(self.genomes, self.lengths, self.__num_cylinders, self.__radii, self.__weights, cache, checkpoints)
+
+        self.__decoded_buffer = self.__current
+        self.__genomes[self.__current] = result.positions
+        self.__lengths[self.__current] = result.lengths
+        self.__num_cylinders[:] = result.num_cylinders
+        self.__centres[:] = result.centres
+        self.__decoded[:] = result.decoded
+        self.__group_weights[:] = result.weights
+        self.__fitnesses = result.fitnesses.copy()
+        self.__fitnesses.flags.writeable = False
+
+        return result
+
+    def fittest(self, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets the k fittest position strings of the generation last decoded, which is held within the spare buffer once
+        the next generation has been swapped in.
+        :param int k: The number of position strings to get.
+        :return: Tuple[np.ndarray, np.ndarray, np.ndarray], the position strings, their lengths and fitnesses.
+        """
+        best = np.argsort(-self.__fitnesses, kind="stable")[:k]
+
+        return self.__genomes[self.__decoded_buffer, best], self.__lengths[self.__decoded_buffer, best], self.__fitnesses[best]
+
+    def replace_groups(self, genomes: np.ndarray, lengths: np.ndarray) -> None:
+        """
+        Replaces the position strings of the last groups of the current generation, before it's decoded.
+        :param np.ndarray genomes: (groups, width) the position strings to replace them with.
+        :param np.ndarray lengths: (groups,) the length of each position string.
+        :return: None
+        """
+        replaced = self.__size - len(genomes)
+        self.__genomes[self.__current, replaced:] = genomes
+        self.__lengths[self.__current, replaced:] = lengths
+
+    def diversity(self) -> float:
+        """
+        The fraction of position strings in the current generation that are distinct.
+        :return: float
+        """
+        return diversity(self.genomes, self.lengths)
+
+    def materialise(self, i: int, decoded_only: bool = False) -> List[Cylinder]:
+        """
+        Creates clones of the bin's cylinders, at the centres the ith group placed them.
+        :param int i: The index of the group.
+        :param bool decoded_only: Whether to only include the decoded cylinders.
+        :return: List[Cylinder]
+        """
+        cylinders = []
+        for j, (cylinder, centre) in enumerate(zip(self.__cylinders, self.__centres[i].tolist())):
+            if decoded_only and not self.__decoded[i, j]:
+                continue
+
+            clone = cylinder.__class__(sides=self.__cylinder_sides, diameter=cylinder.diameter, weight=cylinder.weight, id_=cylinder.id)
+            clone.centre = tuple(centre)
+            cylinders.append(clone)
+
+        return cylinders
+
+
+class GroupView:
+    """
+    A thin view of a single group within a PopulationStore, used in place of a CylinderGroup. Any Cylinder objects are
+    only created when they're asked for.
+    """
+
+    __slots__ = ("__store", "__index")
+
+    def __init__(self, store: PopulationStore, index: int):
+        self.__store = store
+        self.__index = index
+
+    def __str__(self):
+        return (f"CylinderGroup (\033[4m{self.__repr__().split('at ')[1][:-1]}\033[0m) contains:\n"
+                f"\t- {'\n\t- '.join([str(cylinder) for cylinder in self.cylinders])}\n\n"
+                f"{'='*80}\n")
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def group(self) -> List[int]:
+        return self.__store.group(self.__index)
+
+    @property
+    def cylinders(self) -> List[Cylinder]:
+        return self.__store.materialise(self.__index)
+
+    @property
+    def decoded_cylinders(self) -> List[Cylinder]:
+        return self.__store.materialise(self.__index, decoded_only=True)
+
+    @property
+    def num_cylinders(self) -> int:
+        return int(self.__store.num_cylinders[self.__index])
+
+    @property
+    def weight(self) -> float:
+        return self.__store.group_weights[self.__index].item()
+
+    def fitness(self) -> float:
+        """
+        The fitness of this group, as computed when the population was last decoded.
+        :return: float
+        """
+        return self.__store.fitnesses[self.__index].item()
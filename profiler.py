@@ -0,0 +1,119 @@
+from typing import Callable, Dict, List
+from contextlib import nullcontext
+from time import perf_counter
+
+# The phases of a generation, in the order they take place.
+PHASES = ("Decode", "Best Tracking", "Printing", "Save State", "Selection", "Crossover", "Mutation", "Recycle", "Telemetry")
+
+
+class _Phase:
+    """Times each block of code it's entered for, adding the time taken to a phase of a PhaseProfiler."""
+
+    __slots__ = ("__profiler", "__name", "__start")
+
+    def __init__(self, profiler: "PhaseProfiler", name: str):
+        self.__profiler = profiler
+        self.__name = name
+        self.__start = 0.
+
+    def __enter__(self):
+        self.__start = perf_counter()
+
+    def __exit__(self, *exception):
+        self.__profiler.add(self.__name, perf_counter() - self.__start)
+
+
+class PhaseProfiler:
+    """
+    Times each phase of a generation, and counts how many times each phase took place.
+    When disabled, the phases are null contexts, so the profiler costs next to nothing.
+    """
+
+    def __init__(self, enabled: bool = True, callback: Callable[[int, Dict[str, float]], None] | None = None):
+        """
+        :param bool enabled: Whether to time each phase.
+        :param Callable[[int, Dict[str, float]], None] | None callback: Called at the end of every generation with the
+        generation and the seconds spent in each phase of it. It's called within the process evolving the bin, so it
+        must be picklable when bins are evolved in parallel.
+        """
+        self.__enabled = enabled
+        self.__callback = callback
+
+        self.__phases = {name: _Phase(self, name) for name in PHASES}
+        self.__null_phase = nullcontext()
+
+        self.__seconds = dict.fromkeys(PHASES, 0.)  # of the current generation
+        self.__calls = dict.fromkeys(PHASES, 0)  # across every generation
+        self.__history: List[Dict[str, float]] = []  # the seconds spent in each phase of every generation
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    def phase(self, name: str) -> _Phase | nullcontext:
+        """
+        Gets a context that times the code within it as part of a phase.
+        :param str name: The name of the phase, one of PHASES.
+        :return: _Phase | nullcontext
+        """
+        return self.__phases[name] if self.__enabled else self.__null_phase
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """
+        Adds time spent in a phase of the current generation.
+        :param str name: The name of the phase, one of PHASES.
+        :param float seconds: The time spent.
+        :param int calls: The number of times the phase took place within that time.
+        :return: None
+        """
+        self.__seconds[name] += seconds
+        self.__calls[name] += calls
+
+    def end_generation(self, generation: int) -> None:
+        """
+        Records the time spent in each phase of the current generation, and passes it to the callback.
+        :param int generation: The generation that has ended.
+        :return: None
+        """
+        if not self.__enabled:
+            return
+
+        seconds = self.__seconds
+        self.__history.append(seconds)
+        self.__seconds = dict.fromkeys(PHASES, 0.)
+
+        if self.__callback is not None:
+            self.__callback(generation, seconds)
+
+    def reset(self) -> None:
+        """
+        Clears every timer and counter, e.g. before evolving another bin.
+        :return: None
+        """
+        self.__seconds = dict.fromkeys(PHASES, 0.)
+        self.__calls = dict.fromkeys(PHASES, 0)
+        self.__history = []
+
+    def get_summary(self) -> Dict:
+        """
+        Summarises the time spent in each phase, in total and per generation.
+        :return: Dict
+        """
+        generations = len(self.__history)
+        totals = {name: sum(seconds[name] for seconds in self.__history) for name in PHASES}
+        overall = sum(totals.values())
+
+        return {
+            "Generations": generations,
+            "Phases": {
+                name: {
+                    "Total": totals[name],
+                    "Share": totals[name] / overall if overall else 0.,
+                    "Mean": totals[name] / generations if generations else 0.,
+                    "Max": max((seconds[name] for seconds in self.__history), default=0.),
+                    "Calls": self.__calls[name]
+                }
+                for name in PHASES
+            },
+            "Per Generation": list(self.__history)
+        }
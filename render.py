@@ -0,0 +1,231 @@
+from config import CYLINDER_SIDES, FRAMES_PER_PATCH, SLIDE_ANIMATION, RENDER_WORKERS
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+from shutil import which
+from os import cpu_count
+import numpy as np
+import subprocess
+
+
+def frame_schedule(keys: int, fpp: int, pause_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lays out the frames of a bin's animation in the same way as AnimatedContainer.update(): a pause on each key
+    generation, with fpp frames moving between each of them.
+    :param int keys: The number of key generations.
+    :param int fpp: The frames per patch, i.e. the number of frames moving between key generations.
+    :param int pause_length: The number of frames each key generation is paused on.
+    :return: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], for each frame: the key generation the patches are
+    moving from, how far they are towards the next (from 0 to 1), the key generation the title is about, and whether
+    the title is of the transition from it to the next.
+    """
+    # The first pause lasts two frames longer, as frame 0 only resets the animation, and the frame ending the pause
+    # shows the transition title.
+    segments, fractions = [np.zeros(pause_length + 2, dtype=int)], [np.zeros(pause_length + 2)]
+    titles, transitions = [np.zeros(pause_length + 2, dtype=int)], [np.arange(pause_length + 2) == pause_length + 1]
+
+    for key in range(keys - 1):
+        segments.append(np.full(fpp + pause_length, key))
+        fractions.append(np.minimum(np.arange(1, fpp + pause_length + 1) / fpp, 1.))
+        titles.append(np.repeat([key, key + 1], [fpp, pause_length]))
+        transitions.append(np.concatenate([np.ones(fpp, dtype=bool), np.arange(pause_length) == pause_length - 1]))
+
+    max_frames = (keys - 1) * fpp + pause_length * keys
+
+    # The transition title isn't shown when the patches snap between positions, to prevent it from flickering.
+    return (np.concatenate(segments)[:max_frames], np.concatenate(fractions)[:max_frames],
+            np.concatenate(titles)[:max_frames], np.concatenate(transitions)[:max_frames] & (fpp != 1))
+
+
+def trajectory(key_generations: List[Tuple[int, float, List[Tuple[float, float]]]], weights: List[float], fpp: int,
+               pause_length: int) -> Dict[str, np.ndarray]:
+    """
+    Precomputes where every patch, and the centre of mass, is at each frame of a bin's animation.
+    :param List[Tuple[int, float, List[Tuple[float, float]]]] key_generations: The key generations of the bin.
+    :param List[float] weights: The weight of each cylinder, in the same order as the centres of the key generations.
+    :param int fpp: The frames per patch, i.e. the number of frames moving between key generations.
+    :param int pause_length: The number of frames each key generation is paused on.
+    :return: Dict[str, np.ndarray], the (frames, cylinders, 2) 'Centres' and (frames, 2) 'COMs' of each frame, with
+    the 'Titles' and 'Transitions' from frame_schedule().
+    """
+    centres = np.array([centres for _, _, centres in key_generations], dtype=float)
+    weights = np.asarray(weights, dtype=float)
+
+    segments, fractions, titles, transitions = frame_schedule(len(centres), fpp, pause_length)
+    starts, ends = centres[segments], centres[np.minimum(segments + 1, len(centres) - 1)]
+    frame_centres = starts + (ends - starts) * fractions[:, None, None]
+
+    return {
+        "Centres": frame_centres,
+        "COMs": (frame_centres * weights[:, None]).sum(axis=1) / weights.sum(),
+        "Titles": titles,
+        "Transitions": transitions
+    }
+
+
+def _write_gif(path: str, frames: Iterator[np.ndarray | None], fps: int) -> int:
+    """
+    Writes frames into a looping GIF, in the same way matplotlib's PillowWriter does, but with each frame reduced to
+    its palette as it's drawn so the frames of long animations fit in memory. A frame of None repeats the last.
+    :return: int, the number of frames written.
+    """
+    from PIL import Image
+
+    images = []
+    for frame in frames:
+        images.append(images[-1] if frame is None else Image.fromarray(frame[..., :3]).convert("P", palette=Image.Palette.ADAPTIVE))
+
+    images[0].save(path, save_all=True, append_images=images[1:], duration=int(1000 / fps), loop=0)
+
+    return len(images)
+
+
+def _write_video(path: str, frames: Iterator[np.ndarray | None], fps: int) -> int:
+    """
+    Pipes frames into FFmpeg, which encodes them into a video (e.g. MP4) of the format of path's extension. A frame of
+    None repeats the last.
+    :return: int, the number of frames written.
+    """
+    from matplotlib import rcParams
+
+    ffmpeg = which(rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: FFmpeg is needed to save '{path}', use SAVE_FORMAT = \"gif\" without it\033[0m")
+
+    first = next(frames)
+    height, width = first.shape[:2]
+
+    process = subprocess.Popen(
+        [ffmpeg, "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-framerate", str(fps),
+         "-i", "pipe:", "-pix_fmt", "yuv420p", "-y", path],
+        stdin=subprocess.PIPE
+    )
+
+    written, data = 0, b""
+    for frame in (first, *frames):
+        data = data if frame is None else frame.tobytes()
+        process.stdin.write(data)
+        written += 1
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: FFmpeg failed to save '{path}'\033[0m")
+
+    return written
+
+
+def render_bin(path: str, key_generations: List[Tuple[int, float, List[Tuple[float, float]]]], diameters: List[float], weights: List[float],
+               container_width: float, container_height: float, *, fpp: int | None = None, fps: int = 60) -> int:
+    """
+    Renders the animation of a bin's key generations into a file, off screen. Everything but the patches, centre of
+    mass marker, and whatever is drawn over them (e.g. the title, grid and legend), is drawn once, and only those are
+    drawn over it for each frame (blitting), at the positions precomputed by trajectory().
+    :param str path: The file to save the animation into, its extension decides the format, e.g. ".gif" or ".mp4".
+    :param List[Tuple[int, float, List[Tuple[float, float]]]] key_generations: The key generations of the bin.
+    :param List[float] diameters: The diameter of each cylinder, in the same order as the centres of the key generations.
+    :param List[float] weights: The weight of each cylinder, in the same order as the centres of the key generations.
+    :param float container_width: The width of the container.
+    :param float container_height: The height of the container.
+    :param int | None fpp: The frames per patch. If None is specified, it's FRAMES_PER_PATCH when the config file's
+    SLIDE_ANIMATION is True, otherwise 1.
+    :param int fps: The frames per second of the animation.
+    :return: int, the number of frames rendered.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from canvas import AnimatedContainer
+    from event_manager import EventManager
+    from cylinders import Cylinder, BasicGroup
+
+    if fpp is None:
+        fpp = FRAMES_PER_PATCH if SLIDE_ANIMATION else 1
+
+    # - Set up a container the same way as a visualised bin - #
+    fig = Figure(figsize=(10, 10))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    fig.patch.set_facecolor("#01364C")
+
+    cylinders = [Cylinder(CYLINDER_SIDES, diameter, weight) for diameter, weight in zip(diameters, weights)]
+    container = AnimatedContainer(fpp, fig, ax, EventManager(fig), container_width, container_height)
+    container.best_cylinder_group = BasicGroup(cylinders, len(cylinders), CYLINDER_SIDES, container_width, container_height)
+    container.add_cylinders()
+
+    for generation, _, centres in key_generations:
+        for cylinder, centre in zip(cylinders, centres):
+            cylinder.centre = centre
+
+        container.save_state(generation)
+
+    container.draw()
+    frames = trajectory(key_generations, weights, fpp, AnimatedContainer.PAUSE_LENGTH)
+
+    # - Draw the background once, without anything that moves between frames or is drawn over it - #
+    moving = {artist for patch in container.cylinder_patches for artist in (*patch.annotations, patch)} | {container.com_marker}
+    lowest = min(artist.get_zorder() for artist in moving)
+
+    # Ordered in the same way as Axes.draw(), so e.g. the grid is still drawn over the patches.
+    animated = [artist for artist in ax.get_children() if artist in moving or (artist.get_zorder() > lowest and artist is not ax.patch)]
+    animated.sort(key=lambda artist: artist.get_zorder())
+    for artist in animated:
+        artist.set_animated(True)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    def blit() -> Iterator[np.ndarray | None]:
+        title = None
+        for frame in range(len(frames["Centres"])):
+            # Nothing is drawn for the frames of a pause, which are the same as the frame before.
+            if frame and title == (frames["Titles"][frame], frames["Transitions"][frame]) and \
+                    np.array_equal(frames["Centres"][frame], frames["Centres"][frame - 1]):
+                yield None
+                continue
+
+            canvas.restore_region(background)
+
+            for patch, centre in zip(container.cylinder_patches, frames["Centres"][frame]):
+                patch.set_position((float(centre[0]), float(centre[1])))
+
+            container.com_marker.set_data([frames["COMs"][frame, 0]], [frames["COMs"][frame, 1]])
+
+            if title != (frames["Titles"][frame], frames["Transitions"][frame]):
+                title = (frames["Titles"][frame], frames["Transitions"][frame])
+                container.save_index = int(title[0])
+                container.choose_title(container.TRANSITION_TITLE if title[1] else container.BEST_TITLE)
+
+            for artist in animated:
+                ax.draw_artist(artist)
+
+            yield np.asarray(canvas.buffer_rgba())
+
+    if path.lower().endswith(".gif"):
+        return _write_gif(path, blit(), fps)
+
+    return _write_video(path, blit(), fps)
+
+
+def render_bins(animations: Dict[str, Dict], workers: int | None = RENDER_WORKERS) -> Dict[str, int]:
+    """
+    Renders the animations of several bins, each within a worker process of its own, once they have all evolved.
+    :param Dict[str, Dict] animations: The keyword arguments of render_bin() for each file to save: {path: kwargs}.
+    :param int | None workers: The number of worker processes, 1 renders each animation one after another within this
+    process. If None is specified, there's a worker for each CPU.
+    :return: Dict[str, int], the number of frames rendered into each file.
+    """
+    if workers == 1 or len(animations) <= 1:
+        return {path: render_bin(path, **kwargs) for path, kwargs in animations.items()}
+
+    with ProcessPoolExecutor(max_workers=min(workers or cpu_count(), len(animations))) as executor:
+        futures = {path: executor.submit(render_bin, path, **kwargs) for path, kwargs in animations.items()}
+        return {path: future.result() for path, future in futures.items()}
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    _key_generations = [(0, .01, [(10., 10.), (16., 10.)]), (4, .02, [(10., 10.), (13., 15.)]), (9, .05, [(10., 10.), (7., 15.)])]
+
+    _start = perf_counter()
+    _frames = render_bin("_ANIMATIONS/render_example.gif", _key_generations, [4., 6.], [100., 200.], 20., 20., fpp=30)
+
+    print(f"Rendered {_frames} frames in {perf_counter() - _start:.2f}s")
@@ -0,0 +1,170 @@
+from config import RESULT_CACHE_DIRECTORY, RESULT_CACHE_BYTES
+from typing import Dict, List, Sequence
+from hashlib import sha256
+from json import dumps, loads
+from math import isfinite
+import os
+
+# The ways a run can use the bins solved by earlier runs: returning their placements in place of evolving the bin, or
+# starting the bin's evolution from them.
+CACHE_MODES = ("reuse", "warm start")
+
+
+def _holds(entry, diameters: Sequence[float], weights: Sequence[float]) -> bool:
+    """
+    Checks that an entry has a fitness, and a placement of exactly the multiset of cylinders given.
+    :param entry: The entry, as it was read.
+    :param Sequence[float] diameters: The diameter of each of the bin's cylinders.
+    :param Sequence[float] weights: The weight of each of the bin's cylinders, in the same order.
+    :return: bool
+    """
+    try:
+        placement = entry["Placement"]
+        if not isinstance(entry["Fitness"], (int, float)) or not all(len(row) == 4 and all(map(isfinite, row)) for row in placement):
+            return False
+
+        return sorted((float(diameter), float(weight)) for diameter, weight, _, _ in placement) == sorted(zip(map(float, diameters), map(float, weights)))
+
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+class ResultCache:
+    """
+    A persistent, content-addressed cache of solved bins, shared between runs. Each bin is keyed by a hash of everything
+    its result depends on: the multiset of its cylinders' (diameter, weight), the container, the cylinder sides and the
+    parameters of the genetic algorithm, so the same mix of cylinders is found whatever their ids or order. Each entry
+    holds the best placement found, and its fitness.
+    Entries are files within a directory, which is kept under a number of bytes by removing the least recently used
+    entries first.
+    """
+
+    def __init__(self, directory: str = RESULT_CACHE_DIRECTORY, max_bytes: int = RESULT_CACHE_BYTES):
+        """
+        :param str directory: The directory holding the entries, which is created if it doesn't exist.
+        :param int max_bytes: The most bytes the entries can take up.
+        """
+        self.__directory = directory
+        self.__max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self.__bytes = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".json"))
+        self.__hits = 0
+        self.__misses = 0
+        self.__stores = 0
+        self.__evictions = 0
+
+    @staticmethod
+    def key(diameters: Sequence[float], weights: Sequence[float], container_width: float, container_height: float,
+            cylinder_sides: int, parameters: Dict) -> str:
+        """
+        Hashes everything a bin's result depends on into its key.
+        :param Sequence[float] diameters: The diameter of each of the bin's cylinders.
+        :param Sequence[float] weights: The weight of each of the bin's cylinders, in the same order.
+        :param float container_width: The width of the container.
+        :param float container_height: The height of the container.
+        :param int cylinder_sides: The number of sides each cylinder's polygon has.
+        :param Dict parameters: The parameters of the genetic algorithm, e.g. {'population_size': 50}.
+        :return: str, the key.
+        """
+        canonical = dumps({
+            "cylinders": sorted(zip(map(float, diameters), map(float, weights))),
+            "container": [float(container_width), float(container_height)],
+            "sides": int(cylinder_sides),
+            "parameters": parameters
+        }, sort_keys=True)
+
+        return sha256(canonical.encode()).hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.__directory, f"{key}.json")
+
+    def get(self, key: str, diameters: Sequence[float] | None = None, weights: Sequence[float] | None = None) -> Dict | None:
+        """
+        Looks up a bin, marking its entry as the most recently used.
+        :param str key: The bin's key.
+        :param Sequence[float] | None diameters: The diameter of each of the bin's cylinders. When given alongside
+        weights, an entry that isn't a placement of exactly these cylinders is a miss.
+        :param Sequence[float] | None weights: The weight of each of the bin's cylinders, in the same order.
+        :return: Dict | None, the entry, {'Fitness': float, 'Placement': [[diameter, weight, x, y], ...]}, or None if
+        the bin isn't cached.
+        """
+        path = self.__path(key)
+
+        try:
+            with open(path) as file:
+                entry = loads(file.read())
+
+        except (OSError, ValueError):  # missing, or left unreadable by a run that was killed whilst writing it
+            self.__misses += 1
+            return None
+
+        if diameters is not None and weights is not None and not _holds(entry, diameters, weights):  # e.g. edited by hand
+            self.__misses += 1
+            return None
+
+        os.utime(path)
+
+        self.__hits += 1
+        return entry
+
+    def put(self, key: str, fitness: float, placement: List[List[float]]) -> None:
+        """
+        Stores the best placement of a bin, replacing any entry it had, then evicts the least recently used entries
+        until the cache fits within its bytes.
+        :param str key: The bin's key.
+        :param float fitness: The fitness of the placement.
+        :param List[List[float]] placement: The [diameter, weight, x, y] of each of the bin's cylinders.
+        :return: None
+        """
+        path = self.__path(key)
+        data = dumps({"Fitness": fitness, "Placement": placement})
+
+        if os.path.exists(path):
+            self.__bytes -= os.path.getsize(path)
+
+        # Written into a temporary file that then replaces the entry, so a reader never sees half an entry.
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+        self.__bytes += os.path.getsize(path)
+        self.__stores += 1
+
+        if self.__bytes > self.__max_bytes:
+            self.__evict(keep=path)
+
+    def __evict(self, keep: str) -> None:
+        """
+        Removes the least recently used entries until the cache fits within its bytes.
+        :param str keep: The entry that was just stored, which is never removed.
+        :return: None
+        """
+        entries = sorted((entry for entry in os.scandir(self.__directory) if entry.name.endswith(".json") and entry.path != keep),
+                         key=lambda entry: entry.stat().st_mtime)
+
+        for entry in entries:
+            if self.__bytes <= self.__max_bytes:
+                break
+
+            self.__bytes -= entry.stat().st_size
+            os.remove(entry.path)
+            self.__evictions += 1
+
+    def get_summary(self) -> Dict:
+        """
+        Summarises how the cache has been used.
+        :return: Dict
+        """
+        lookups = self.__hits + self.__misses
+
+        return {
+            "Directory": self.__directory,
+            "Hits": self.__hits,
+            "Misses": self.__misses,
+            "Hit Rate": self.__hits / lookups if lookups else 0.,
+            "Stores": self.__stores,
+            "Evictions": self.__evictions,
+            "Bytes": self.__bytes
+        }
@@ -0,0 +1,133 @@
+from typing import Callable, Dict
+import numpy as np
+
+
+class SelectionEngine:
+    """
+    Selects parents from the fitnesses of a generation, drawing any number of them in one vectorised step.
+    The cumulative fitnesses and ranks each method needs are only computed once per generation, on first use.
+    Groups with an infinite fitness (their COM is exactly at the centre of the container) share all the probability of
+    being picked by the fitness-proportionate methods.
+    """
+
+    def __init__(self, fitnesses: np.ndarray, rng: np.random.Generator):
+        self.__fitnesses = fitnesses
+        self.__rng = rng
+
+        self.__cumulative_fitness: np.ndarray | None = None
+        self.__order: np.ndarray | None = None  # the indices of the groups, from the lowest fitness to the highest
+        self.__cumulative_ranks: np.ndarray | None = None
+
+        self.__methods: Dict[str, Callable[[int], np.ndarray]] = {
+            "tournament": self.tournament,
+            "roulette wheel": self.roulette_wheel,
+            "stochastic universal sampling": self.stochastic_universal_sampling,
+            "rank based": self.rank_based,
+            "elitist": self.elitist
+        }
+
+    def select(self, method: str, count: int) -> np.ndarray:
+        """
+        Selects parents using a method by its name.
+        :param str method: One of "tournament", "roulette wheel", "stochastic universal sampling", "rank based" or
+        "elitist".
+        :param int count: The number of parents to select.
+        :return: np.ndarray, the indices of the parents.
+        """
+        if method not in self.__methods:
+            raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown selection method '{method}', use one of {list(self.__methods)}\033[0m")
+
+        return self.__methods[method](count)
+
+    def __get_cumulative_fitness(self) -> np.ndarray:
+        if self.__cumulative_fitness is None:
+            weights = self.__fitnesses
+            if np.isinf(weights).any():
+                weights = np.isinf(weights).astype(float)
+            elif not weights.sum() > 0:
+                weights = np.ones(len(weights))
+
+            self.__cumulative_fitness = np.cumsum(weights)
+
+        return self.__cumulative_fitness
+
+    def __get_order(self) -> np.ndarray:
+        if self.__order is None:
+            self.__order = np.argsort(self.__fitnesses, kind="stable")  # ties keep their order, as sorted() does
+
+        return self.__order
+
+    def __spin(self, cumulative: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """
+        Finds the indices whose share of a cumulative sum contains each point.
+        :param np.ndarray cumulative: The cumulative sum of the shares.
+        :param np.ndarray points: The points, within the range [0, 1).
+        :return: np.ndarray
+        """
+        return np.minimum(np.searchsorted(cumulative, points * cumulative[-1], side="right"), len(cumulative) - 1)
+
+    def tournament(self, count: int, k: int = 3) -> np.ndarray:
+        """
+        Selects parents using tournament selection, where each is the fittest of k distinct random groups.
+        :param int count: The number of parents to select.
+        :param int k: The size of each tournament.
+        :return: np.ndarray
+        """
+        size = len(self.__fitnesses)
+        if k > size:
+            raise ValueError("Sample larger than population or is negative")
+
+        contestants = self.__rng.integers(size, size=(count, k))
+
+        # Redraw any tournament with a repeated group, so each holds k distinct groups.
+        while True:
+            ordered = np.sort(contestants, axis=1)
+            repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not repeated.any():
+                break
+
+            contestants[repeated] = self.__rng.integers(size, size=(int(repeated.sum()), k))
+
+        # The first of the fittest contestants wins, as max() picks.
+        return contestants[np.arange(count), self.__fitnesses[contestants].argmax(axis=1)]
+
+    def roulette_wheel(self, count: int) -> np.ndarray:
+        """
+        Selects parents with a probability proportional to their fitness.
+        :param int count: The number of parents to select.
+        :return: np.ndarray
+        """
+        return self.__spin(self.__get_cumulative_fitness(), self.__rng.random(count))
+
+    def stochastic_universal_sampling(self, count: int) -> np.ndarray:
+        """
+        Selects parents with evenly spaced points over the cumulative fitnesses, from a single random offset. The
+        parents are then shuffled, so neighbouring groups aren't paired together.
+        :param int count: The number of parents to select.
+        :return: np.ndarray
+        """
+        points = (self.__rng.random() + np.arange(count)) / count
+
+        return self.__rng.permutation(self.__spin(self.__get_cumulative_fitness(), points))
+
+    def rank_based(self, count: int) -> np.ndarray:
+        """
+        Selects parents with a probability proportional to their rank, the fittest group having the highest rank.
+        :param int count: The number of parents to select.
+        :return: np.ndarray
+        """
+        if self.__cumulative_ranks is None:
+            self.__cumulative_ranks = np.cumsum(np.arange(1, len(self.__fitnesses) + 1, dtype=float))
+
+        return self.__get_order()[self.__spin(self.__cumulative_ranks, self.__rng.random(count))]
+
+    def elitist(self, count: int, k: int = 5) -> np.ndarray:
+        """
+        Selects parents uniformly from the fittest k groups.
+        :param int count: The number of parents to select.
+        :param int k: The number of the fittest groups to choose from.
+        :return: np.ndarray
+        """
+        elites = self.__get_order()[-k:]
+
+        return elites[self.__rng.integers(len(elites), size=count)]
@@ -0,0 +1,403 @@
+"""
+A long-running local service that packs shipments, so a job doesn't pay for the start up of a fresh Python process.
+Jobs are queued and run headlessly within a pool of worker processes, which have started (and imported NumPy and the
+genetic algorithm) before the first job arrives. The progress of each job is followed through its telemetry.
+
+Requests and responses are JSON over HTTP, on a TCP port or a Unix socket:
+    POST /jobs          Queues a job: {"manifest": path, or "cylinders": [[id, diameter, weight], ...],
+                        "container_width": 10, "container_height": 10, "max_weight": 100, "parameters": {...},
+                        "seed": 0}, with any keyword arguments of run_ga() in JOB_PARAMETERS as its parameters.
+    GET  /jobs          The status of every job.
+    GET  /jobs/<id>     The status and progress of a job and, once it's done, its result.
+    GET  /health        The number of workers, and of queued and running jobs.
+
+Usage: python service.py [--host 127.0.0.1] [--port 8765] [--socket path] [--workers N]
+"""
+
+from config import SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_RETAINED_JOBS
+from manifest import load_manifest, manifest_from_rows
+from main import run_ga
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from argparse import ArgumentParser
+from inspect import signature
+from tempfile import mkdtemp
+from shutil import rmtree
+from json import dumps, loads
+from os import cpu_count, getpid, remove
+from os.path import exists, join
+from time import perf_counter, time
+from itertools import count
+from typing import Dict, List, Tuple
+
+import asyncio
+import random
+import signal
+import re
+
+# The keyword arguments of run_ga() a job can set. Those that start processes of their own are left out, as each job
+# already runs within a worker.
+JOB_PARAMETERS = ("population_size", "mutation_rate", "selection", "crossover", "mutation", "packing", "max_generations",
+                  "cylinder_sides", "cache_size", "resume_decodes", "result_cache", "initialiser", "seeded_fraction", "time_to_target")
+
+# The formatting of the custom exceptions, which is removed from the errors sent back.
+_FORMATTING = re.compile(r"\r|\033\[[0-9;]*m")
+
+# The number of generations each bin of a job is evolved for, unless the job sets its own.
+_MAX_GENERATIONS = signature(run_ga).parameters["max_generations"].default
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _ignore_interrupts() -> None:
+    """
+    Leaves interrupts (e.g. Ctrl+C) to the service within each worker, which shuts the workers down itself.
+    :return: None
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _warm_up() -> int:
+    """
+    Runs once within each worker as it starts, which has imported this module (and so NumPy and the genetic algorithm)
+    to run it, so its first job doesn't wait on those imports.
+    :return: int, the worker's process id.
+    """
+    return getpid()
+
+
+def run_job(job: Dict, telemetry_path: str) -> Dict:
+    """
+    Runs the genetic algorithm of a job headlessly, within a worker.
+    :param Dict job: The job, as it was sent to the service.
+    :param str telemetry_path: The file each generation's telemetry is streamed into, which the service follows.
+    :return: Dict, the summary of each bin, and the time the job took.
+    """
+    manifest = load_manifest(job["manifest"]) if "manifest" in job else manifest_from_rows(job["cylinders"], "cylinders")
+    random.seed(job.get("seed"))
+
+    start_time = perf_counter()
+    key_events = run_ga(
+        manifest, len(manifest),
+        max_weight=job["max_weight"], container_width=job["container_width"], container_height=job["container_height"],
+        visualise=False, verbose=False, record=False, workers=1, decode_workers=1, islands=1, checkpoint_path=None,
+        telemetry_path=telemetry_path, **job.get("parameters", {})
+    )
+
+    return {"bins": key_events, "seconds": perf_counter() - start_time}
+
+
+def check_job(job: Dict) -> str | None:
+    """
+    Checks a job can be queued, before it's sent to a worker.
+    :param Dict job: The job.
+    :return: str | None, what's wrong with the job, None if nothing is.
+    """
+    if not isinstance(job, dict):
+        return "A job must be a JSON object"
+
+    if ("manifest" in job) == ("cylinders" in job):
+        return "A job needs either a 'manifest' path or a list of 'cylinders', [[id, diameter, weight], ...]"
+
+    if "manifest" in job and not isinstance(job["manifest"], str):
+        return "A job's 'manifest' must be the path of a manifest"
+
+    if "cylinders" in job and not isinstance(job["cylinders"], list):
+        return "A job's 'cylinders' must be a list of [id, diameter, weight]"
+
+    for key in ("container_width", "container_height", "max_weight"):
+        if not isinstance(job.get(key), (int, float)) or isinstance(job[key], bool) or job[key] <= 0:
+            return f"A job needs a positive '{key}'"
+
+    parameters = job.get("parameters", {})
+    if not isinstance(parameters, dict) or any(key not in JOB_PARAMETERS for key in parameters):
+        return f"A job's 'parameters' can only set {list(JOB_PARAMETERS)}"
+
+    if job.get("seed") is not None and not isinstance(job["seed"], int):
+        return "A job's 'seed' must be a whole number"
+
+    return None
+
+
+class PackingService:
+    """
+    Queues packing jobs and runs each within a pool of worker processes, which are started once and kept for every job.
+    Each worker has a dispatcher that hands it the next queued job once it's free, so a job is only "running" once a
+    worker has it.
+    """
+
+    def __init__(self, workers: int | None = SERVICE_WORKERS, retained_jobs: int = SERVICE_RETAINED_JOBS):
+        """
+        :param int | None workers: The number of worker processes. If None is specified, there's one for each CPU.
+        :param int retained_jobs: The number of finished jobs whose results are kept.
+        """
+        self.__workers = workers or cpu_count()
+        self.__retained_jobs = retained_jobs
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__queue: asyncio.Queue | None = None
+        self.__dispatchers: List[asyncio.Task] = []
+        self.__directory = mkdtemp(prefix="packing_service_")  # holds the telemetry of each running job
+
+        self.__jobs: Dict[str, Dict] = {}  # {id: job}, in the order they were submitted
+        self.__finished: List[str] = []  # the ids of the finished jobs, oldest first
+        self.__ids = count(1)
+
+    @property
+    def workers(self) -> int:
+        return self.__workers
+
+    async def start(self) -> float:
+        """
+        Starts every worker process, and waits for each to import the genetic algorithm.
+        :return: float, the time it took.
+        """
+        start_time = perf_counter()
+        loop = asyncio.get_running_loop()
+
+        # Workers are spawned rather than forked, so none inherits the threads of the event loop or the executor.
+        self.__executor = ProcessPoolExecutor(self.__workers, mp_context=get_context("spawn"), initializer=_ignore_interrupts)
+        await asyncio.gather(*(loop.run_in_executor(self.__executor, _warm_up) for _ in range(self.__workers)))
+
+        self.__queue = asyncio.Queue()
+        self.__dispatchers = [asyncio.create_task(self.__dispatch()) for _ in range(self.__workers)]
+
+        return perf_counter() - start_time
+
+    async def close(self) -> None:
+        """
+        Stops every dispatcher and worker, dropping any queued jobs.
+        :return: None
+        """
+        for dispatcher in self.__dispatchers:
+            dispatcher.cancel()
+
+        await asyncio.gather(*self.__dispatchers, return_exceptions=True)
+
+        if self.__executor is not None:
+            self.__executor.shutdown(cancel_futures=True)
+
+        rmtree(self.__directory, ignore_errors=True)
+
+    def submit(self, job: Dict) -> Dict:
+        """
+        Queues a job that has been checked by check_job().
+        :param Dict job: The job.
+        :return: Dict, the job's id, status and place within the queue.
+        """
+        job_id = str(next(self.__ids))
+        self.__jobs[job_id] = {
+            "job": job,
+            "status": "queued",
+            "submitted": time(),
+            "started": None,
+            "finished": None,
+            "progress": {"generations": 0, "bin": None, "generation": None, "best": None, "bins_finished": 0},
+            "result": None,
+            "error": None,
+            "telemetry": join(self.__directory, f"job_{job_id}.jsonl"),
+            "read": 0  # how much of the telemetry has been read
+        }
+        self.__queue.put_nowait(job_id)
+
+        return {"id": job_id, "status": "queued", "position": self.__queue.qsize()}
+
+    def __follow(self, record: Dict) -> None:
+        """
+        Reads any new telemetry of a running job into its progress.
+        :param Dict record: The job's record.
+        :return: None
+        """
+        if not exists(record["telemetry"]):
+            return
+
+        with open(record["telemetry"]) as file:
+            file.seek(record["read"])
+            text = file.read()
+
+        text = text[:text.rfind('\n') + 1]  # only whole lines, the rest is read once it's written
+        record["read"] += len(text)
+
+        progress = record["progress"]
+        for line in text.splitlines():
+            entry = loads(line)
+            if entry["type"] == "placements":
+                progress["bins_finished"] += 1
+                continue
+
+            progress["generations"] += 1
+            progress["bin"], progress["generation"], progress["best"] = entry["bin"], entry["generation"], entry["best"]
+
+    async def __dispatch(self) -> None:
+        """
+        Hands queued jobs, one at a time, to the worker pool.
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            job_id = await self.__queue.get()
+            record = self.__jobs[job_id]
+            record["status"], record["started"] = "running", time()
+
+            try:
+                record["result"] = await loop.run_in_executor(self.__executor, run_job, record["job"], record["telemetry"])
+                record["status"] = "done"
+
+            except Exception as exception:
+                record["status"], record["error"] = "failed", _FORMATTING.sub('', str(exception)) or type(exception).__name__
+
+            record["finished"] = time()
+            self.__follow(record)
+            if exists(record["telemetry"]):
+                remove(record["telemetry"])
+
+            self.__finished.append(job_id)
+            while len(self.__finished) > self.__retained_jobs:
+                del self.__jobs[self.__finished.pop(0)]
+
+    def status(self, job_id: str) -> Dict | None:
+        """
+        :param str job_id: The job's id.
+        :return: Dict | None, the job's status, progress, timings and, once it's done, its result. None if the job is
+        unknown, or has been forgotten.
+        """
+        if job_id not in self.__jobs:
+            return None
+
+        record = self.__jobs[job_id]
+        if record["status"] == "running":
+            self.__follow(record)
+
+        return {
+            "id": job_id,
+            "status": record["status"],
+            "progress": {**record["progress"], "max_generations": record["job"].get("parameters", {}).get("max_generations", _MAX_GENERATIONS)},
+            "queue_seconds": (record["started"] or time()) - record["submitted"],
+            "run_seconds": (record["finished"] or time()) - record["started"] if record["started"] else 0.,
+            "result": record["result"],
+            "error": record["error"]
+        }
+
+    def health(self) -> Dict:
+        """
+        :return: Dict, the number of workers, and of the jobs that are queued, running and finished.
+        """
+        statuses = [record["status"] for record in self.__jobs.values()]
+
+        return {
+            "workers": self.__workers,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "finished": statuses.count("done") + statuses.count("failed")
+        }
+
+    def route(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        """
+        Answers a request.
+        :param str method: The HTTP method, e.g. "GET".
+        :param str target: The path requested, e.g. "/jobs/1".
+        :param bytes body: The body of the request.
+        :return: Tuple[int, Dict], the HTTP status code and the JSON response.
+        """
+        path = target.split('?')[0].rstrip('/')
+
+        if path == "/health":
+            return (200, self.health()) if method == "GET" else (405, {"error": "Use GET"})
+
+        if path == "/jobs":
+            if method == "GET":
+                return 200, {"jobs": [{"id": job_id, "status": record["status"]} for job_id, record in self.__jobs.items()]}
+
+            if method != "POST":
+                return 405, {"error": "Use GET or POST"}
+
+            try:
+                job = loads(body or b"null")
+            except ValueError:
+                return 400, {"error": "The body must be a JSON job"}
+
+            problem = check_job(job)
+            return (400, {"error": problem}) if problem else (202, self.submit(job))
+
+        if path.startswith("/jobs/"):
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+
+            status = self.status(path[len("/jobs/"):])
+            return (200, status) if status is not None else (404, {"error": f"There's no job '{path[len('/jobs/'):]}'"})
+
+        return 404, {"error": f"There's nothing at '{path}'"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Reads an HTTP request from a connection, and writes its response before closing it.
+        :return: None
+        """
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(' ', 2)
+
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            status, response = self.route(method, target, body)
+
+        except (ValueError, asyncio.IncompleteReadError):
+            status, response = 400, {"error": "The request couldn't be read"}
+
+        payload = dumps(response).encode()
+        writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT, socket_path: str | None = None, workers: int | None = SERVICE_WORKERS) -> None:
+    """
+    Runs the service until it's interrupted.
+    :param str host: The host to listen on.
+    :param int port: The port to listen on, 0 picks a free one.
+    :param str | None socket_path: A Unix socket to listen on instead of the host and port.
+    :param int | None workers: The number of worker processes. If None is specified, there's one for each CPU.
+    :return: None
+    """
+    service = PackingService(workers)
+    warm_up = await service.start()
+
+    if socket_path is not None:
+        server = await asyncio.start_unix_server(service.handle, socket_path)
+        address = socket_path
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        address = "{}:{}".format(*server.sockets[0].getsockname()[:2])
+
+    # The first line printed, so whatever started the service can find it (e.g. service_load.py with --port 0).
+    print(f"Serving packing jobs on {address} with {service.workers} workers, warmed up in {warm_up:.2f}s", flush=True)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+        if socket_path is not None and exists(socket_path):
+            remove(socket_path)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Runs a local service that packs shipments within pre-warmed worker processes.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="The port to listen on, 0 picks a free one.")
+    parser.add_argument("--socket", default=None, help="A Unix socket to listen on instead of the host and port.")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="The number of worker processes, one for each CPU if it isn't given.")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.socket, args.workers))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,166 @@
+"""
+Load tests a local packing job service (service.py) with a batch of synthetic jobs, submitted by several clients at
+once, and reports the latency and throughput of the jobs. With --cold, some of the same jobs are also run within a
+fresh Python process each, as they would be without the service, to compare against.
+
+Usage: python service_load.py [--jobs 20] [--clients 4] [--cylinders 30] [--max-generations 50] [--cold 3]
+       python service_load.py --spawn [--workers N] ...      starts a service of its own on a free port, and stops it after
+       python service_load.py --port 8765 | --socket path ...  uses a service that's already running
+"""
+
+from config import SERVICE_HOST, SERVICE_PORT
+from client import PackingClient
+from synthetic import synthetic_instance
+from concurrent.futures import ThreadPoolExecutor
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict, List, Tuple
+from json import dumps
+from os.path import dirname, abspath
+
+import numpy as np
+import subprocess
+import signal
+import sys
+import re
+
+
+def make_jobs(num_jobs: int, num_cylinders: int, weight_tightness: float, **parameters) -> List[Dict]:
+    """
+    Generates a synthetic instance for each job, each drawn with a seed of its own.
+    :param int num_jobs: The number of jobs.
+    :param int num_cylinders: The number of cylinders of each job.
+    :param float weight_tightness: Roughly how many bins each job needs.
+    :param parameters: Any keyword arguments of run_ga() in service.JOB_PARAMETERS, e.g. max_generations.
+    :return: List[Dict], the keyword arguments of PackingClient.submit() for each job.
+    """
+    jobs = []
+    for seed in range(num_jobs):
+        (container_width, container_height, max_weight), cylinders = synthetic_instance(num_cylinders, seed=seed, weight_tightness=weight_tightness)
+        jobs.append({"cylinders": cylinders, "container_width": container_width, "container_height": container_height,
+                     "max_weight": max_weight, "seed": seed, **parameters})
+
+    return jobs
+
+
+def start_service(workers: int | None) -> Tuple[subprocess.Popen, int, float]:
+    """
+    Starts a service on a free port, and waits for its workers to warm up.
+    :param int | None workers: The number of worker processes. If None is specified, there's one for each CPU.
+    :return: Tuple[subprocess.Popen, int, float], the service's process, its port and the time it took to start.
+    """
+    start_time = perf_counter()
+    command = [sys.executable, "service.py", "--port", "0"] + (["--workers", str(workers)] if workers else [])
+    process = subprocess.Popen(command, cwd=dirname(abspath(__file__)), stdout=subprocess.PIPE, text=True)
+
+    line = process.stdout.readline()
+    match = re.search(r":(\d+) with", line)
+    if match is None:
+        process.kill()
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: The service didn't start: {line.strip() or 'no output'}\033[0m")
+
+    return process, int(match.group(1)), perf_counter() - start_time
+
+
+def run_load(client: PackingClient, jobs: List[Dict], clients: int) -> Dict:
+    """
+    Submits every job through several clients at once, each waiting for its job to finish before submitting another.
+    :param PackingClient client: The client of the service.
+    :param List[Dict] jobs: The keyword arguments of PackingClient.submit() for each job.
+    :param int clients: The number of jobs submitted at once.
+    :return: Dict, the latency (from submitting a job to receiving its result), time queued and time run of the jobs,
+    and their throughput.
+    """
+    def run(job: Dict) -> Tuple[float, float, float]:
+        job = dict(job)
+        job_start = perf_counter()
+        status = client.wait(client.submit(job.pop("cylinders"), **job), poll=.02)
+        return perf_counter() - job_start, status["queue_seconds"], status["run_seconds"]
+
+    start_time = perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies, queued, ran = (np.array(values) for values in zip(*executor.map(run, jobs)))
+    wall_time = perf_counter() - start_time
+
+    return {
+        "Jobs": len(jobs),
+        "Clients": clients,
+        "Wall Time": wall_time,
+        "Jobs/s": len(jobs) / wall_time,
+        "Latency p50": float(np.percentile(latencies, 50)),
+        "Latency p95": float(np.percentile(latencies, 95)),
+        "Latency Max": float(latencies.max()),
+        "Mean Queued": float(queued.mean()),
+        "Mean Run": float(ran.mean()),
+        "Mean Overhead": float((latencies - queued - ran).mean())  # the time spent outside of the queue and the worker
+    }
+
+
+def run_cold(jobs: List[Dict]) -> Dict:
+    """
+    Runs each job within a fresh Python process, as it would be without the service.
+    :param List[Dict] jobs: The keyword arguments of PackingClient.submit() for each job.
+    :return: Dict, the latency (from starting the process to it exiting) and time run of the jobs.
+    """
+    latencies, ran = [], []
+    for job in jobs:
+        payload = {**{key: job[key] for key in ("container_width", "container_height", "max_weight", "seed")},
+                   "cylinders": [(cylinder.id, cylinder.diameter, cylinder.weight) for cylinder in job["cylinders"]],
+                   "parameters": {key: value for key, value in job.items() if key not in ("cylinders", "container_width", "container_height", "max_weight", "seed")}}
+
+        start_time = perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys, json; from service import run_job; print(run_job(json.load(sys.stdin), None)['seconds'])"],
+            cwd=dirname(abspath(__file__)), input=dumps(payload), capture_output=True, text=True, check=True
+        ).stdout
+        latencies.append(perf_counter() - start_time)
+        ran.append(float(output.split()[-1]))
+
+    return {
+        "Jobs": len(jobs),
+        "Latency p50": float(np.percentile(latencies, 50)),
+        "Latency Max": float(max(latencies)),
+        "Mean Run": float(np.mean(ran)),
+        "Mean Overhead": float(np.mean(latencies) - np.mean(ran))  # mostly the start up of Python and the imports
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Load tests a local packing job service.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--socket", default=None, help="The Unix socket of a running service.")
+    parser.add_argument("--spawn", action="store_true", help="Starts a service of its own, rather than using a running one.")
+    parser.add_argument("--workers", type=int, default=None, help="The number of workers of a spawned service.")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=4, help="The number of jobs submitted at once.")
+    parser.add_argument("--cylinders", type=int, default=30, help="The number of cylinders of each job.")
+    parser.add_argument("--weight-tightness", type=float, default=1., help="Roughly how many bins each job needs.")
+    parser.add_argument("--population-size", type=int, default=50)
+    parser.add_argument("--max-generations", type=int, default=50)
+    parser.add_argument("--cold", type=int, default=0, help="The number of jobs to also run within a fresh process each.")
+    args = parser.parse_args()
+
+    _jobs = make_jobs(args.jobs, args.cylinders, args.weight_tightness, population_size=args.population_size, max_generations=args.max_generations)
+
+    _process, _port = None, args.port
+    if args.spawn:
+        _process, _port, _start_up = start_service(args.workers)
+        print(f"Started a service on port {_port} in {_start_up:.2f}s")
+
+    try:
+        _client = PackingClient(args.host, _port, args.socket, timeout=60.)
+        print(f"Service: {_client.health()}")
+
+        for _name, _value in run_load(_client, _jobs, args.clients).items():
+            print(f"\t{_name:<16}{_value:.3f}" if isinstance(_value, float) else f"\t{_name:<16}{_value}")
+
+        if args.cold:
+            print("Each job within a fresh process:")
+            for _name, _value in run_cold(_jobs[:args.cold]).items():
+                print(f"\t{_name:<16}{_value:.3f}" if isinstance(_value, float) else f"\t{_name:<16}{_value}")
+
+    finally:
+        if _process is not None:
+            _process.send_signal(signal.SIGINT)
+            _process.wait()
@@ -0,0 +1,89 @@
+from config import STAGNATION_GENERATIONS, TARGET_FITNESS, BIN_TIME_BUDGET, TOTAL_TIME_BUDGET, DIVERSITY_FLOOR
+from typing import Callable
+from time import perf_counter, time
+
+
+class StoppingCriteria:
+    """
+    Decides when the evolution of a bin should stop. Every criterion that's given is checked after each generation, and
+    the evolution stops as soon as any of them are met. The maximum number of generations always applies.
+    """
+
+    def __init__(self, max_generations: int, *,
+                 stagnation: int | None = STAGNATION_GENERATIONS,
+                 target_fitness: float | None = TARGET_FITNESS,
+                 bin_time_budget: float | None = BIN_TIME_BUDGET,
+                 total_time_budget: float | None = TOTAL_TIME_BUDGET,
+                 diversity_floor: float | None = DIVERSITY_FLOOR):
+        """
+        :param int max_generations: The number of generations to compute for, at most.
+        :param int | None stagnation: Stop once the best fitness hasn't improved for this many generations.
+        :param float | None target_fitness: Stop once the best fitness reaches this value.
+        :param float | None bin_time_budget: Stop once a bin has been evolving for this many seconds.
+        :param float | None total_time_budget: Stop once this many seconds have passed since the run started, across
+        every bin.
+        :param float | None diversity_floor: Stop once the fraction of distinct position strings in the population falls
+        below this value.
+        """
+        self.__max_generations = max_generations
+        self.__stagnation = stagnation
+        self.__target_fitness = target_fitness
+        self.__bin_time_budget = bin_time_budget
+        self.__total_time_budget = total_time_budget
+        self.__diversity_floor = diversity_floor
+
+        # The wall-clock time, from time(), that the run must finish by. It's shared by any worker processes.
+        self.__deadline: float | None = None
+        self.__bin_start = 0.
+
+    @property
+    def max_generations(self) -> int:
+        return self.__max_generations
+
+    def start_run(self) -> None:
+        """
+        Starts the clock of the total time budget, which must be done before any bin is evolved.
+        :return: None
+        """
+        if self.__total_time_budget is not None:
+            self.__deadline = time() + self.__total_time_budget
+
+    def start_bin(self) -> None:
+        """
+        Starts the clock of the time budget of a bin.
+        :return: None
+        """
+        self.__bin_start = perf_counter()
+
+    def check(self, generations: int, last_improvement: int, best_fitness: float, diversity: Callable[[], float]) -> str | None:
+        """
+        Checks whether the evolution of a bin should stop.
+        :param int generations: The number of generations that have been computed.
+        :param int last_improvement: The generation at which the best fitness last improved.
+        :param float best_fitness: The best fitness found so far.
+        :param Callable[[], float] diversity: Computes the fraction of distinct position strings in the population, only
+        called when there's a diversity floor.
+        :return: str | None, the reason to stop, or None if the evolution should continue.
+        """
+        if generations >= self.__max_generations:
+            return "Max Generations"
+
+        if generations == 0:  # Every other criterion needs at least one generation to judge by.
+            return None
+
+        if self.__target_fitness is not None and best_fitness >= self.__target_fitness:
+            return "Target Fitness"
+
+        if self.__stagnation is not None and generations - 1 - last_improvement >= self.__stagnation:
+            return "Stagnation"
+
+        if self.__diversity_floor is not None and diversity() < self.__diversity_floor:
+            return "Diversity Floor"
+
+        if self.__bin_time_budget is not None and perf_counter() - self.__bin_start >= self.__bin_time_budget:
+            return "Bin Time Budget"
+
+        if self.__deadline is not None and time() >= self.__deadline:
+            return "Total Time Budget"
+
+        return None
@@ -0,0 +1,91 @@
+from config import CYLINDER_TYPES, CONTAINER_WIDTH, CONTAINER_HEIGHT
+from TEST import TestCylinder
+from typing import Tuple
+from math import sqrt, pi, ceil
+import numpy as np
+
+# The ways the diameters and weights of the cylinders can be drawn.
+DISTRIBUTIONS = ("cylinder types", "uniform", "lognormal")
+
+# The weight of a cylinder per unit of its area, for the distributions that derive weights from diameters: the mean of
+# that of config.CYLINDER_TYPES, so every distribution is on a similar scale.
+_WEIGHT_PER_AREA = float(np.mean([weight / (pi * (diameter / 2) ** 2) for weight, diameter in CYLINDER_TYPES]))
+
+
+def _draw_cylinders(rng: np.random.Generator, num_cylinders: int, distribution: str, diameter_range: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws the diameter and weight of each cylinder.
+    :return: Tuple[np.ndarray, np.ndarray], the diameters and weights.
+    """
+    if distribution == "cylinder types":
+        weights, diameters = np.array(CYLINDER_TYPES, dtype=float)[rng.integers(len(CYLINDER_TYPES), size=num_cylinders)].T
+        return diameters, weights
+
+    low, high = diameter_range
+    if distribution == "uniform":
+        diameters = rng.uniform(low, high, num_cylinders)
+        densities = rng.uniform(.5, 1.5, num_cylinders)  # some cylinders hold heavier cargo than others
+
+    else:  # a long tail of large cylinders, with most near the smallest
+        diameters = np.clip(low * rng.lognormal(0., .35, num_cylinders), low, high)
+        densities = rng.lognormal(0., .25, num_cylinders)
+
+    diameters = np.round(diameters, 2)
+    weights = np.round(_WEIGHT_PER_AREA * densities * np.pi * np.square(diameters / 2), 1)
+
+    return diameters, weights
+
+
+def synthetic_instance(num_cylinders: int, *, seed: int = 0, distribution: str = "cylinder types", fill_density: float = .5,
+                       weight_tightness: float = 1., aspect_ratio: float = CONTAINER_WIDTH / CONTAINER_HEIGHT,
+                       diameter_range: Tuple[float, float] = (1., 2.)) -> Tuple[Tuple[float, float, float], Tuple[TestCylinder, ...]]:
+    """
+    Generates a test instance of any size, in the same form as test_instances(), so it can be passed straight to
+    run_ga() or a benchmark. The same seed and parameters always give the same instance.
+    :param int num_cylinders: The number of cylinders.
+    :param int seed: The seed the instance is drawn with.
+    :param str distribution: How the diameters and weights are drawn: "cylinder types" (picked from config's
+    CYLINDER_TYPES), "uniform" (diameters uniformly within diameter_range) or "lognormal" (mostly small diameters, with
+    a long tail of large ones). For the last two, weights grow with area, with some cylinders denser than others.
+    :param float fill_density: The fraction (0-1] of the container's area the cylinders of each bin would cover.
+    :param float weight_tightness: How tight the weight limit is: the total weight is this many times the maximum
+    weight, so roughly this many bins are needed. At 1, every cylinder fits into a single bin. The maximum weight is
+    never below the heaviest cylinder, so none are discarded.
+    :param float aspect_ratio: The width of the container over its height.
+    :param Tuple[float, float] diameter_range: The smallest and largest diameters of the "uniform" and "lognormal"
+    distributions.
+    :return: Tuple[Tuple[float, float, float], Tuple[TestCylinder, ...]], the (width, height, max_weight) of the
+    container, and the cylinders.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: Unknown distribution '{distribution}', use one of {list(DISTRIBUTIONS)}\033[0m")
+
+    if num_cylinders < 1 or not 0 < fill_density <= 1 or weight_tightness <= 0:
+        raise Exception(f"\r\033[1m\033[31mCustom Exception: A synthetic instance needs at least 1 cylinder, a fill density within (0, 1] and a positive weight tightness\033[0m")
+
+    rng = np.random.default_rng(seed)
+    diameters, weights = _draw_cylinders(rng, num_cylinders, distribution, diameter_range)
+
+    # - Size the weight limit, then the container to the cylinders of a bin - #
+    total_weight = float(weights.sum())
+    max_weight = max(total_weight / weight_tightness, float(weights.max()))
+    bins = total_weight / max_weight
+
+    area = float(np.sum(np.pi * np.square(diameters / 2))) / bins / fill_density
+    height = sqrt(area / aspect_ratio)
+    scale = max(1., float(diameters.max()) / min(height, height * aspect_ratio))  # the largest cylinder must still fit
+
+    container = (round(height * aspect_ratio * scale, 2), round(height * scale, 2), float(ceil(max_weight)))  # rounded up, so the cylinders still fit whatever order they're added in
+    cylinders = tuple(TestCylinder(i + 1, float(diameter), float(weight)) for i, (diameter, weight) in enumerate(zip(diameters, weights)))
+
+    return container, cylinders
+
+
+if __name__ == "__main__":
+    for _distribution in DISTRIBUTIONS:
+        (_width, _height, _max_weight), _cylinders = synthetic_instance(1000, distribution=_distribution, weight_tightness=10)
+
+        print(f"{_distribution:<16}"
+              f"Container: {_width} x {_height}, max weight {_max_weight}\t"
+              f"Diameters: {min(c.diameter for c in _cylinders)}-{max(c.diameter for c in _cylinders)}\t"
+              f"Weights: {min(c.weight for c in _cylinders)}-{max(c.weight for c in _cylinders)}")
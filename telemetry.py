@@ -0,0 +1,130 @@
+from population_store import diversity
+from threading import Thread
+from queue import Queue
+from typing import Dict, List
+from json import dumps
+from math import isfinite
+import numpy as np
+
+
+def _number(value: float) -> float | None:
+    """Keeps a value as a plain float, or None when it isn't finite, so every record is valid JSON."""
+    return float(value) if isfinite(value) else None
+
+
+class TelemetryWriter:
+    """
+    Streams a compact record of every generation of each bin into a JSON lines file whilst it's evolved, so the
+    progress of a run can be followed (e.g. with tail -f) and loaded into analysis tools without parsing any text. The
+    final placements of each bin are written as numbers too.
+    The records are summarised and written by a background thread, which writes everything that has queued up at once,
+    so the evolution never waits on the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param str path: The JSON lines file the records are written into, which is replaced.
+        """
+        self.__path = path
+        self.__file = open(path, 'w')
+        self.__queue: Queue = Queue()
+        self.__records = 0
+
+        self.__thread = Thread(target=self.__write, daemon=True)
+        self.__thread.start()
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def record_generation(self, bin_focus: int, generation: int, fitnesses: np.ndarray, genomes: np.ndarray, lengths: np.ndarray,
+                          counters: Dict[str, int], seconds: float) -> None:
+        """
+        Queues the record of a generation, which is summarised in the background.
+        :param int bin_focus: The bin of cylinders the generation belongs to.
+        :param int generation: The index of the generation.
+        :param np.ndarray fitnesses: The fitness of each group of the generation, which mustn't be changed afterwards.
+        :param np.ndarray genomes: (groups, width) the position strings of the next generation, as a copy.
+        :param np.ndarray lengths: (groups,) the length of each of those position strings, as a copy.
+        :param Dict[str, int] counters: The running totals of the bin's decoding, e.g. {'decodes': 500}.
+        :param float seconds: The time the generation took.
+        :return: None
+        """
+        self.__queue.put(("generation", bin_focus, generation, fitnesses, genomes, lengths, counters, seconds))
+        self.__records += 1
+
+    def record_placements(self, bin_focus: int, placements: Dict[str, float | List]) -> None:
+        """
+        Queues the record of the final placements of a bin.
+        :param int bin_focus: The bin of cylinders.
+        :param Dict[str, float | List] placements: The best group of the bin's summary, i.e. its weight, fitness and the
+        id, diameter, weight and centre of each cylinder.
+        :return: None
+        """
+        self.__queue.put(("placements", bin_focus, placements))
+        self.__records += 1
+
+    @staticmethod
+    def __summarise(item: tuple) -> Dict:
+        """
+        Summarises a queued record into the dictionary that's written.
+        :param tuple item: The queued record.
+        :return: Dict
+        """
+        if item[0] == "placements":
+            _, bin_focus, placements = item
+            return {"type": "placements", "bin": bin_focus, **{key.lower(): _number(value) if isinstance(value, float) else value for key, value in placements.items()}}
+
+        _, bin_focus, generation, fitnesses, genomes, lengths, counters, seconds = item
+        finite = fitnesses[np.isfinite(fitnesses)]
+
+        return {
+            "type": "generation",
+            "bin": bin_focus,
+            "generation": generation,
+            "best": _number(fitnesses.max()),
+            "mean": _number(finite.mean()) if len(finite) else None,
+            "std": _number(finite.std()) if len(finite) else None,
+            "infinite": int(len(fitnesses) - len(finite)),
+            "diversity": diversity(genomes, lengths),
+            **counters,
+            "seconds": seconds
+        }
+
+    def __write(self) -> None:
+        """
+        The loop of the background thread, which writes the queued records until it's handed None.
+        :return: None
+        """
+        while True:
+            items = [self.__queue.get()]
+            while not self.__queue.empty():
+                items.append(self.__queue.get_nowait())
+
+            lines = [dumps(self.__summarise(item)) for item in items if item is not None]
+            if lines:
+                self.__file.write('\n'.join(lines) + '\n')
+                self.__file.flush()
+
+            if items[-1] is None:
+                break
+
+        self.__file.close()
+
+    def close(self) -> None:
+        """
+        Waits for every queued record to be written, and closes the file.
+        :return: None
+        """
+        self.__queue.put(None)
+        self.__thread.join()
+
+    def get_summary(self) -> Dict:
+        """
+        Summarises the records that were written.
+        :return: Dict
+        """
+        return {
+            "Path": self.__path,
+            "Records": self.__records
+        }
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The modules of the repository are imported by name (e.g. from config import ...), as when run from its root.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,147 @@
+from crossovers import single_point_crossover, multi_point_crossover, uniform_crossover, davis_order_crossover
+from crossovers import batch_single_point_crossover, batch_multi_point_crossover, batch_uniform_crossover, batch_davis_order_crossover
+from crossovers.batched import _random_points
+from mutation import batch_mutate
+from population import Population
+from types import SimpleNamespace
+from typing import Iterable, List
+import crossovers.single_point
+import crossovers.multi_point
+import crossovers.uniform
+import crossovers.davis_order
+import population
+import numpy as np
+import pytest
+import random
+
+SIDES, WIDTH, GROUPS, OFFSPRING = 8, 12, 16, 64
+
+
+def population_matrix(seed: int, min_length: int = 2):
+    """Position strings of differing lengths, as a generation holds once some cylinders have been discarded."""
+    rng = random.Random(seed)
+    lengths = np.array([rng.randint(min_length, WIDTH) for _ in range(GROUPS)])
+    genomes = np.zeros((GROUPS, WIDTH), dtype=np.int64)
+    for row, length in enumerate(lengths):
+        genomes[row, :length] = rng.sample(range((WIDTH + 1) * SIDES), k=int(length))
+
+    parents = np.array([rng.sample(range(GROUPS), k=2) for _ in range(OFFSPRING)])
+
+    return genomes, lengths, parents
+
+
+def rows(genomes: np.ndarray, lengths: np.ndarray) -> List[List[int]]:
+    return [genome[:length].tolist() for genome, length in zip(genomes, lengths)]
+
+
+def replay(values: Iterable):
+    """A stand-in for a function of the random module, which returns the given values in turn."""
+    values = iter(values)
+    return lambda *args, **kwargs: next(values)
+
+
+def choose(chosen: bool):
+    """A stand-in for random.choice, which picks the second of a pair if chosen."""
+    return lambda pair: pair[int(chosen)]
+
+
+def test_single_point(monkeypatch):
+    genomes, lengths, parents = population_matrix(1)
+    offspring, offspring_lengths = batch_single_point_crossover(genomes, lengths, parents, np.random.default_rng(1))
+
+    # The same draws, in the same order, as the batched crossover makes.
+    draws = np.random.default_rng(1)
+    points = (draws.random(OFFSPRING) * lengths[parents[:, 0]]).astype(np.int64)
+    chosen = draws.random(OFFSPRING) < .5
+
+    for i, (first, second) in enumerate(parents):
+        monkeypatch.setattr(crossovers.single_point, "randrange", replay([int(points[i])]))
+        monkeypatch.setattr(crossovers.single_point, "choice", choose(chosen[i]))
+        expected = single_point_crossover(rows(genomes, lengths)[first], rows(genomes, lengths)[second])
+
+        assert offspring[i, :offspring_lengths[i]].tolist() == expected
+        assert not offspring[i, offspring_lengths[i]:].any()
+
+
+@pytest.mark.parametrize("num_crossovers", [2, 3, 4])
+def test_multi_point(monkeypatch, num_crossovers):
+    genomes, lengths, parents = population_matrix(2, num_crossovers)
+    offspring, offspring_lengths = batch_multi_point_crossover(genomes, lengths, parents, np.random.default_rng(2), crossovers=num_crossovers)
+
+    draws = np.random.default_rng(2)
+    points = _random_points(lengths[parents[:, 0]], num_crossovers, WIDTH, draws)
+    chosen = draws.random(OFFSPRING) < .5
+
+    for i, (first, second) in enumerate(parents):
+        monkeypatch.setattr(crossovers.multi_point, "sample", replay([points[i].tolist()]))
+        monkeypatch.setattr(crossovers.multi_point, "choice", choose(chosen[i]))
+        expected = multi_point_crossover(rows(genomes, lengths)[first], rows(genomes, lengths)[second], crossovers=num_crossovers)
+
+        assert offspring[i, :offspring_lengths[i]].tolist() == expected
+        assert not offspring[i, offspring_lengths[i]:].any()
+
+
+@pytest.mark.parametrize("bias", [0, .3, -.3])
+def test_uniform(monkeypatch, bias):
+    genomes, lengths, parents = population_matrix(3)
+    # The reference swaps every position number of the first parent, so it can't be longer than the second.
+    parents = np.where((lengths[parents[:, 0]] > lengths[parents[:, 1]])[:, None], parents[:, ::-1], parents)
+    offspring, offspring_lengths = batch_uniform_crossover(genomes, lengths, parents, np.random.default_rng(3), bias=bias)
+
+    draws = np.random.default_rng(3)
+    swaps = draws.random((OFFSPRING, WIDTH))
+    chosen = draws.random(OFFSPRING) < .5
+
+    for i, (first, second) in enumerate(parents):
+        monkeypatch.setattr(crossovers.uniform, "random", replay(swaps[i].tolist()))
+        monkeypatch.setattr(crossovers.uniform, "choice", choose(chosen[i]))
+        expected = uniform_crossover(rows(genomes, lengths)[first], rows(genomes, lengths)[second], bias=bias)
+
+        assert offspring[i, :offspring_lengths[i]].tolist() == expected
+
+
+def test_davis_order(monkeypatch):
+    genomes, lengths, parents = population_matrix(4)
+    # Parents sharing position numbers, so that some of those outside each segment can't fill the offspring.
+    genomes[GROUPS // 2:] = np.where(genomes[GROUPS // 2:] % 3 == 0, genomes[:GROUPS // 2], genomes[GROUPS // 2:])
+    genomes = np.where(np.arange(WIDTH) < lengths[:, None], genomes, 0)
+    offspring, offspring_lengths = batch_davis_order_crossover(genomes, lengths, parents, np.random.default_rng(4))
+
+    draws = np.random.default_rng(4)
+    points = _random_points(lengths[parents[:, 0]], 2, WIDTH, draws)
+    chosen = draws.random(OFFSPRING) < .5
+
+    assert (offspring_lengths < lengths[parents[:, 0]]).any()
+
+    for i, (first, second) in enumerate(parents):
+        monkeypatch.setattr(crossovers.davis_order, "sample", replay([points[i].tolist()]))
+        monkeypatch.setattr(crossovers.davis_order, "choice", choose(chosen[i]))
+        expected = davis_order_crossover(rows(genomes, lengths)[first], rows(genomes, lengths)[second])
+
+        # Where the reference leaves a gap, the batched offspring is shortened instead.
+        assert offspring[i, :offspring_lengths[i]].tolist() == [position for position in expected if position is not None]
+        assert not offspring[i, offspring_lengths[i]:].any()
+
+
+@pytest.mark.parametrize("mutation_rate", [.1, .5, 1.])
+def test_mutation(monkeypatch, mutation_rate):
+    genomes, lengths, _ = population_matrix(5)
+    mutated = batch_mutate(genomes, lengths, mutation_rate, SIDES, np.random.default_rng(5))
+
+    # The batched mutation picks the nth allowed position number, where the reference picks from a set of them.
+    draws = np.random.default_rng(5)
+    mutations = draws.random(genomes.shape)
+    valid = np.arange(WIDTH) < lengths[:, None]
+    ranks = iter(draws.random(int((valid & (mutations < mutation_rate)).sum())).tolist())
+
+    reference = SimpleNamespace(_Population__mutation_rate=mutation_rate, _Population__cylinder_sides=SIDES)
+    for i, group in enumerate(rows(genomes, lengths)):
+        monkeypatch.setattr(population, "random", SimpleNamespace(
+            random=replay(mutations[i].tolist()),
+            choice=lambda allowed: sorted(allowed)[int(next(ranks) * len(allowed))]
+        ))
+
+        assert mutated[i, :lengths[i]].tolist() == Population.mutate(reference, group)
+        assert (mutated[i, lengths[i]:] == genomes[i, lengths[i]:]).all()
+
+    assert next(ranks, None) is None  # every mutation the batch drew was made by the reference too
@@ -0,0 +1,55 @@
+from cylinders import Cylinder
+from population import Bins
+from typing import List
+import pytest
+import random
+
+MAX_WEIGHT = 100.
+
+
+def cylinders(seed: int) -> List[Cylinder]:
+    """Cylinders heaviest first, as a Population packs them, with repeated weights and some too heavy for any bin."""
+    rng = random.Random(seed)
+    weights = [rng.choice([rng.randint(1, 60), round(rng.uniform(1, 120), 2), 25.]) for _ in range(200)]
+
+    return [Cylinder(8, 1., weight, id_=i) for i, weight in enumerate(sorted(weights, reverse=True))]
+
+
+def contents(bins: Bins) -> List[List[int]]:
+    return [[cylinder.id for cylinder in packed.cylinders] for packed in bins.bins]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_first_fit_matches_pack_cylinder_ff(seed):
+    packed, expected = Bins(MAX_WEIGHT), Bins(MAX_WEIGHT)
+    packed.pack_cylinders(cylinders(seed), "first fit")
+    for cylinder in cylinders(seed):
+        expected.pack_cylinder_ff(cylinder)
+
+    assert contents(packed) == contents(expected)
+    assert packed.total == expected.total
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_best_fit_matches_a_scan(seed):
+    packed = Bins(MAX_WEIGHT)
+    packed.pack_cylinders(cylinders(seed), "best fit")
+
+    # Every bin is checked, and the fullest with room is taken (the first of those equally full). Each load is added
+    # to as a Bin does, as sum() compensates for rounding, so equal loads could differ.
+    expected: List[List[Cylinder]] = []
+    loads: List[float] = []
+    for cylinder in cylinders(seed):
+        if cylinder.weight > MAX_WEIGHT:
+            continue
+
+        fits = [i for i, load in enumerate(loads) if load + cylinder.weight <= MAX_WEIGHT]
+        if not fits:
+            expected.append([])
+            loads.append(0.)
+
+        i = max(fits, key=lambda i: (loads[i], -i)) if fits else len(loads) - 1
+        expected[i].append(cylinder)
+        loads[i] += cylinder.weight
+
+    assert contents(packed) == [[cylinder.id for cylinder in bin_] for bin_ in expected]
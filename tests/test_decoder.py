@@ -0,0 +1,143 @@
+from cylinders import Cylinder, CylinderGroup
+from decoder import BatchDecoder, pad_groups
+from decode_cache import DecodeCache
+from decode_checkpoints import CheckpointStore
+from typing import List, Tuple
+import decode_checkpoints
+import numpy as np
+import pytest
+import random
+
+SIDES, WIDTH, HEIGHT = 8, 20., 15.
+
+# Cylinders whose diameters are large enough for the container to discard some of them.
+SPECS = [(round(random.Random(i).uniform(2., 5.), 2), float(random.Random(-i).randint(1, 60))) for i in range(24)]
+RADII, WEIGHTS = [diameter / 2 for diameter, _ in SPECS], [weight for _, weight in SPECS]
+
+
+def reference(genome: List[int], num_cylinders: int) -> CylinderGroup:
+    """
+    Decodes a position string with CylinderGroup.decode.
+    :param List[int] genome: The position string.
+    :param int num_cylinders: The number of cylinders the group considers.
+    :return: CylinderGroup, after decoding.
+    """
+    group = CylinderGroup([Cylinder(SIDES, diameter, weight) for diameter, weight in SPECS], num_cylinders, SIDES, WIDTH, HEIGHT)
+    group.recycle(list(genome))
+    group.decode()
+
+    return group
+
+
+def assert_matches_reference(result, genomes: List[List[int]], num_cylinders: List[int]) -> None:
+    for i, (genome, num) in enumerate(zip(genomes, num_cylinders)):
+        group = reference(genome, num)
+
+        assert result.group(i) == group.group
+        assert int(result.num_cylinders[i]) == group.num_cylinders
+        np.testing.assert_array_equal(result.centres[i], [cylinder.centre for cylinder in group.cylinders])
+        assert result.decoded[i].tolist() == [any(cylinder is decoded for decoded in group.decoded_cylinders) for cylinder in group.cylinders]
+        assert result.weights[i] == group.weight
+        assert result.fitnesses[i] == group.fitness()
+
+
+def first_generation(rng: random.Random, size: int) -> Tuple[List[List[int]], List[int]]:
+    """
+    Random position strings, as a population starts with, along with some beyond the maximum position number of their
+    cylinder (which are reset to 0) and some right on it.
+    """
+    n = len(SPECS)
+    genomes = [rng.sample(range(n * SIDES), k=n - 1) for _ in range(size)]
+    genomes[0] = [(i + 1) * SIDES for i in range(n - 1)]
+    genomes[1] = [(i + 1) * SIDES + 1 for i in range(n - 1)]
+
+    return genomes, [n] * size
+
+
+def next_generation(rng: random.Random, genomes: List[List[int]], num_cylinders: List[int]) -> List[List[int]]:
+    """Mutates the suffix of each position string, such that its prefix is shared with the last generation."""
+    offspring = []
+    for genome in genomes:
+        cut = rng.randrange(len(genome) + 1)
+        offspring.append(genome[:cut] + [rng.randrange((i + 1) * SIDES) for i in range(cut, len(genome))])
+
+    return offspring
+
+
+@pytest.fixture(params=[10 ** 6, 1], ids=["brute force", "spatial index"])
+def decoder(request):
+    decoder = BatchDecoder(SIDES, WIDTH, HEIGHT, workers=1, spatial_index_min_cylinders=request.param)
+    yield decoder
+    decoder.shutdown()
+
+
+def test_decode_matrix(decoder):
+    rng = random.Random(1)
+    genomes, num_cylinders = first_generation(rng, 30)
+    result = decoder.decode(genomes, num_cylinders, RADII, WEIGHTS)
+
+    assert_matches_reference(result, genomes, num_cylinders)
+    assert (result.num_cylinders < len(SPECS)).any()  # some cylinders were discarded
+
+    # The repaired position strings are shorter than the cylinders considered when the next generation is decoded.
+    repaired = [result.group(i) for i in range(len(genomes))]
+    offspring, num_cylinders = next_generation(rng, repaired, num_cylinders), result.num_cylinders.tolist()
+    assert_matches_reference(decoder.decode(offspring, num_cylinders, RADII, WEIGHTS), offspring, num_cylinders)
+
+
+def test_decode_cached(decoder):
+    rng = random.Random(2)
+    genomes, num_cylinders = first_generation(rng, 20)
+    genomes[5:10] = genomes[:5]  # repeated within a generation
+    cache = DecodeCache(1_000)
+
+    assert_matches_reference(decoder.decode(genomes, num_cylinders, RADII, WEIGHTS, cache), genomes, num_cylinders)
+    assert len(cache) == 15  # each distinct position string is only decoded once
+
+    # Every position string is a hit the second time around.
+    assert_matches_reference(decoder.decode(genomes, num_cylinders, RADII, WEIGHTS, cache), genomes, num_cylinders)
+    assert cache.hits == 20
+
+
+def test_decode_resumed(decoder):
+    rng = random.Random(3)
+    genomes, num_cylinders = first_generation(rng, 30)
+    checkpoints = CheckpointStore()
+    result = decoder.decode(genomes, num_cylinders, RADII, WEIGHTS, checkpoints=checkpoints)
+
+    # Offspring of both the position strings that were decoded, and the repaired strings they decoded into.
+    offspring = next_generation(rng, genomes[:15], num_cylinders[:15]) + next_generation(rng, [result.group(i) for i in range(15, 30)], num_cylinders[15:])
+    num_cylinders = num_cylinders[:15] + result.num_cylinders[15:].tolist()
+    assert_matches_reference(decoder.decode(offspring, num_cylinders, RADII, WEIGHTS, checkpoints=checkpoints), offspring, num_cylinders)
+    assert checkpoints.placements_saved > 0
+
+
+def test_decode_resumed_hash_collisions(decoder, monkeypatch):
+    # Every prefix of the same length has the same hash, so almost every match is a collision that has to be rejected.
+    monkeypatch.setattr(decode_checkpoints, "prefix_hashes", lambda positions: np.tile(np.arange(positions.shape[1], dtype=np.uint64), (len(positions), 1)))
+
+    rng = random.Random(4)
+    genomes, num_cylinders = first_generation(rng, 30)
+    checkpoints = CheckpointStore()
+    decoder.decode(genomes, num_cylinders, RADII, WEIGHTS, checkpoints=checkpoints)
+
+    offspring = next_generation(rng, genomes, num_cylinders)
+    assert_matches_reference(decoder.decode(offspring, num_cylinders, RADII, WEIGHTS, checkpoints=checkpoints), offspring, num_cylinders)
+    assert checkpoints.get_summary()["Groups Resumed"] < len(offspring)
+
+
+def test_decode_parallel():
+    rng = random.Random(5)
+    genomes, num_cylinders = first_generation(rng, 30)
+    decoder = BatchDecoder(SIDES, WIDTH, HEIGHT, workers=2, min_parallel_size=1)
+    checkpoints = CheckpointStore()
+
+    try:
+        result = decoder.decode(genomes, num_cylinders, RADII, WEIGHTS, checkpoints=checkpoints)
+        assert_matches_reference(result, genomes, num_cylinders)
+
+        offspring = next_generation(rng, genomes, num_cylinders)
+        positions, lengths = pad_groups(offspring, len(SPECS) - 1)
+        assert_matches_reference(decoder.decode_matrix(positions, lengths, num_cylinders, RADII, WEIGHTS, checkpoints=checkpoints), offspring, num_cylinders)
+    finally:
+        decoder.shutdown()
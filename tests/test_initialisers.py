@@ -0,0 +1,121 @@
+from decoder import BatchDecoder
+from initialisers import initial_genomes
+from main import run_ga
+from population import Population
+from typing import List, Tuple
+import TEST
+import numpy as np
+import pytest
+import random
+
+SIDES, SIZE = 8, 10
+INSTANCES = [key for key in range(1, 8) if len(TEST.test_instances(key)[1]) > 1]
+
+
+def instance(key: int) -> Tuple[float, float, List]:
+    """The container and cylinders of a test instance, heaviest first as a Population packs them."""
+    (width, height, _), cylinders = TEST.test_instances(key)
+    return width, height, sorted(cylinders, reverse=True, key=lambda cylinder: cylinder.weight)
+
+
+def decode(genomes: np.ndarray, cylinders: List, width: float, height: float):
+    n = len(cylinders)
+    return BatchDecoder(SIDES, width, height).decode_matrix(genomes, np.full(len(genomes), n - 1), np.full(len(genomes), n),
+                                                            [cylinder.radius for cylinder in cylinders], [cylinder.weight for cylinder in cylinders])
+
+
+def placement(result, i: int, cylinders: List) -> List[List[float]]:
+    return [[cylinder.diameter, cylinder.weight, *centre] for cylinder, centre in zip(cylinders, result.centres[i].tolist())]
+
+
+def greedy_placement(cylinders: List, width: float, height: float, seed: int) -> List[List[float]]:
+    """The placement of a greedily built group, which isn't the first so it's one of many."""
+    random.seed(seed)
+    genomes, _ = initial_genomes("greedy", SIZE, cylinders, SIDES, width, height)
+
+    return placement(decode(genomes, cylinders, width, height), SIZE - 1, cylinders)
+
+
+@pytest.mark.parametrize("method", ["greedy", "archive", "mixed"])
+@pytest.mark.parametrize("key", INSTANCES)
+def test_seeded_groups_decode_without_rejections(key, method):
+    width, height, cylinders = instance(key)
+    archive = [(0., greedy_placement(cylinders, width, height, key))]
+
+    random.seed(key)
+    genomes, counts = initial_genomes(method, SIZE, cylinders, SIDES, width, height, archive, .5)
+    seeded = counts["Archived"] + counts["Greedy"]
+    result = decode(genomes[:seeded], cylinders, width, height)
+
+    # Every position chosen is the first the decoder tries, so none are rejected and no cylinder is discarded.
+    assert seeded > 0
+    assert not result.rejected.any()
+    assert (result.num_cylinders == len(cylinders)).all()
+
+
+@pytest.mark.parametrize("key", INSTANCES)
+def test_guided_rebuild_reproduces_the_placement(key):
+    width, height, cylinders = instance(key)
+    archived = greedy_placement(cylinders, width, height, key)
+
+    # The rows of a placement are matched to the cylinders by their diameter and weight, so only the order of those
+    # that share both matters (which is the order they were placed in).
+    random.seed(key)
+    genomes, counts = initial_genomes("archive", SIZE, cylinders, SIDES, width, height, [(0., sorted(archived, key=lambda row: row[:2]))])
+    rebuilt = placement(decode(genomes[:1], cylinders, width, height), 0, cylinders)
+
+    # Cylinders of the same diameter and weight are interchangeable, so the placements are compared as multisets.
+    assert counts["Archived"] == 1
+    np.testing.assert_allclose(sorted(rebuilt), sorted(archived), atol=1e-9)
+
+
+@pytest.mark.parametrize("method, seeded_fraction, archived, expected", [
+    ("random", .2, 0, None),
+    ("random", .2, 1, (1, 0, 9)),
+    ("greedy", .2, 0, (0, 10, 0)),
+    ("greedy", .2, 1, (1, 9, 0)),
+    ("archive", .2, 0, (0, 0, 10)),
+    ("archive", .2, 3, (3, 0, 7)),
+    ("mixed", .2, 0, (0, 2, 8)),
+    ("mixed", .2, 3, (2, 0, 8)),
+    ("mixed", .5, 1, (1, 4, 5)),
+    ("mixed", 0., 0, (0, 0, 10)),
+    ("mixed", 0., 1, (1, 0, 9)),  # a warm start is seeded whatever the fraction
+])
+def test_counts(method, seeded_fraction, archived, expected):
+    width, height, cylinders = instance(7)
+    full = [(0., greedy_placement(cylinders, width, height, seed)) for seed in range(archived)]
+    # A placement holding fewer than half of the bin's cylinders is never rebuilt.
+    partial = (0., greedy_placement(cylinders, width, height, 0)[:len(cylinders) // 2 - 1])
+
+    genomes, counts = initial_genomes(method, SIZE, cylinders, SIDES, width, height, full + [partial] if full else [], seeded_fraction)
+
+    if expected is None:
+        assert genomes is None and counts == {"Archived": 0, "Greedy": 0, "Random": SIZE}
+    else:
+        assert genomes.shape == (SIZE, len(cylinders) - 1)
+        assert (counts["Archived"], counts["Greedy"], counts["Random"]) == expected
+
+
+@pytest.mark.parametrize("method", ["random", "greedy", "archive", "mixed"])
+def test_warm_start_seeds_a_group(method):
+    width, height, cylinders = instance(7)
+    max_weight = TEST.test_instances(7)[0][2]
+
+    random.seed(0)
+    best = run_ga(list(cylinders), len(cylinders), population_size=20, max_generations=10, max_weight=max_weight, container_width=width,
+                  container_height=height, visualise=False, verbose=False, record=False)["Bin 0"]["Best Cylinder Group"]
+
+    random.seed(1)
+    population = Population(20, list(cylinders), len(cylinders), .1, SIDES, max_weight, initialiser=method, seeded_fraction=0., verbose=False)
+    population.bin_cylinders()
+    population.set_dimensions(width, height)
+
+    population.set_warm_start(0, [[diameter, weight, *centre] for diameter, weight, centre in zip(best["Diameters"], best["Weights"], best["Centres"])], best["Fitness"])
+    population.generate_groups(0)
+    population.evolve(0)
+
+    # The first group of generation 0 decodes into the placement it was warm started from.
+    assert population.fitnesses[0] == pytest.approx(best["Fitness"])
+    initialisation = population.get_summary(0., 0)["Initialisation"]
+    assert initialisation["Warm Start"] and initialisation["Archived"] == 1
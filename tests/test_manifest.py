@@ -0,0 +1,99 @@
+from manifest import MANIFEST_COLUMNS, load_manifest, manifest_from_rows
+import json
+import numpy as np
+import pytest
+
+ROWS = [(1, 2.5, 40.), (2, 1.5, 25.), (7, 3., 60.)]
+
+
+def write_csv(path, rows):
+    path.write_text("\n".join([",".join(MANIFEST_COLUMNS)] + [",".join(map(str, row)) for row in rows]) + "\n")
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(dict(zip(MANIFEST_COLUMNS, row))) + "\n" for row in rows))
+
+
+def write_npy(path, rows):
+    np.save(path, np.array(rows, dtype=float))
+
+
+WRITERS = {".csv": write_csv, ".jsonl": write_jsonl, ".npy": write_npy}
+
+
+def assert_rows(manifest, rows):
+    assert [(cylinder.id, cylinder.diameter, cylinder.weight) for cylinder in manifest.cylinders()] == rows
+
+
+@pytest.mark.parametrize("extension", WRITERS)
+def test_load(tmp_path, extension):
+    path = tmp_path / f"manifest{extension}"
+    WRITERS[extension](path, ROWS)
+
+    assert_rows(load_manifest(str(path)), ROWS)
+
+
+def test_load_structured_npy(tmp_path):
+    path = tmp_path / "manifest.npy"
+    np.save(path, np.array(ROWS, dtype=[("id", np.int64), ("diameter", float), ("weight", float)]))
+
+    assert_rows(load_manifest(str(path)), ROWS)
+
+
+def test_from_rows():
+    assert_rows(manifest_from_rows(ROWS), ROWS)
+
+
+@pytest.mark.parametrize("extension", WRITERS)
+@pytest.mark.parametrize("id_", [3.9, 1.2])
+def test_load_rejects_fractional_ids(tmp_path, extension, id_):
+    path = tmp_path / f"manifest{extension}"
+    WRITERS[extension](path, ROWS + [(id_, 2., 30.)])
+
+    with pytest.raises(Exception, match="isn't a whole number.* row 4"):
+        load_manifest(str(path))
+
+
+def test_load_rejects_bool_ids(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    write_jsonl(path, ROWS + [(True, 2., 30.)])
+
+    with pytest.raises(Exception, match="isn't a whole number.* row 4"):
+        load_manifest(str(path))
+
+
+def test_load_rejects_bool_npy_ids(tmp_path):
+    path = tmp_path / "manifest.npy"
+    np.save(path, np.array([(True, 2., 30.)], dtype=[("id", bool), ("diameter", float), ("weight", float)]))
+
+    with pytest.raises(Exception, match="isn't a whole number.* row 1"):
+        load_manifest(str(path))
+
+
+@pytest.mark.parametrize("rows", [
+    [(1.2, 2., 30.), (1.9, 2., 30.)],
+    [(True, 2., 30.)],
+    [("a", 2., 30.)],
+    [(1, "wide", 30.)]
+])
+def test_from_rows_rejects_bad_rows(rows):
+    with pytest.raises(Exception, match="isn't a whole number.* row 1"):
+        manifest_from_rows(rows)
+
+
+@pytest.mark.parametrize("extension", WRITERS)
+def test_load_rejects_duplicated_ids(tmp_path, extension):
+    path = tmp_path / f"manifest{extension}"
+    WRITERS[extension](path, ROWS + [(2, 2., 30.)])
+
+    with pytest.raises(Exception, match=r"1 duplicated id\(s\), e.g. \[2"):
+        load_manifest(str(path))
+
+
+@pytest.mark.parametrize("extension", WRITERS)
+def test_load_rejects_non_positive_sizes(tmp_path, extension):
+    path = tmp_path / f"manifest{extension}"
+    WRITERS[extension](path, ROWS + [(9, 0., 30.)])
+
+    with pytest.raises(Exception, match=r"without a positive, finite diameter and weight, e.g. rows \[4\]"):
+        load_manifest(str(path))
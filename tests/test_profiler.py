@@ -0,0 +1,25 @@
+from main import run_ga
+from profiler import PhaseProfiler, PHASES
+import TEST
+import json
+import random
+
+
+def test_profiled_run_with_telemetry(tmp_path):
+    random.seed(7)
+    (width, height, max_weight), cylinders = TEST.test_instances(3)
+    telemetry_path = tmp_path / "telemetry.jsonl"
+
+    summaries = run_ga(
+        list(cylinders), len(cylinders), population_size=10, max_generations=5, max_weight=max_weight,
+        container_width=width, container_height=height, visualise=False, verbose=False, record=False,
+        telemetry_path=str(telemetry_path), profiler=PhaseProfiler(enabled=True)
+    )
+
+    for summary in summaries.values():
+        profile = summary["Profile"]
+        assert set(profile["Phases"]) == set(PHASES)
+        assert profile["Phases"]["Telemetry"]["Calls"] == profile["Generations"] > 0
+
+    with open(telemetry_path) as file:
+        assert any(json.loads(line)["type"] == "generation" for line in file)
@@ -0,0 +1,37 @@
+from main import run_ga
+from result_cache import ResultCache
+import TEST
+import json
+import pytest
+import random
+
+(WIDTH, HEIGHT, MAX_WEIGHT), CYLINDERS = TEST.test_instances(7)
+
+
+def run(directory: str, mode: str):
+    random.seed(2)
+    return run_ga(list(CYLINDERS), len(CYLINDERS), population_size=20, max_generations=2, max_weight=MAX_WEIGHT, container_width=WIDTH,
+                  container_height=HEIGHT, visualise=False, verbose=False, record=False, result_cache=mode, result_cache_directory=directory)["Bin 0"]
+
+
+@pytest.mark.parametrize("mode", ["reuse", "warm start"])
+def test_corrupt_entries_are_misses(tmp_path, mode):
+    run(str(tmp_path), mode)
+    entry, = tmp_path.glob("*.json")
+    fitness, placement = json.loads(entry.read_text()).values()
+    diameters, weights = [cylinder.diameter for cylinder in CYLINDERS], [cylinder.weight for cylinder in CYLINDERS]
+
+    # Placements of other cylinders, or that aren't placements at all.
+    for corrupt in ({"Fitness": fitness, "Placement": placement[1:]},
+                    {"Fitness": fitness, "Placement": [[diameter + 1, *rest] for diameter, *rest in placement]},
+                    {"Fitness": fitness, "Placement": [row[:3] for row in placement]},
+                    {"Fitness": "high", "Placement": placement},
+                    {"Placement": placement}):
+        entry.write_text(json.dumps(corrupt))
+        assert ResultCache(str(tmp_path)).get(entry.stem, diameters, weights) is None
+
+        summary = run(str(tmp_path), mode)
+        assert not summary["Result Cache"]["Hit"] and summary["Stop Reason"] != "Cached"
+
+    # The entry is replaced by the bin's new best placement, which is a hit.
+    assert run(str(tmp_path), mode)["Result Cache"]["Hit"]
@@ -2,5 +2,7 @@ from .cprint import cprint
 from .point_rotation import rotate
 from .centre_of_mass import com
 from .get_random_group import get_random_indices
+from .spatial_grid import SpatialGrid, BatchSpatialGrid
+from .row_sets import RowSets
 
-__all__ = ["cprint", "rotate", "com", "get_random_indices"]
\ No newline at end of file
+__all__ = ["cprint", "rotate", "com", "get_random_indices", "SpatialGrid", "BatchSpatialGrid", "RowSets"]
\ No newline at end of file
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+class RowSets:
+    """
+    The distinct values of each row of a matrix of non-negative integers, held together as a single sorted array.
+    Each row's values are offset by the row's index times a span wider than any value, so the membership and rank of
+    many (row, value) pairs are found at once with a binary search, instead of building a set for every row.
+    """
+
+    def __init__(self, values: np.ndarray, mask: np.ndarray):
+        """
+        :param np.ndarray values: (rows, columns) the values of each row.
+        :param np.ndarray mask: (rows, columns) which of the values belong to the row's set.
+        """
+        rows = len(values)
+
+        self.__span = int(values[mask].max()) + 1 if mask.any() else 1
+        self.__keys = np.unique((values + np.arange(rows)[:, None] * self.__span)[mask])
+        self.__starts = np.searchsorted(self.__keys, np.arange(rows + 1) * self.__span)  # where each row's keys begin
+
+    def contains(self, rows: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Checks whether each value is within the set of its row.
+        :param np.ndarray rows: The row of each value.
+        :param np.ndarray values: The values to look for, of the same shape as rows.
+        :return: np.ndarray, of booleans.
+        """
+        if not len(self.__keys):
+            return np.zeros(values.shape, dtype=bool)
+
+        queries = np.where(values < self.__span, values + rows * self.__span, -1)
+        found_at = np.minimum(np.searchsorted(self.__keys, queries), len(self.__keys) - 1)
+
+        return self.__keys[found_at] == queries
+
+    def count_below(self, rows: np.ndarray, limits: np.ndarray) -> np.ndarray:
+        """
+        Counts the values within the set of each row that are less than a limit.
+        :param np.ndarray rows: The row of each limit.
+        :param np.ndarray limits: The (exclusive) limits.
+        :return: np.ndarray
+        """
+        return np.searchsorted(self.__keys, rows * self.__span + np.minimum(limits, self.__span)) - self.__starts[rows]
+
+    def nth_missing(self, rows: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+        """
+        Finds the nth smallest non-negative integer that isn't within the set of each row.
+        :param np.ndarray rows: The row of each rank.
+        :param np.ndarray ranks: The (0-based) ranks, n.
+        :return: np.ndarray
+        """
+        if not len(ranks):
+            return ranks.copy()
+
+        key_rows = np.searchsorted(self.__starts, np.arange(len(self.__keys)), side="right") - 1
+        positions = np.arange(len(self.__keys)) - self.__starts[key_rows]
+
+        # The number of integers missing below each value, which never decreases within a row.
+        missing = self.__keys - key_rows * self.__span - positions
+
+        # The answer is the rank, shifted by every value of the row that has no more integers missing below it.
+        stride = self.__span + int(ranks.max()) + 1
+        shifts = np.searchsorted(key_rows * stride + missing, rows * stride + ranks, side="right") - self.__starts[rows]
+
+        return ranks + shifts
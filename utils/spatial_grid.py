@@ -0,0 +1,105 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    A uniform grid of square cells, each holding the indices of the cylinders whose centres are within it.
+    With cells as wide as the largest cylinder, any cylinder that could intersect another is in one of the 9 cells
+    around it, so only those need checking.
+    """
+
+    def __init__(self, cell_size: float):
+        self.__cell_size = cell_size
+        self.__cells: Dict[Tuple[int, int], List[int]] = {}
+
+    def __cell(self, centre: Tuple[float, float]) -> Tuple[int, int]:
+        return int(centre[0] // self.__cell_size), int(centre[1] // self.__cell_size)
+
+    def insert(self, index: int, centre: Tuple[float, float]) -> None:
+        """
+        Adds a cylinder to the cell containing its centre.
+        :param int index: The index of the cylinder.
+        :param Tuple[float, float] centre: The centre of the cylinder.
+        :return: None
+        """
+        self.__cells.setdefault(self.__cell(centre), []).append(index)
+
+    def nearby(self, centre: Tuple[float, float]) -> List[int]:
+        """
+        Gets the cylinders within the cell of a point, and the 8 cells surrounding it.
+        :param Tuple[float, float] centre: The point to search around.
+        :return: List[int], the indices of the cylinders in ascending order.
+        """
+        column, row = self.__cell(centre)
+
+        return sorted(
+            index
+            for x in range(column - 1, column + 2) for y in range(row - 1, row + 2)
+            for index in self.__cells.get((x, y), ())
+        )
+
+
+class BatchSpatialGrid:
+    """
+    A uniform grid, like SpatialGrid, for every group of a population at once. Each cell holds a fixed number of slots,
+    which grows when any cell overflows, and each slot holds the centre and radius of a cylinder. Empty slots are
+    infinitely far away, so they never intersect anything.
+    Points outside the container are clamped into its edge cells, which keeps any two points within a cell of each
+    other in neighbouring cells.
+    """
+
+    def __init__(self, size: int, cell_size: float, container_width: float, container_height: float, capacity: int = 4, max_cells: int = 256):
+        # Cells are never narrower than the container allows for, so the grid's size stays bounded.
+        self.__cell_size = max(cell_size, container_width / max_cells, container_height / max_cells)
+        self.__columns = int(container_width // self.__cell_size) + 1
+        self.__rows = int(container_height // self.__cell_size) + 1
+
+        # The grid is surrounded by a border of empty cells, so the cells around any point are found without clamping.
+        self.__stride = self.__rows + 2
+        self.__offsets = np.array([column * self.__stride + row for column in range(-1, 2) for row in range(-1, 2)])
+
+        self.__slots = np.full((size, (self.__columns + 2) * self.__stride, capacity, 3), np.inf)
+        self.__counts = np.zeros((size, (self.__columns + 2) * self.__stride), dtype=np.int64)
+
+    @property
+    def capacity(self) -> int:
+        return self.__slots.shape[2]
+
+    def __cells(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        columns = np.clip(xs // self.__cell_size, 0, self.__columns - 1).astype(np.intp)
+        rows = np.clip(ys // self.__cell_size, 0, self.__rows - 1).astype(np.intp)
+
+        return (columns + 1) * self.__stride + rows + 1
+
+    def insert(self, groups: np.ndarray, centres: np.ndarray, radius: float) -> None:
+        """
+        Adds the same cylinder of several groups to the cells containing its centre in each group.
+        :param np.ndarray groups: The indices of the (distinct) groups.
+        :param np.ndarray centres: (groups, 2) the centre of the cylinder in each group.
+        :param float radius: The radius of the cylinder.
+        :return: None
+        """
+        cells = self.__cells(centres[:, 0], centres[:, 1])
+        slots = self.__counts[groups, cells]
+
+        if len(slots) and slots.max() >= self.capacity:
+            grown = np.full(self.__slots.shape[:2] + (self.capacity * 2, 3), np.inf)
+            grown[:, :, :self.capacity] = self.__slots
+            self.__slots = grown
+
+        self.__slots[groups, cells, slots, :2] = centres
+        self.__slots[groups, cells, slots, 2] = radius
+        self.__counts[groups, cells] += 1
+
+    def nearby(self, groups: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Gets the cylinders within the cell of each point, and the 8 cells surrounding it.
+        :param np.ndarray groups: (groups,) the group of each row of points.
+        :param np.ndarray xs: (groups, points) the x coordinate of each point.
+        :param np.ndarray ys: (groups, points) the y coordinate of each point.
+        :return: np.ndarray, (groups, points, 9 * capacity, 3) the centre and radius of each nearby cylinder.
+        """
+        cells = self.__cells(xs, ys)[..., None] + self.__offsets
+
+        return self.__slots[groups[:, None, None], cells].reshape(xs.shape + (len(self.__offsets) * self.capacity, 3))